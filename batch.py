@@ -0,0 +1,61 @@
+"""
+Process-pool runner shared by the recipe batch scripts.
+
+Every script processes Section*.xhtml files independently, so the
+per-file work can be farmed out to a pool of worker processes. Results
+come back in input order, and anything a worker prints is captured and
+replayed in that same order, so the change report reads exactly as it
+does for a serial run.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def jobs_type(value):
+    """argparse type for --jobs: a worker count, with 0 meaning one per CPU."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError('must be 0 or a positive integer')
+    return jobs or os.cpu_count() or 1
+
+
+def add_jobs_argument(parser):
+    """Add the shared --jobs option to an argparse parser."""
+    parser.add_argument(
+        '-j', '--jobs', type=jobs_type, default=1, metavar='N',
+        help='number of worker processes (0 = one per CPU core; default 1)',
+    )
+
+
+def _call_captured(func, args):
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        result = func(*args)
+    return result, buf.getvalue()
+
+
+def run_jobs(func, arg_list, jobs=1):
+    """Call func(*args) for each tuple in arg_list and yield the results in order.
+
+    With jobs == 1 the calls run in this process. Otherwise they run in a
+    ProcessPoolExecutor; `func` must be a module-level function and its
+    arguments picklable.
+    """
+    arg_list = list(arg_list)
+    if jobs <= 1 or len(arg_list) <= 1:
+        for args in arg_list:
+            yield func(*args)
+        return
+
+    chunksize = max(1, len(arg_list) // (jobs * 4))
+    jobs = min(jobs, len(arg_list))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        calls = pool.map(_call_captured, [func] * len(arg_list), arg_list, chunksize=chunksize)
+        for result, output in calls:
+            sys.stdout.write(output)
+            yield result
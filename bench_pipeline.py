@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark for the recipe pipeline over the real cookbook.
+
+Every stage runs over each Section*.xhtml in epub_work/OEBPS/Text:
+
+  scale_spans   process_recipes.scale_recipe_content at --ratio
+  scale_lines   fix_scaling.scale_ingredient_line on every ingredient line
+  yield         recipe.parse_recipe, which finds the Yield:/Makes line, and
+                the yield grammar (yields.parse_yield, unmemoized)
+  modernize     what modernize_recipes.process_file does to the page
+                (modernize_page, lxml or BeautifulSoup backend), in memory,
+                so the tree is never touched: a page that already has the
+                new toolbar is skipped after the cached recipe lookup, the
+                rest are rewritten
+
+For each stage it reports files/s and lines/s over the best of --repeat
+rounds, p50/p99 per-file latency (each file's best time), and the peak
+memory traced while the stage runs once more under tracemalloc.
+
+Results can be saved as JSON and compared with a stored baseline; a
+stage that got more than --max-slowdown times slower fails the run:
+
+    python3 bench_pipeline.py --save-baseline     # after a known-good change
+    python3 bench_pipeline.py                     # compares when a baseline exists
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from fractions import Fraction
+
+import fix_scaling
+import modernize_recipes
+import process_recipes
+from recipe import cached_recipe, parse_recipe
+from yields import parse_yield
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEXT_DIR = os.path.join(ROOT, 'epub_work/OEBPS/Text')
+BASELINE = os.path.join(ROOT, '.cache', 'bench-baseline.json')
+
+MAX_SLOWDOWN = 2.0
+
+
+# ============================================================
+# Stages
+# ============================================================
+
+def load_corpus(text_dir):
+    """[(name, content, ingredient lines)] for every Section page."""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(text_dir, 'Section*.xhtml'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        corpus.append((os.path.basename(path), content, cached_recipe(content).ingredient_lines))
+    return corpus
+
+
+def stage_scale_spans(ratio):
+    def run(content, lines):
+        process_recipes.scale_recipe_content(content, ratio, 20, 5)
+        return content.count('\n') + 1
+    return run
+
+
+def stage_scale_lines(ratio):
+    ratio = Fraction(ratio).limit_denominator(1000)
+
+    def run(content, lines):
+        for line in lines:
+            fix_scaling.scale_ingredient_line(line, ratio)
+        return len(lines)
+    return run
+
+
+def stage_yield(content, lines):
+    parse_yield.__wrapped__(parse_recipe(content).yield_text)
+    return content.count('\n') + 1
+
+
+def stage_modernize(backend):
+    def run(content, lines):
+        # 'auto' is lxml with the per-page BeautifulSoup fallback.
+        modernize_recipes.modernize_page(content, 'auto' if backend == 'lxml' else backend)
+        return content.count('\n') + 1
+    return run
+
+
+def modernize_backend(requested):
+    if requested in ('auto', 'lxml') and modernize_recipes.etree is not None:
+        return 'lxml'
+    if requested in ('auto', 'bs4') and modernize_recipes.BeautifulSoup is not None:
+        return 'bs4'
+    return None
+
+
+# ============================================================
+# Measurement
+# ============================================================
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def measure(run, corpus, repeat):
+    """Time `run` over the corpus; returns the stage's result dict."""
+    best_total = float('inf')
+    best_per_file = [float('inf')] * len(corpus)
+    lines = 0
+    for _ in range(repeat):
+        total = 0.0
+        lines = 0
+        for i, (_, content, ingredient_lines) in enumerate(corpus):
+            start = time.perf_counter()
+            lines += run(content, ingredient_lines)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            best_per_file[i] = min(best_per_file[i], elapsed)
+        best_total = min(best_total, total)
+
+    tracemalloc.start()
+    for _, content, ingredient_lines in corpus:
+        run(content, ingredient_lines)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = sorted(best_per_file)
+    slowest = max(range(len(corpus)), key=lambda i: best_per_file[i])
+    return {
+        'files': len(corpus),
+        'lines': lines,
+        'seconds': round(best_total, 6),
+        'files_per_s': round(len(corpus) / best_total, 1),
+        'lines_per_s': round(lines / best_total, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+        'slowest': corpus[slowest][0],
+    }
+
+
+def compare(results, baseline, max_slowdown):
+    """Print each stage against the baseline; returns the stages that regressed."""
+    regressions = []
+    print(f'\nAgainst baseline ({baseline.get("created", "unknown date")}):')
+    for name, stage in results['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            print(f'  {name:12} (not in baseline)')
+            continue
+        ratio = stage['seconds'] / base['seconds'] if base['seconds'] else 1.0
+        flag = ''
+        if ratio > max_slowdown:
+            flag = f'  REGRESSION (> {max_slowdown:g}x)'
+            regressions.append(name)
+        print(f'  {name:12} {ratio:5.2f}x time, p99 {base["p99_ms"]:.2f} → {stage["p99_ms"]:.2f} ms, '
+              f'peak {base["peak_kib"]:.0f} → {stage["peak_kib"]:.0f} KiB{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the recipe pipeline over the cookbook.')
+    parser.add_argument('--repeat', type=int, default=3, help='timing rounds (best is kept; default %(default)s)')
+    parser.add_argument('--ratio', type=float, default=0.25, help='scaling ratio to apply (default %(default)s)')
+    parser.add_argument('--stages', help='comma-separated subset of stages to run')
+    parser.add_argument('--backend', choices=modernize_recipes.BACKENDS, default='auto',
+                        help='modernize backend (default %(default)s)')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON to compare with (default %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--max-slowdown', type=float, default=MAX_SLOWDOWN,
+                        help='fail when a stage is this many times slower than the baseline (default %(default)s)')
+    args = parser.parse_args()
+
+    stages = {
+        'scale_spans': stage_scale_spans(args.ratio),
+        'scale_lines': stage_scale_lines(args.ratio),
+        'yield': stage_yield,
+    }
+    backend = modernize_backend(args.backend)
+    if backend:
+        stages['modernize'] = stage_modernize(backend)
+    else:
+        print('modernize: skipped (needs lxml or beautifulsoup4)')
+    if args.stages:
+        wanted = args.stages.split(',')
+        unknown = [s for s in wanted if s not in stages]
+        if unknown:
+            parser.error(f'unknown or unavailable stage(s): {", ".join(unknown)}')
+        stages = {name: stages[name] for name in wanted}
+
+    corpus = load_corpus(TEXT_DIR)
+    results = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'ratio': args.ratio,
+        'modernize_backend': backend,
+        'stages': {},
+    }
+    print(f'{len(corpus)} files, best of {args.repeat}')
+    print(f'  {"stage":12} {"files/s":>9} {"lines/s":>10} {"p50 ms":>8} {"p99 ms":>8} {"peak KiB":>9}  slowest')
+    for name, run in stages.items():
+        stage = measure(run, corpus, args.repeat)
+        results['stages'][name] = stage
+        print(f'  {name:12} {stage["files_per_s"]:9.0f} {stage["lines_per_s"]:10.0f} '
+              f'{stage["p50_ms"]:8.2f} {stage["p99_ms"]:8.2f} {stage["peak_kib"]:9.0f}  {stage["slowest"]}')
+
+    data = json.dumps(results, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+
+    regressions = []
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(data)
+        print(f'\nSaved baseline to {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_slowdown)
+
+    if regressions:
+        sys.exit(f'\n{len(regressions)} stage(s) regressed: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the span-scaling pass in process_recipes.
+
+Runs scale_recipe_content() over every Section*.xhtml in
+epub_work/OEBPS/Text and reports spans/second for:
+
+  before  the original per-span lambdas with inline re.match/re.sub literals
+  after   the precompiled patterns from patterns.py
+
+Both variants must produce identical output; the script aborts if they
+don't.
+
+    python3 bench_spans.py [--repeat N] [--ratio R]
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from patterns import CHAR_OVERRIDE_3_SPAN_RE, CLASSED_QTY_SPAN_RE
+from process_recipes import scale_ingredient_text, scale_recipe_content
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEXT_DIR = os.path.join(ROOT, 'epub_work/OEBPS/Text')
+
+
+def scale_recipe_content_before(content, ratio, original_yield, target_servings):
+    """scale_recipe_content() as it was before patterns.py existed."""
+    content = re.sub(
+        r'(<span class="CharOverride-3">)(.*?)(</span>)',
+        lambda m: m.group(1) + (scale_ingredient_text(m.group(2).strip(), ratio) if re.match(r'^[\d¼-¾⅐-⅞]', m.group(2).strip(), re.UNICODE) and len(m.group(2).strip()) < 200 and not re.match(r'Yield:', m.group(2).strip(), re.IGNORECASE) else m.group(2)) + m.group(3),
+        content,
+        flags=re.DOTALL | re.UNICODE
+    )
+    content = re.sub(
+        r'(<span class="(?:sgc-\d+|CharOverride-\d+)(?:\s+(?:sgc-\d+|CharOverride-\d+))*">)([\d¼-¾⅐-⅞][^<]{3,120})(</span>)',
+        lambda m: m.group(1) + (scale_ingredient_text(m.group(2).strip(), ratio) if not re.match(r'Yield:', m.group(2).strip(), re.IGNORECASE) else m.group(2)) + m.group(3),
+        content,
+        flags=re.DOTALL | re.UNICODE
+    )
+    content = re.sub(
+        r'(>)(Yield:\s*[^<]+?)(<)',
+        lambda m: f'{m.group(1)}Yield: {target_servings} servings{m.group(3)}',
+        content,
+        count=1,
+        flags=re.IGNORECASE
+    )
+    return content
+
+
+def count_spans(docs):
+    total = 0
+    for content in docs:
+        total += sum(1 for _ in CHAR_OVERRIDE_3_SPAN_RE.finditer(content))
+        total += sum(1 for _ in CLASSED_QTY_SPAN_RE.finditer(content))
+    return total
+
+
+def best_time(fn, docs, ratio, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in docs:
+            fn(content, ratio, 20, 5)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='timing rounds (best is kept)')
+    parser.add_argument('--ratio', type=float, default=0.25, help='scaling ratio to apply')
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(TEXT_DIR, 'Section*.xhtml')))
+    docs = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            docs.append(f.read())
+
+    for content in docs:
+        if (scale_recipe_content_before(content, args.ratio, 20, 5)
+                != scale_recipe_content(content, args.ratio, 20, 5)):
+            raise SystemExit('before/after outputs differ; refusing to benchmark')
+
+    spans = count_spans(docs)
+    before = best_time(scale_recipe_content_before, docs, args.ratio, args.repeat)
+    after = best_time(scale_recipe_content, docs, args.ratio, args.repeat)
+
+    print(f'{len(docs)} files, {spans} spans, best of {args.repeat}')
+    print(f'  before: {before * 1000:8.1f} ms  {spans / before:10.0f} spans/s')
+    print(f'  after:  {after * 1000:8.1f} ms  {spans / after:10.0f} spans/s')
+    print(f'  speedup: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Generate the PWA's recipe index (assets/recipes.json) from the book.
+
+Recipes and their categories come from toc.ncx: every top-level navPoint
+whose Section pages include at least one recipe with a yield is a
+category, named after the headings on its divider page ("Breakfast and
+Breads" → "Breakfast & Breads"). Titles are the NCX labels, and yields
+are the same baseline (yields.Yield.baseline) modernize_recipes.py puts
+in data-baseline-yield.
+
+The output is minified, with each recipe stored as a compact row
+[title, section number, yield]. assets/recipes.json lists the shards
+with their recipe counts and a Subresource Integrity hash, so the home
+page can draw the category chips before any shard arrives and verify
+each shard as it loads:
+
+    {"total": 212, "shards": [{"category": "Beef", "count": 16,
+      "href": "recipes/beef.json", "integrity": "sha256-…"}, …]}
+
+By default all recipes go into one shard, recipes/all.json, whose rows
+also carry the category; --shard writes one shard per category instead.
+"""
+
+import argparse
+import base64
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from patterns import HEADING_RE, SECTION_HREF_RE, TAG_RE, WHITESPACE_RE
+from recipe import cached_recipe
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OEBPS_DIR = os.path.join(ROOT, 'epub_work/OEBPS')
+ASSETS_DIR = os.path.join(ROOT, 'assets')
+INDEX_NAME = 'recipes.json'
+SHARD_DIR = 'recipes'
+
+NCX_NS = '{http://www.daisy.org/z3986/2005/ncx/}'
+
+
+def clean(text):
+    return WHITESPACE_RE.sub(' ', html.unescape(text or '')).strip()
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def category_name(oebps_dir, href):
+    """A category's name from the headings of its divider page."""
+    with open(os.path.join(oebps_dir, href.split('#')[0]), 'r', encoding='utf-8') as f:
+        content = f.read()
+    name = clean(' '.join(TAG_RE.sub('', h) for h in HEADING_RE.findall(content)))
+    return name.replace(' and ', ' & ')
+
+
+def read_recipes(oebps_dir):
+    """[(category, [(title, section number, yield), ...]), ...] in book order."""
+    root = ET.parse(os.path.join(oebps_dir, 'toc.ncx')).getroot()
+    categories = []
+    for point in root.find(f'{NCX_NS}navMap').findall(f'{NCX_NS}navPoint'):
+        rows = []
+        for child in point.findall(f'{NCX_NS}navPoint'):
+            m = SECTION_HREF_RE.match(child.find(f'{NCX_NS}content').get('src'))
+            if not m:
+                continue
+            with open(os.path.join(oebps_dir, m.group(0)), 'r', encoding='utf-8') as f:
+                recipe = cached_recipe(f.read())
+            title = clean(child.find(f'{NCX_NS}navLabel/{NCX_NS}text').text)
+            rows.append((title, m.group(1), recipe.yield_count))
+        if any(y is not None for _, _, y in rows):
+            name = category_name(oebps_dir, point.find(f'{NCX_NS}content').get('src'))
+            categories.append((name, [[t, s, str(y) if y is not None else ''] for t, s, y in rows]))
+    return categories
+
+
+def minified(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def integrity(data):
+    return 'sha256-' + base64.b64encode(hashlib.sha256(data).digest()).decode('ascii')
+
+
+def write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate assets/recipes.json from the EPUB.')
+    parser.add_argument('--shard', action='store_true', help='write one shard per category')
+    parser.add_argument('--out', default=ASSETS_DIR, help='assets directory (default %(default)s)')
+    args = parser.parse_args()
+
+    categories = read_recipes(OEBPS_DIR)
+    if args.shard:
+        shards = [(name, slugify(name), rows) for name, rows in categories]
+    else:
+        # One shard; each row carries its category.
+        shards = [('', 'all', [row + [name] for name, rows in categories for row in rows])]
+
+    shard_dir = os.path.join(args.out, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    wanted = set()
+    index = {'total': sum(len(rows) for _, rows in categories), 'shards': []}
+    for name, slug, rows in shards:
+        data = minified(rows)
+        href = f'{SHARD_DIR}/{slug}.json'
+        wanted.add(os.path.join(args.out, href))
+        write_if_changed(os.path.join(args.out, href), data)
+        index['shards'].append({'category': name, 'count': len(rows),
+                                'href': href, 'integrity': integrity(data)})
+
+    # Shards left over from a previous layout.
+    for path in glob.glob(os.path.join(shard_dir, '*.json')):
+        if path not in wanted:
+            os.remove(path)
+
+    write_if_changed(os.path.join(args.out, INDEX_NAME), minified(index))
+    for name, rows in categories:
+        print(f'  {name}: {len(rows)} recipes')
+    print(f'{index["total"]} recipes in {len(shards)} shard(s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Generate precache-manifest.js for the PWA service worker.
+
+Every file the PWA can load (the app shell at the repo root, assets/ and
+epub_work/OEBPS/) is listed with a revision, the first hex digits of its
+sha256. sw.js imports the manifest and, on update, downloads only the
+URLs whose revision changed instead of throwing away a versioned cache.
+
+URLs are split into two tiers:
+
+- install: fetched when the service worker installs. This covers the app
+  shell, the small directories every tool needs (pages, styles, scripts,
+  audio, icons), and any image or font used (directly or via a
+  stylesheet) by at least INSTALL_MIN_PAGES pages, such as the toolbar
+  icons and the fonts of the shared InDesign styles.
+- runtime: cached the first time the page needs it, such as the per-recipe
+  nutrition panels. The revision is still listed so a stale copy is
+  dropped when the file changes.
+
+With --check nothing is written; the script exits 1 if the committed
+manifest no longer matches the tree. The Pages and Release workflows run
+it so a stale manifest is never deployed.
+"""
+
+import argparse
+import glob
+import json
+import os
+import posixpath
+import sys
+import urllib.parse
+from collections import defaultdict
+
+from manifest import file_hash
+from patterns import ASSET_REF_RE
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OEBPS = 'epub_work/OEBPS'
+OUTPUT = os.path.join(ROOT, 'precache-manifest.js')
+
+# App shell files at the repo root, always installed.
+SHELL = ['index.html', 'manifest.webmanifest']
+
+# Directories whose files are listed, relative to ROOT.
+PRECACHE_DIRS = ['assets', OEBPS]
+
+# Build bookkeeping the app never loads.
+EXCLUDE = {f'{OEBPS}/build-manifest.json', f'{OEBPS}/content.opf', f'{OEBPS}/toc.ncx'}
+
+# Directories installed whole: the pages and everything the tools load.
+INSTALL_PREFIXES = (
+    'assets/', f'{OEBPS}/Text/', f'{OEBPS}/Styles/', f'{OEBPS}/Misc/', f'{OEBPS}/Audio/',
+)
+
+# An image or font used by this many pages is worth downloading up front.
+INSTALL_MIN_PAGES = 20
+
+REVISION_LENGTH = 12
+
+HEADER = '// Generated by build_precache.py; do not edit.\n'
+
+
+def list_files(root):
+    """Repo-relative paths of every file the PWA can fetch, sorted."""
+    paths = [p for p in SHELL if os.path.isfile(os.path.join(root, p))]
+    for d in PRECACHE_DIRS:
+        for path in glob.glob(os.path.join(root, d, '**', '*'), recursive=True):
+            rel = os.path.relpath(path, root).replace(os.sep, '/')
+            if os.path.isfile(path) and rel not in EXCLUDE and not rel.endswith('.tmp'):
+                paths.append(rel)
+    return sorted(set(paths))
+
+
+def references(root, rel):
+    """Repo-relative paths a text file refers to with src/href/url()."""
+    with open(os.path.join(root, rel), 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    base = posixpath.dirname(rel)
+    refs = set()
+    for m in ASSET_REF_RE.finditer(text):
+        target = urllib.parse.unquote(m.group(1) or m.group(2)).strip()
+        if not target or ':' in target or target.startswith('/'):
+            continue
+        refs.add(posixpath.normpath(posixpath.join(base, target)))
+    return refs
+
+
+def page_counts(root, paths):
+    """How many Text/ pages use each file, counting files used by their stylesheets."""
+    known = set(paths)
+    css_refs = {p: references(root, p) & known for p in paths if p.endswith('.css')}
+    counts = defaultdict(int)
+    for page in (p for p in paths if p.startswith(f'{OEBPS}/Text/')):
+        used = references(root, page) & known
+        for css in [u for u in used if u in css_refs]:
+            used |= css_refs[css]
+        for path in used:
+            counts[path] += 1
+    return counts
+
+
+def build_manifest(root):
+    paths = list_files(root)
+    counts = page_counts(root, paths)
+    tiers = {'install': {}, 'runtime': {}}
+    for path in paths:
+        install = (path in SHELL or path.startswith(INSTALL_PREFIXES)
+                   or counts[path] >= INSTALL_MIN_PAGES)
+        revision = file_hash(os.path.join(root, path))[:REVISION_LENGTH]
+        tiers['install' if install else 'runtime'][f'./{path}'] = revision
+    # The scope root is served as index.html.
+    if './index.html' in tiers['install']:
+        tiers['install']['./'] = tiers['install']['./index.html']
+    return tiers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the service worker precache manifest.')
+    parser.add_argument('-o', '--output', default=OUTPUT, help='file to write (default %(default)s)')
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 if the output file is out of date')
+    args = parser.parse_args()
+
+    tiers = build_manifest(ROOT)
+    body = json.dumps(tiers, sort_keys=True, separators=(',', ':'))
+    content = f'{HEADER}self.PRECACHE_MANIFEST = {body};\n'
+
+    try:
+        with open(args.output, 'r', encoding='utf-8') as f:
+            unchanged = f.read() == content
+    except FileNotFoundError:
+        unchanged = False
+    if args.check:
+        if not unchanged:
+            sys.exit(f'{args.output} is out of date; run build_precache.py and commit it')
+        print(f'{args.output} is up to date')
+        return
+    if not unchanged:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    for tier, urls in tiers.items():
+        size = sum(os.path.getsize(os.path.join(ROOT, u[2:] or 'index.html')) for u in urls)
+        print(f'{tier}: {len(urls)} URLs, {size / 1e6:.1f} MB')
+    print(f'{args.output} {"unchanged" if unchanged else "written"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Generate the PWA's full-text search index (assets/search.json).
+
+Every recipe in the home page index (see build_index.py) is tokenized
+from its title, ingredient lines and steps, as split by recipe.py with
+the same toolbar/INSTRUCTION_VERBS heuristics that modernize_recipes.py's
+toolbar deep links use. Paragraphs that repeat
+on many pages (the nutrition card note, for instance) are boilerplate
+and are skipped.
+
+The output is an inverted index. The terms are sorted so the client can
+binary-search a prefix, and each term's postings are the ascending
+positions of its recipes in `docs`, delta-encoded:
+
+    {"docs": ["0002", "0003", …], "terms": ["allspice", …],
+     "postings": [[4, 17, 2], …], "stopwords": ["a", "about", …], "minlength": 2}
+
+[4, 17, 2] decodes to docs 4, 21 and 23. The stop words and minimum
+word length ship with the index so the home page drops the same query
+words the index left out. The home page fetches the file
+the first time someone types in the search box, so the initial load
+stays small, and the service worker keeps it for offline use.
+"""
+
+import argparse
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from build_index import ASSETS_DIR, OEBPS_DIR, minified, read_recipes, write_if_changed
+from recipe import cached_recipe
+
+SEARCH_NAME = 'search.json'
+
+TOKEN_RE = re.compile(r'[a-z]+')
+
+# Words too common in recipes to narrow a search.
+STOP_WORDS = frozenset('''
+    a an and are as at be by for from in into is it of on or the to with
+    until about over then this that your you
+'''.split())
+
+MIN_TOKEN_LENGTH = 2
+
+# A paragraph found on this many recipe pages is boilerplate, not content.
+BOILERPLATE_MIN_PAGES = 10
+
+
+def tokenize(text):
+    """Lowercase, accent-free words worth indexing. index.html mirrors this."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return [t for t in TOKEN_RE.findall(text)
+            if len(t) >= MIN_TOKEN_LENGTH and t not in STOP_WORDS]
+
+
+def read_documents(oebps_dir):
+    """[(section number, [paragraph texts]), ...] in home page order."""
+    docs = []
+    for _, rows in read_recipes(oebps_dir):
+        for title, section, _ in rows:
+            path = os.path.join(oebps_dir, 'Text', f'Section{section}.xhtml')
+            with open(path, 'r', encoding='utf-8') as f:
+                recipe = cached_recipe(f.read())
+            docs.append((section, [title] + recipe.ingredient_lines + recipe.steps))
+    return docs
+
+
+def build_search_index(docs):
+    pages = Counter(text for _, texts in docs for text in set(texts))
+    postings = defaultdict(list)
+    for doc_id, (_, texts) in enumerate(docs):
+        terms = set()
+        for text in texts:
+            if pages[text] < BOILERPLATE_MIN_PAGES:
+                terms.update(tokenize(text))
+        for term in terms:
+            postings[term].append(doc_id)
+
+    terms = sorted(postings)
+    return {
+        'docs': [section for section, _ in docs],
+        'terms': terms,
+        'postings': [delta_encode(postings[t]) for t in terms],
+        'stopwords': sorted(STOP_WORDS),
+        'minlength': MIN_TOKEN_LENGTH,
+    }
+
+
+def delta_encode(ids):
+    """Ascending ids as the first id followed by the gaps between them."""
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate assets/search.json from the EPUB.')
+    parser.add_argument('--out', default=ASSETS_DIR, help='assets directory (default %(default)s)')
+    args = parser.parse_args()
+
+    docs = read_documents(OEBPS_DIR)
+    index = build_search_index(docs)
+    data = minified(index)
+    changed = write_if_changed(os.path.join(args.out, SEARCH_NAME), data)
+
+    entries = sum(len(p) for p in index['postings'])
+    print(f'{len(docs)} recipes, {len(index["terms"])} terms, {entries} postings')
+    print(f'{SEARCH_NAME}: {len(data):,} bytes{"" if changed else " (unchanged)"}')
+
+
+if __name__ == '__main__':
+    main()
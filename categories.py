@@ -0,0 +1,84 @@
+"""
+Ingredient categories that scale non-linearly.
+
+Seasonings, leavening and acids don't scale in proportion to the yield,
+so both scaling scripts sort every ingredient line into one of these
+curves before scaling it. Each script's word table is compiled into a
+single regex with one named group per category, so a line is classified
+in one scan, and the result is memoized on the normalized line: the
+same ingredients ("1 tsp salt", "2 bay leaves") repeat across hundreds
+of recipes.
+
+Table entries are regex fragments ("bay leaves?"). When a line matches
+more than one category, the category listed first wins.
+"""
+
+import re
+from functools import lru_cache
+
+from patterns import WHITESPACE_RE
+
+# Scaling curves, in priority order.
+LINEAR, SEASONING, LEAVENING, ACID = range(4)
+
+CATEGORY_GROUPS = {SEASONING: 'seasoning', LEAVENING: 'leavening', ACID: 'acid'}
+GROUP_CATEGORIES = {name: curve for curve, name in CATEGORY_GROUPS.items()}
+
+# fix_scaling.py
+RESCALE_CATEGORIES = {
+    SEASONING: [
+        'salt', 'pepper', 'garlic', 'cumin', 'oregano', 'basil', 'thyme',
+        'rosemary', 'paprika', 'cayenne', 'chili powder', 'cinnamon',
+        'nutmeg', 'cloves', 'allspice', 'ginger', 'turmeric', 'curry',
+        'mustard', 'tabasco', 'hot sauce', 'sriracha', 'worcestershire',
+        'soy sauce', 'vanilla', 'almond extract', 'mint', 'dill',
+        'parsley', 'cilantro', 'bay leaves?', 'sage', 'tarragon',
+        'marjoram', 'fennel seed', 'anise', 'anisette', 'celery seed',
+        'onion powder', 'garlic powder',
+    ],
+    LEAVENING: ['baking soda', 'baking powder', 'yeast', 'cream of tartar'],
+    ACID: ['vinegar', 'lemon juice', 'lime juice', 'orange juice'],
+}
+
+# process_recipes.py
+RECIPE_CATEGORIES = {
+    SEASONING: [
+        'salt', 'pepper', 'cayenne', 'paprika', 'cumin', 'oregano',
+        'thyme', 'basil', 'cinnamon', 'nutmeg', 'clove', 'ginger',
+        'garlic powder', 'onion powder', 'chili powder', 'curry',
+        'turmeric', 'allspice', 'bay lea', 'rosemary', 'sage',
+        'dill', 'parsley flake', 'red pepper flake', 'cajun',
+        'old bay', 'seasoning', r'mrs\. dash', 'italian season',
+    ],
+    LEAVENING: ['baking soda', 'baking powder', 'yeast', 'cream of tartar'],
+    ACID: ['vinegar', 'lemon juice', 'lime juice', 'worcestershire'],
+}
+
+
+def compile_categories(categories):
+    """Compile a {curve: [regex fragments]} table into one classifier regex.
+
+    The alternation sits in a lookahead, so finditer() reports every
+    position where some category matches, and at each position the
+    higher-priority category is tried first.
+    """
+    groups = []
+    for curve in sorted(categories):
+        words = sorted(categories[curve], key=len, reverse=True)
+        groups.append(f'(?P<{CATEGORY_GROUPS[curve]}>{"|".join(words)})')
+    return re.compile('(?=' + '|'.join(groups) + ')')
+
+
+RESCALE_CATEGORIES_RE = compile_categories(RESCALE_CATEGORIES)
+RECIPE_CATEGORIES_RE = compile_categories(RECIPE_CATEGORIES)
+
+
+@lru_cache(maxsize=4096)
+def _classify(normalized, pattern):
+    found = {GROUP_CATEGORIES[m.lastgroup] for m in pattern.finditer(normalized)}
+    return min(found) if found else LINEAR
+
+
+def classify(ingredient_text, pattern=RESCALE_CATEGORIES_RE):
+    """The scaling curve an ingredient line follows under a compiled table."""
+    return _classify(WHITESPACE_RE.sub(' ', ingredient_text.lower()).strip(), pattern)
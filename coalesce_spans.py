@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Coalesce the InDesign span runs in epub_work/OEBPS/Text.
+
+InDesign wraps nearly every run of text in a <span class="CharOverride-N">,
+and a paragraph typed in several edits ends up as a row of spans with the
+same class. This pass rewrites each page without changing how it renders:
+
+  - Adjacent spans with identical attributes are merged:
+        <span class="X">1 pint (</span><span class="X">⅓ cup) milk</span>
+    becomes <span class="X">1 pint (⅓ cup) milk</span>. Spans with
+    anything between them, even a space, are left apart.
+  - Empty spans are removed.
+  - A span class is dropped when everything it declares either has no
+    effect on inline text (text-align, orphans, …) or is what the
+    paragraph already gives its text: the same inherited value set by the
+    paragraph's own class rules, or font-size: 1em. A span left with no
+    class is unwrapped.
+
+Class declarations come from the stylesheets each page links and its
+inline <style> blocks. Only rules with a single "span.X", "p.X" or ".X"
+selector count. A class that any other selector names is never dropped,
+and a property that a descendant rule sets on <p> is never treated as
+the paragraph's. Spans with attributes besides class are only merged,
+and pages with scripts are left alone, as in optimize_css.py.
+
+Run it after the scaling scripts and before modernize_recipes.py, and
+follow it with optimize_css.py, build_search.py and build_precache.py,
+in that order: dropped classes leave inline rules to prune, and joined
+words change the search index.
+"""
+
+import argparse
+import glob
+import os
+import re
+
+from optimize_css import split_rules, split_selectors
+from patterns import CLASS_ATTR_RE, CSS_COMMENT_RE, MARKUP_TOKEN_RE, STYLE_BLOCK_RE, STYLESHEET_LINK_RE
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OEBPS_DIR = os.path.join(ROOT, 'epub_work/OEBPS')
+STYLES_DIR = os.path.join(OEBPS_DIR, 'Styles')
+TEXT_DIR = os.path.join(OEBPS_DIR, 'Text')
+
+# Inherited properties a span may repeat from its paragraph.
+INHERITED = {'color', 'font-family', 'font-size', 'font-style', 'font-variant', 'font-weight',
+             'letter-spacing', 'line-height', 'text-transform', 'word-spacing'}
+
+# Properties that do nothing on a non-replaced inline element.
+BLOCK_ONLY = {'text-align', 'text-indent', 'orphans', 'widows', 'margin-top', 'margin-bottom',
+              'page-break-before', 'page-break-after', 'page-break-inside'}
+
+# A compound selector the pass understands: "span.X", "p.X" or ".X".
+SIMPLE_SELECTOR_RE = re.compile(r'^(span|p)?\.([\w-]+)$')
+# A selector whose subject is a <p>: "… p", "… p.X".
+P_SUBJECT_RE = re.compile(r'(?:^|[\s>+~])p(?:[.:#\[][^\s>+~]*)?$')
+
+SPAN_OPEN, SPAN_CLOSE, P_OPEN, P_CLOSE, OTHER = 'span', '/span', 'p', '/p', 'other'
+
+
+# ============================================================
+# Styles
+# ============================================================
+
+class PageStyles:
+    """The class rules that apply to a page's spans and paragraphs."""
+
+    def __init__(self):
+        self.span = {}          # class -> {property: value} for span.X and .X
+        self.p = {}             # class -> {property: value} for p.X and .X
+        self.complex = set()    # classes some other selector names
+        self.p_unsafe = set()   # properties a descendant rule sets on <p>
+
+    def add_css(self, css):
+        for _, _, prelude, body in split_rules(CSS_COMMENT_RE.sub('', css)):
+            head = prelude.strip()
+            if body is None or head.startswith('@'):
+                continue
+            declarations = parse_declarations(body)
+            for selector in split_selectors(head):
+                m = SIMPLE_SELECTOR_RE.match(selector)
+                if not m:
+                    self.complex.update(re.findall(r'\.([\w-]+)', selector))
+                    if P_SUBJECT_RE.search(selector):
+                        self.p_unsafe.update(declarations)
+                    continue
+                tag, cls = m.groups()
+                if tag in (None, 'span'):
+                    self.span.setdefault(cls, {}).update(declarations)
+                if tag in (None, 'p'):
+                    self.p.setdefault(cls, {}).update(declarations)
+
+    def paragraph(self, classes):
+        """What the paragraph's own class rules give its text."""
+        props = {}
+        for cls in classes:
+            props.update(self.p.get(cls, {}))
+        return {k: v for k, v in props.items() if k not in self.p_unsafe}
+
+    def redundant(self, cls, classes, paragraph):
+        """Whether span class `cls`, one of the span's `classes`, changes
+        nothing inside a paragraph with `paragraph` styles.
+
+        `paragraph` is None when the span is not directly in a <p>.
+        """
+        if cls in self.complex or cls not in self.span:
+            return False
+        for prop, value in self.span[cls].items():
+            if prop in BLOCK_ONLY:
+                continue
+            if any(prop in self.span.get(other, {}) for other in classes if other != cls):
+                return False
+            if prop == 'font-size' and value in ('1em', '100%'):
+                continue
+            if prop in INHERITED and paragraph is not None and paragraph.get(prop) == value:
+                continue
+            return False
+        return True
+
+
+def parse_declarations(body):
+    props = {}
+    for declaration in body.split(';'):
+        prop, sep, value = declaration.partition(':')
+        if sep:
+            value = re.sub(r'\s*,\s*', ',', value.strip().lower()).replace('"', '').replace("'", '')
+            props[prop.strip().lower()] = value
+    return props
+
+
+def page_styles(content, sheets):
+    """PageStyles for a page; `sheets` caches stylesheet text by file name."""
+    styles = PageStyles()
+    for m in STYLESHEET_LINK_RE.finditer(content):
+        name = m.group(1)
+        if name not in sheets:
+            with open(os.path.join(STYLES_DIR, name), 'r', encoding='utf-8') as f:
+                sheets[name] = f.read()
+        styles.add_css(sheets[name])
+    for m in STYLE_BLOCK_RE.finditer(content):
+        styles.add_css(m.group(2))
+    return styles
+
+
+# ============================================================
+# Coalescing
+# ============================================================
+
+def tokenize(content):
+    """[kind, raw text, attributes] for every tag and text run in `content`."""
+    tokens = []
+    pos = 0
+    for m in MARKUP_TOKEN_RE.finditer(content):
+        if m.start() > pos:
+            tokens.append([OTHER, content[pos:m.start()], None])
+        pos = m.end()
+        slash, name, attrs, empty = m.groups()
+        kind = OTHER
+        if name in ('span', 'p') and not empty:
+            kind = f'/{name}' if slash else name
+        tokens.append([kind, m.group(0), (attrs or '').strip()])
+    if pos < len(content):
+        tokens.append([OTHER, content[pos:], None])
+    return tokens
+
+
+def class_only(attrs):
+    """The class list of a tag whose only attribute is class, else None."""
+    m = CLASS_ATTR_RE.search(attrs)
+    if not attrs:
+        return []
+    if m and not (attrs[:m.start()].strip() or attrs[m.end() + 1:].strip()):
+        return m.group(1).split()
+    return None
+
+
+def simplify_spans(tokens, styles):
+    """Drop empty spans and redundant span classes in place; returns the number of changes."""
+    changes = 0
+    stack = []
+    paragraph = None
+    for i, token in enumerate(tokens):
+        kind = token[0]
+        if kind == P_OPEN:
+            paragraph = styles.paragraph(class_only(token[2]) or [])
+        elif kind == P_CLOSE:
+            paragraph = None
+        elif kind == SPAN_OPEN:
+            stack.append(i)
+        elif kind == SPAN_CLOSE and stack:
+            start = stack.pop()
+            if all(t[0] is None for t in tokens[start + 1:i]):
+                tokens[start][0] = tokens[i][0] = None
+                changes += 1
+                continue
+            classes = class_only(tokens[start][2])
+            if classes is None:
+                continue
+            parent = paragraph if not stack else None
+            kept = [c for c in classes if not styles.redundant(c, classes, parent)]
+            if not kept:
+                tokens[start][0] = tokens[i][0] = None
+                changes += 1
+            elif kept != classes:
+                tokens[start][1] = f'<span class="{" ".join(kept)}">'
+                tokens[start][2] = f'class="{" ".join(kept)}"'
+                changes += 1
+    return changes
+
+
+def merge_spans(tokens):
+    """Merge adjacent sibling spans with identical attributes in place; returns the number merged."""
+    merged = 0
+    live = [t for t in tokens if t[0] is not None]
+    stack = []
+    opens = {}      # id(close token) -> its open token
+    for t in live:
+        if t[0] == SPAN_OPEN:
+            stack.append(t)
+        elif t[0] == SPAN_CLOSE and stack:
+            opens[id(t)] = stack.pop()
+    for a, b in zip(live, live[1:]):
+        if a[0] == SPAN_CLOSE and b[0] == SPAN_OPEN and id(a) in opens and opens[id(a)][2] == b[2]:
+            a[0] = b[0] = None
+            merged += 1
+    return merged
+
+
+def coalesce(content, styles):
+    """`content` with its span runs coalesced; returns (new content, number of changes)."""
+    tokens = tokenize(content)
+    changes = 0
+    while True:
+        step = simplify_spans(tokens, styles)
+        step += merge_spans(tokens)
+        tokens = [t for t in tokens if t[0] is not None]
+        if not step:
+            break
+        changes += step
+    return ''.join(t[1] for t in tokens), changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge and unwrap the InDesign span runs in the EPUB pages.')
+    parser.add_argument('--dry-run', action='store_true', help='report the savings without writing')
+    args = parser.parse_args()
+
+    sheets = {}
+    before = after = changes = pages = 0
+    for path in sorted(glob.glob(os.path.join(TEXT_DIR, '*.xhtml'))):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        if '<script' in content:
+            continue
+        new_content, n = coalesce(content, page_styles(content, sheets))
+        before += len(content.encode('utf-8'))
+        after += len(new_content.encode('utf-8'))
+        if n:
+            changes += n
+            pages += 1
+            if not args.dry_run:
+                with open(path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(new_content)
+    print(f'{changes} span changes in {pages} pages: {before:,} → {after:,} bytes')
+
+
+if __name__ == '__main__':
+    main()
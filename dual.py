@@ -0,0 +1,118 @@
+"""
+Dual food-service / home amounts: "10 cups (2 cups) sugar".
+
+Some recipes were written for a food-service kitchen with the home
+amount in parentheses after each quantity. find_dual_lines() reads a
+document's paragraphs.iter_events() stream and matches every ingredient
+paragraph's joined text against patterns.DUAL_PAIR_RE (split_dual()),
+so a pair split across spans
+
+    <span>1 pint (</span><span>⅓</span> <span>cup) milk</span>
+
+is found like any other. fix_scaling.plan_scaling() calls split_dual()
+from its own walk over the same events, so a page is tokenized once
+whichever script reads it. Parentheticals that size a package
+("1 package (7 ¼ oz)") or describe the item ("(26-30 count)", "(40%)")
+are not home amounts.
+
+A recipe is a dual-notation recipe (is_dual_recipe()) when at least
+DUAL_MIN_SHARE of its ingredient lines carry a home amount, or when its
+yield gives a home version ("80 servings (8 servings)") and any line
+does. keep_home_amounts() rewrites those lines to the home amount.
+"""
+
+from dataclasses import dataclass
+
+from paragraphs import END, START, TEXT, paragraph_text, primary_class, rebuild_p_tag
+from patterns import DUAL_CONTAINER_RE, DUAL_NOTE_RE, DUAL_PAIR_RE, DUAL_WEIGHT_RE, LEADING_COMMON_QTY_RE
+
+# Share of a recipe's ingredient lines that must be in dual notation.
+DUAL_MIN_SHARE = 0.25
+
+
+@dataclass
+class DualAmount:
+    food: str
+    unit: str
+    home: str
+    between: str = ''
+    rest: str = ''
+
+    @property
+    def home_text(self):
+        """The line with only the home amount: "2 cups sugar"."""
+        text = self.home.strip()
+        for part in (self.between.strip(), self.rest.strip()):
+            if part:
+                text += part if part[0] in ',;.' else ' ' + part
+        return text
+
+
+@dataclass
+class DualLine:
+    start: int          # offset of the <p>
+    end: int            # offset just past its </p>
+    p_open: str
+    span_class: str
+    text: str
+    amount: DualAmount
+    split: bool         # the paragraph's text is spread over several spans
+
+
+def split_dual(text):
+    """The DualAmount in an ingredient line, or None if it has no home amount."""
+    m = DUAL_PAIR_RE.match(text)
+    if not m:
+        return None
+    home = m.group('home')
+    if DUAL_NOTE_RE.search(home):
+        return None
+    if DUAL_CONTAINER_RE.match(m.group('unit')) and DUAL_WEIGHT_RE.match(home):
+        return None
+    return DualAmount(m.group('food'), m.group('unit'), home, m.group('between'), m.group('rest'))
+
+
+def find_dual_lines(events):
+    """Return (dual-notation lines, number of ingredient paragraphs) from one
+    pass over a document's paragraphs.iter_events() stream."""
+    lines = []
+    ingredients = 0
+    p_start = None
+    for kind, offset, value, spans in events:
+        if kind == START:
+            p_start, p_open, runs, first_class = offset, value, [], None
+        elif kind == TEXT and p_start is not None:
+            runs.append(value)
+            if first_class is None:
+                first_class = primary_class(spans)
+        elif kind == END and p_start is not None:
+            text = paragraph_text(runs)
+            if LEADING_COMMON_QTY_RE.match(text):
+                ingredients += 1
+                amount = split_dual(text)
+                if amount is not None:
+                    split = sum(1 for run in runs if run.strip()) > 1
+                    lines.append(DualLine(p_start, offset, p_open, first_class, text, amount, split))
+            p_start = None
+    return lines, ingredients
+
+
+def is_dual_recipe(lines, ingredients, recipe_yield=None):
+    """Whether a recipe with these dual lines (see find_dual_lines()) is written in dual notation."""
+    if not lines:
+        return False
+    if recipe_yield is not None and recipe_yield.home is not None:
+        return True
+    return len(lines) >= DUAL_MIN_SHARE * ingredients
+
+
+def keep_home_amounts(content, lines):
+    """Rewrite each dual line in `content` to its home amount."""
+    out = []
+    pos = 0
+    for line in lines:
+        out.append(content[pos:line.start])
+        out.append(rebuild_p_tag(line.p_open, line.span_class, line.amount.home_text))
+        pos = line.end
+    out.append(content[pos:])
+    return ''.join(out)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Scale the whole book to several target yields from one parse.
+
+fix_scaling.py rewrites the food-service recipes for a single TARGET.
+This script reads the original EPUB (--source) once, turns every recipe
+with a yield of 8 or more into a rescaling plan, and gathers the scalable
+ingredient amounts of the whole book into one column. The scale_value()
+curves (linear, seasoning, leavening, acid) are then applied to the
+ingredients x targets matrix in one computation - with NumPy when it is
+installed, a plain loop otherwise - and each column is rendered into its
+own edition:
+
+    editions/serves-2/Section0004.xhtml
+    editions/serves-4/Section0004.xhtml
+    ...
+
+Recipes that are already small are left out of the editions, just as
+fix_scaling.py leaves them alone.
+"""
+
+import argparse
+import os
+from fractions import Fraction
+
+from categories import ACID, LEAVENING, SEASONING
+from epub_source import EpubSource, add_source_argument
+from fix_scaling import (
+    ingredient_class, plan_ingredients, plan_scaling, render_scaling, scale_factor,
+)
+from recipe import document_yield
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+EDITIONS_DIR = os.path.join(ROOT, 'editions')
+
+# Servings we publish editions for.
+TARGETS = (2, 4, 5, 8, 12)
+
+
+def targets_type(value):
+    """argparse type for --targets: a comma-separated list of servings."""
+    try:
+        targets = tuple(int(t) for t in value.split(',') if t.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError('must be comma-separated whole numbers')
+    if not targets or min(targets) <= 0:
+        raise argparse.ArgumentTypeError('must list at least one positive yield')
+    return targets
+
+
+def scale_matrix(amounts, curves, yields, targets):
+    """Scale every amount to every target yield.
+
+    amounts[i] follows scaling curve curves[i] in a recipe that serves
+    yields[i]. Returns a len(amounts) x len(targets) matrix (a NumPy
+    array, or a list of rows without NumPy) of scaled amounts.
+    """
+    if np is None:
+        return [[amount * scale_factor(Fraction(target) / Fraction(orig_yield), curve)
+                 for target in targets]
+                for amount, curve, orig_yield in zip(amounts, curves, yields)]
+
+    values = np.array([float(a) for a in amounts], dtype=float)[:, None]
+    curves = np.array(curves, dtype=int)[:, None]
+    ratio = np.array(targets, dtype=float)[None, :] / np.array(yields, dtype=float)[:, None]
+
+    small = ratio < 0.5
+    factor = ratio
+    factor = np.where((curves == SEASONING) & small, np.sqrt(ratio), factor)
+    factor = np.where((curves == LEAVENING) & small, np.cbrt(ratio) * 0.6, factor)
+    factor = np.where(curves == ACID, 0.9 * ratio + 0.1, factor)
+    return values * factor
+
+
+def read_recipes(source_path):
+    """Plan every food-service recipe in the EPUB: a list of (section, plan, yield)."""
+    recipes = []
+    with EpubSource(source_path) as source:
+        for name in source.sections():
+            content = source.read_text(name)
+            recipe_yield = document_yield(content)
+            if not recipe_yield or not recipe_yield.food_service:
+                continue
+            section = os.path.basename(name).replace('.xhtml', '')
+            plan, _ = plan_scaling(content)
+            recipes.append((section, plan, recipe_yield.count))
+    return recipes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write rescaled editions of the book for several yields.')
+    parser.add_argument('--targets', type=targets_type, default=TARGETS, metavar='N,N,...',
+                        help='servings to publish editions for (default %(default)s)')
+    parser.add_argument('--out', default=EDITIONS_DIR, help='output directory (default %(default)s)')
+    add_source_argument(parser)
+    args = parser.parse_args()
+
+    recipes = read_recipes(args.source)
+
+    amounts, curves, yields, counts = [], [], [], []
+    for _, plan, orig_yield in recipes:
+        ingredients = plan_ingredients(plan)
+        counts.append(len(ingredients))
+        for qty, rest in ingredients:
+            amounts.append(qty)
+            curves.append(ingredient_class(rest))
+            yields.append(orig_yield)
+
+    print(f"Found {len(recipes)} recipes with yield >= 8 servings, {len(amounts)} scalable amounts")
+    matrix = scale_matrix(amounts, curves, yields, args.targets)
+
+    for col, target in enumerate(args.targets):
+        out_dir = os.path.join(args.out, f'serves-{target}')
+        os.makedirs(out_dir, exist_ok=True)
+        row = 0
+        for (section, plan, _), count in zip(recipes, counts):
+            scaled = [matrix[i][col] for i in range(row, row + count)]
+            row += count
+            with open(os.path.join(out_dir, f'{section}.xhtml'), 'w', encoding='utf-8') as f:
+                f.write(render_scaling(plan, target, scaled))
+        print(f"  serves-{target}: wrote {len(recipes)} recipes to {out_dir}")
+
+
+if __name__ == '__main__':
+    main()
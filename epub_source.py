@@ -0,0 +1,103 @@
+"""
+Read-only access to an EPUB, packed or unpacked.
+
+The batch scripts read the original recipes either from a released
+.epub archive or from an unpacked copy of one. EpubSource hides the
+difference: it lists members by their archive names
+("OEBPS/Text/Section0004.xhtml") and streams each one on demand, so an
+archive is never extracted to disk and a member is only decompressed
+when a script actually reads it.
+
+The original is never TheBestofBrock.epub in the repository root: that
+is package_epub.py's output, built from the already-processed pages. So
+--source has no default and must name the original.
+
+    with EpubSource('/path/to/original.epub') as source:
+        for name in source.sections():
+            content = source.read_text(name)
+"""
+
+import fnmatch
+import os
+import zipfile
+from functools import lru_cache
+
+TEXT_PREFIX = 'OEBPS/Text/'
+
+
+def add_source_argument(parser):
+    """Add the shared, required --source option (an .epub file or an unpacked EPUB directory)."""
+    parser.add_argument('--source', required=True, metavar='PATH',
+                        help='EPUB archive or unpacked EPUB directory to read the original, '
+                             'unprocessed recipes from (not the TheBestofBrock.epub package_epub.py writes)')
+
+
+class EpubSource:
+    """The members of an EPUB archive or of an unpacked EPUB directory."""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.isdir(path):
+            self._zip = None
+        elif os.path.isfile(path):
+            self._zip = zipfile.ZipFile(path, 'r')
+        else:
+            raise FileNotFoundError(f'EPUB source not found: {path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def names(self):
+        """Every member name, sorted, with '/' separators and no directories."""
+        if self._zip is not None:
+            return sorted(n for n in self._zip.namelist() if not n.endswith('/'))
+        names = []
+        for dirpath, _, filenames in os.walk(self.path):
+            rel = os.path.relpath(dirpath, self.path)
+            for fname in filenames:
+                names.append(fname if rel == '.' else f'{rel}/{fname}'.replace(os.sep, '/'))
+        return sorted(names)
+
+    def sections(self, pattern='Section*.xhtml'):
+        """Names of the recipe pages in OEBPS/Text/ matching `pattern`, sorted."""
+        return [n for n in self.names()
+                if n.startswith(TEXT_PREFIX) and fnmatch.fnmatch(n[len(TEXT_PREFIX):], pattern)]
+
+    def exists(self, name):
+        if self._zip is not None:
+            try:
+                self._zip.getinfo(name)
+            except KeyError:
+                return False
+            return True
+        return os.path.isfile(self._local(name))
+
+    def open(self, name):
+        """A binary file object that streams the member's bytes."""
+        if self._zip is not None:
+            return self._zip.open(name, 'r')
+        return open(self._local(name), 'rb')
+
+    def read(self, name):
+        with self.open(name) as f:
+            return f.read()
+
+    def read_text(self, name):
+        return self.read(name).decode('utf-8')
+
+    def _local(self, name):
+        return os.path.join(self.path, *name.split('/'))
+
+
+@lru_cache(maxsize=None)
+def open_source(path):
+    """An EpubSource for `path`, opened once per process (for pool workers)."""
+    return EpubSource(path)
@@ -3,72 +3,57 @@
 Fix recipes that have dual food-service/home annotations.
 These recipes have patterns like "10 eggs (1 egg)" where the parenthetical
 is the home version. We keep the parenthetical amount.
+
+The recipes are found rather than listed: one pass over --source reads
+every Section page, finds its dual-notation lines (see dual.py), also
+when a pair is split across spans, and prints a report of the sections
+that qualify. --report-only stops after the report.
+
+A fixed recipe's yield line is set to the home version its yield gives
+("80 servings (8 servings)" becomes "Yield: 8 servings"). A qualifying
+section whose yield has no home version is left alone and reported as
+needing a home yield, since nothing says how many servings the kept
+amounts make.
 """
 
-import re
+import argparse
 import os
 
-ORIG_DIR = '/tmp/epub_orig/OEBPS/Text'
-DEST_DIR = '/home/user/the-best-of-brock-cookbook/epub_work/OEBPS/Text'
+from batch import add_jobs_argument, run_jobs
+from dual import find_dual_lines, is_dual_recipe, keep_home_amounts
+from paragraphs import iter_events
+from epub_source import EpubSource, add_source_argument
+from patterns import YIELD_NODE_RE
+from recipe import document_yield
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEST_DIR = os.path.join(ROOT, 'epub_work/OEBPS/Text')
 
-FILES = {
-    'Section0004.xhtml': {'orig_yield': 80, 'home_yield': 8, 'target': 5},
-    'Section0053.xhtml': {'orig_yield': 50, 'home_yield': 8, 'target': 5},
-    'Section0095.xhtml': {'orig_yield': 32, 'home_yield': 10, 'target': 5},
-    'Section0130.xhtml': {'orig_yield': 25, 'home_yield': 6, 'target': 5},
-    'Section0152.xhtml': {'orig_yield': 20, 'home_yield': 6, 'target': 5},
-}
 
+def home_servings(recipe_yield):
+    """Servings of the home version a yield gives, or None."""
+    if recipe_yield is None or recipe_yield.home is None:
+        return None
+    return recipe_yield.baseline
 
-def process_dual_recipe(orig_path, dest_path, info):
+
+def process_dual_recipe(content, dest_path, lines, servings):
     """Process a dual-annotated recipe by keeping the home version amounts."""
-    with open(orig_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+
+    # Replace each "FOOD_SERVICE_AMT unit (HOME_AMT) ingredient" line
+    # with just "HOME_AMT ingredient"; the lines hold offsets into the
+    # original content, so this goes first.
+    content = keep_home_amounts(content, lines)
 
     # Fix Recepie typo
     content = content.replace('Recepie', 'Recipe')
     content = content.replace('recepie', 'recipe')
 
-    # For ingredient lines with "FOOD_SERVICE_AMT (HOME_AMT) ingredient":
-    # Replace with just "HOME_AMT ingredient"
-    # Pattern: number/fraction (parenthetical amount) rest-of-ingredient
-    def replace_dual_amount(match):
-        """Replace dual amount with just the parenthetical (home) version."""
-        prefix = match.group(1)  # opening span/tag
-        food_service_qty = match.group(2)  # the food service amount
-        home_amount = match.group(3)  # parenthetical home amount
-        ingredient = match.group(4)  # rest of ingredient text
-        suffix = match.group(5)  # closing tag
-
-        return f'{prefix}{home_amount} {ingredient}{suffix}'
-
-    # Match patterns like: <span...>10 eggs (1 egg), separated</span>
-    # More precisely: QUANTITY (QUANTITY) REST
-    content = re.sub(
-        r'(<span[^>]*>)'  # Opening span
-        r'([\d\u00BC-\u00BE\u2150-\u215E]+(?:\s*/\s*\d+)?(?:\s+[\d\u00BC-\u00BE\u2150-\u215E]+(?:\s*/\s*\d+)?)?'  # Food service qty
-        r'(?:\s*[a-zA-Z.]+(?:\s+[a-zA-Z.]+)?)?'  # Optional unit (e.g. "lbs", "oz", "cups")
-        r')\s*'
-        r'\(([^)]+)\)\s*'  # Parenthetical home amount
-        r'([^<]*)'  # Rest of ingredient
-        r'(</span>)',  # Closing span
-        replace_dual_amount,
-        content,
-        flags=re.UNICODE
-    )
-
-    # Also handle cases where the pattern spans across multiple spans
-    # e.g., <span...>1 pint (</span><span...>⅓</span> <span...>cup) milk</span>
-    # These are trickier - let's handle the simpler ones and fix residuals
-
     # Update yield line to home version
-    target = info['target']
-    content = re.sub(
-        r'(>)(Yield:\s*[^<]+?)(<)',
-        lambda m: f'{m.group(1)}Yield: {target} servings{m.group(3)}',
+    content = YIELD_NODE_RE.sub(
+        lambda m: f'{m.group(1)}Yield: {servings} servings{m.group(3)}',
         content,
         count=1,
-        flags=re.IGNORECASE
     )
 
     with open(dest_path, 'w', encoding='utf-8') as f:
@@ -77,11 +62,64 @@ def process_dual_recipe(orig_path, dest_path, info):
     return True
 
 
-for fname, info in FILES.items():
-    orig = os.path.join(ORIG_DIR, fname)
-    dest = os.path.join(DEST_DIR, fname)
-    if os.path.exists(orig):
-        process_dual_recipe(orig, dest, info)
-        print(f'Fixed {fname}: kept home version amounts, yield updated to {info["target"]}')
-    else:
-        print(f'WARNING: {orig} not found')
+def fix_dual_file(section, content, lines, servings):
+    process_dual_recipe(content, os.path.join(DEST_DIR, f'{section}.xhtml'), lines, servings)
+    print(f'Fixed {section}: kept home version amounts on {len(lines)} lines, yield updated to {servings}')
+
+
+def scan_source(source_path):
+    """One pass over the source: a (section, yield, dual lines, ingredient count, content) row per page."""
+    rows = []
+    with EpubSource(source_path) as source:
+        for name in source.sections():
+            section = os.path.basename(name).replace('.xhtml', '')
+            content = source.read_text(name)
+            lines, ingredients = find_dual_lines(iter_events(content))
+            recipe_yield = document_yield(content) if lines else None
+            rows.append((section, recipe_yield, lines, ingredients, content))
+    return rows
+
+
+def print_report(rows):
+    """List every section with dual-notation lines and whether it qualifies."""
+    print(f'{"section":12} {"yield":34} {"home":>4} {"dual lines":>10} {"split":>5}')
+    qualifying = needs_yield = 0
+    for section, recipe_yield, lines, ingredients, _ in rows:
+        if not lines:
+            continue
+        qualifies = is_dual_recipe(lines, ingredients, recipe_yield)
+        qualifying += qualifies
+        status = ''
+        if qualifies:
+            status = '  qualifies' if home_servings(recipe_yield) else '  needs a home yield'
+            needs_yield += not home_servings(recipe_yield)
+        yield_text = (recipe_yield.text or '') if recipe_yield else ''
+        home = recipe_yield.home if recipe_yield and recipe_yield.home is not None else ''
+        split = sum(line.split for line in lines)
+        print(f'{section:12} {yield_text[:34]:34} {str(home):>4} {f"{len(lines)}/{ingredients}":>10} {split:5}'
+              f'{status}')
+    print(f'{qualifying} of {len(rows)} sections qualify, {needs_yield} of them need a home yield')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep the home-version amounts in dual-notation recipes.')
+    add_jobs_argument(parser)
+    add_source_argument(parser)
+    parser.add_argument('--report-only', action='store_true',
+                        help='print which sections qualify without writing anything')
+    args = parser.parse_args()
+
+    rows = scan_source(args.source)
+    print_report(rows)
+    if args.report_only:
+        return
+
+    work = [(section, content, lines, home_servings(recipe_yield))
+            for section, recipe_yield, lines, ingredients, content in rows
+            if is_dual_recipe(lines, ingredients, recipe_yield) and home_servings(recipe_yield)]
+    for _ in run_jobs(fix_dual_file, work, args.jobs):
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Content-hash build manifest for incremental rebuilds.
+
+build-manifest.json sits next to content.opf and records, per script and
+per Section file, the hash of the input the script last read, the script
+version that processed it, and the hash of the output it wrote:
+
+    {"process_recipes": {"Section0004.xhtml":
+        {"input": "…", "version": "…", "output": "…"}}}
+
+A file is skipped when the script version is unchanged, the input hash
+matches what was recorded, and the output on disk is still the one the
+script wrote. The script version is a hash of the script's own source
+and the shared modules it imports, so editing a heuristic rebuilds
+everything and editing one recipe rebuilds one file.
+"""
+
+import hashlib
+import json
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = 'build-manifest.json'
+
+# Shared modules whose edits change every script's output.
+SHARED_SOURCES = ('categories.py', 'dual.py', 'paragraphs.py', 'patterns.py', 'quantity.py', 'recipe.py',
+                  'typos.py', 'yields.py')
+
+
+def add_force_argument(parser):
+    """Add the shared --force option (ignore the manifest, rebuild everything)."""
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every file even if the build manifest says it is up to date')
+
+
+def bytes_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_hash(text):
+    return bytes_hash(text.encode('utf-8'))
+
+
+def file_hash(path):
+    """sha256 of a file's bytes, or None if it doesn't exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def script_version(script_path, sources=SHARED_SOURCES):
+    """Hash of a script plus the shared modules it depends on."""
+    h = hashlib.sha256()
+    for path in (script_path,) + tuple(os.path.join(ROOT, s) for s in sources):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class BuildManifest:
+    """Per-script view of build-manifest.json."""
+
+    def __init__(self, oebps_dir, script, version):
+        self.path = os.path.join(oebps_dir, MANIFEST_NAME)
+        self.script = script
+        self.version = version
+        self.data = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        self.entries = self.data.setdefault(script, {})
+
+    def is_fresh(self, name, input_hash, output_path):
+        """True if `name` was built from this input by this version and is untouched since."""
+        entry = self.entries.get(name)
+        if not entry or entry.get('version') != self.version:
+            return False
+        # In-place scripts read the file they last wrote, so their input
+        # is fresh when it equals the recorded output.
+        if input_hash not in (entry.get('input'), entry.get('output')):
+            return False
+        return file_hash(output_path) == entry.get('output')
+
+    def record(self, name, input_hash, output_path):
+        self.entries[name] = {
+            'input': input_hash,
+            'version': self.version,
+            'output': file_hash(output_path),
+        }
+
+    def save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, self.path)
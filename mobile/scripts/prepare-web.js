@@ -1,8 +1,8 @@
 #!/usr/bin/env node
 // Stage the cookbook web app into ./www so Capacitor can bundle it into the
 // iOS/Android projects. Copies:
-//   ../index.html, ../manifest.webmanifest, ../sw.js, ../assets/**,
-//   ../epub_work/OEBPS/**,  ../TheBestofBrock.epub
+//   ../index.html, ../manifest.webmanifest, ../sw.js, ../precache-manifest.js,
+//   ../assets/**, ../epub_work/OEBPS/**,  ../TheBestofBrock.epub
 // into mobile/www/ preserving the relative layout expected by index.html.
 
 const fs = require('fs');
@@ -15,6 +15,7 @@ const INCLUDES = [
   'index.html',
   'manifest.webmanifest',
   'sw.js',
+  'precache-manifest.js',
   'TheBestofBrock.epub',
   'assets',
   path.join('epub_work', 'OEBPS')
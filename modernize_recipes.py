@@ -4,7 +4,8 @@ Modernize each recipe page using BeautifulSoup for safe XHTML editing.
 
 For every Section*.xhtml that looks like a recipe page:
 
-1. Ensure book-modern.css is linked.
+1. Ensure book-modern.css is linked (directly or in an optimize_css.py
+   bundle).
 2. Add class="recipe-page" and data-baseline-yield="N" to <body>.
 3. Remove the old toolbar (both the <p><strong>Kitchen Timer...</strong></p>
    label and the subsequent row of 4 icon links) and replace it with a
@@ -13,80 +14,91 @@ For every Section*.xhtml that looks like a recipe page:
    baseline yield and ingredient lines.
 4. Replace the nutrition PNG with a modern .nutrition-card that supersedes
    the image (the original image is kept inside a <details>).
+
+Pages are edited with lxml when it is installed: the XHTML is parsed as
+XML, every element is indexed in one walk of the tree, and the result
+serializes with proper XHTML void elements and the original prolog,
+DOCTYPE and entity references intact. Without lxml, or for a page that
+isn't well-formed XML, BeautifulSoup's html.parser does the same edits.
+
+What goes into the edits (the title, yield, ingredient lines and which
+image is the nutrition panel) is read from recipe.cached_recipe(), which
+is stored in .cache/recipes/ by page hash and parser version. After a
+change to this script's toolbar or card markup, a rerun only rebuilds
+the markup; the pages' facts come from the cache.
 """
 
+import argparse
 import glob
-import html
 import os
-import re
 import urllib.parse
+from collections import defaultdict
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+import profiling
+from batch import add_jobs_argument, run_jobs
+from manifest import BuildManifest, add_force_argument, file_hash, script_version
+from patterns import CSS_BUNDLE_RE, TOOL_LABEL_RE, VOID_TAG_RE, WHITESPACE_RE, XMLNS_XML_TAG_RE
+from recipe import cached_recipe
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 TEXT_DIR = os.path.join(ROOT, 'epub_work/OEBPS/Text')
 
-TOOL_LABEL_RE = re.compile(r'Kitchen\s+Timer.*Unit\s+Converter', re.DOTALL | re.IGNORECASE)
 TOOL_HREFS = {'Text/Timer.xhtml', 'Text/Multiplier.xhtml', 'Text/ShoppingList.xhtml', 'Text/Converter.xhtml'}
 
-INSTRUCTION_VERBS = re.compile(
-    r'^\s*(preheat|bake|cook|mix|combine|whisk|stir|serve|heat|boil|saut[eé]|'
-    r'chop|slice|fry|grill|fold|drain|chill|add|pour|beat|cream|blend|'
-    r'remove|spread|sprinkle|arrange|place|cover|uncover|set\s+aside|season|'
-    r'bring\s+to|transfer|roll|knead|let\s+rise|refrigerate|marinate|'
-    r'coat|dredge|dip|reduce|deglaze|simmer|braise|roast|garnish|cut)\b',
-    re.IGNORECASE,
-)
+NUTRITION_NOTE = ('The nutrition panel below reflects the printed per-serving values. '
+                  'When you scale this recipe, totals change proportionally — salt, '
+                  'spices, and leavening are scaled sub-linearly by the smart scaler.')
 
-BOILERPLATE_RE = re.compile(r'Kitchen\s+Timer|Recipe\s+Multiplier|Shopping\s+List|Unit\s+Converter|Yield\s*:|Makes\b', re.IGNORECASE)
+BACKENDS = ('auto', 'lxml', 'bs4')
 
+XHTML_NS = 'http://www.w3.org/1999/xhtml'
+XML_NS = 'http://www.w3.org/XML/1998/namespace'
 
-def text_of(tag):
-    """Plain text with normalized whitespace."""
-    return re.sub(r'\s+', ' ', tag.get_text(' ')).strip()
+# lxml has no way to keep an xmlns:xml declaration (the prefix is built
+# in), so it rides through the tree as this attribute and is renamed back
+# after serialization.
+XMLNS_XML_KEY = '_xmlns_xml'
+
+# BeautifulSoup collapses whitespace-only text outside these tags; the
+# document itself is listed so the page's indentation is kept as written.
+PRESERVE_WHITESPACE_TAGS = {'[document]', 'pre', 'textarea'}
 
+# Elements that serialize as <tag/>; every other empty element keeps its end tag.
+VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                       'link', 'meta', 'param', 'source', 'track', 'wbr'})
 
-def find_title(soup):
-    h2 = soup.find('h2', id='heading_id_2')
-    if h2:
-        return text_of(h2)
-    h2 = soup.find('h2')
-    return text_of(h2) if h2 else ''
 
+# ============================================================
+# Shared helpers and the BeautifulSoup backend
+# ============================================================
 
-def extract_baseline_yield(soup):
-    """Find the smallest sensible integer on the Yield:/Makes line.
 
-    Operates on the specific <p> containing the word, so we don't bleed
-    into the author's name on the following paragraph.
+def text_of(tag):
+    """Plain text with normalized whitespace."""
+    return WHITESPACE_RE.sub(' ', tag.get_text(' ')).strip()
+
+
+def nutrition_image(images, recipe, removed):
+    """The nutrition panel among a page's `images` (in document order), or None.
+
+    The Recipe records the candidates' positions, so neither backend looks
+    at the images' attributes again. Images for which `removed(img)` is
+    true went out with the old toolbar and are skipped.
     """
-    raw = None
-    for p in soup.find_all('p'):
-        t = text_of(p)
-        if not t:
-            continue
-        m = re.search(r'Yield\s*:\s*([^.\n]+)', t, re.IGNORECASE)
-        if m:
-            raw = m.group(1).strip()
-            break
-        m = re.search(r'^Makes\s+(.+)$', t, re.IGNORECASE)
-        if m:
-            raw = 'Makes ' + m.group(1).strip()
-            break
-    if not raw:
-        return None, None
-
-    nums = re.findall(r'\d+', raw)
-    if not nums:
-        return None, raw
-    n = int(nums[0])
-    if n > 20:
-        for cand in nums[1:]:
-            c = int(cand)
-            if 1 <= c <= 20:
-                n = c
-                break
-    return n, raw
+    for i in recipe.nutrition_images:
+        if i < len(images) and not removed(images[i]):
+            return images[i]
+    return None
 
 
 def find_old_toolbar_parts(soup):
@@ -124,57 +136,8 @@ def find_old_toolbar_parts(soup):
     return unique
 
 
-def extract_ingredient_lines(soup, title):
-    """Return a list of short ingredient-like lines.
-
-    Heuristic: gather all <p> paragraphs that come after the old toolbar
-    and before the first clearly instructional paragraph.
-    """
-    all_ps = soup.find_all('p')
-    if not all_ps:
-        return []
-
-    # Find index of the toolbar label paragraph (if any); ingredients start
-    # AFTER that. If not found, start from 0.
-    start = 0
-    for i, p in enumerate(all_ps):
-        t = text_of(p)
-        if TOOL_LABEL_RE.search(t) and len(t) < 80:
-            start = i + 1
-            break
-
-    lines = []
-    for p in all_ps[start:]:
-        t = text_of(p)
-        if not t:
-            continue
-        # Stop once we hit an instruction verb.
-        if INSTRUCTION_VERBS.match(t):
-            break
-        if len(t) > 110:
-            break
-        # Skip obvious boilerplate and yield/author lines
-        if BOILERPLATE_RE.search(t):
-            continue
-        if title and title.lower() in t.lower() and len(t) < len(title) + 20:
-            continue
-        # Skip ingredient subheaders that are uppercase words only
-        if re.match(r'^[A-Z][A-Za-z /&()\-]{1,40}$', t) and t.isupper() is False and ' ' not in t:
-            continue
-        # Require the line to look like a starting ingredient: starts with digit/fraction/letter
-        lines.append(t)
-    # Deduplicate while preserving order; drop the author name and anything after a blank
-    cleaned = []
-    seen = set()
-    for l in lines:
-        if l in seen:
-            continue
-        seen.add(l)
-        cleaned.append(l)
-    return cleaned
-
-
-def build_toolbar(soup, baseline, ingredients_text, title):
+def toolbar_links(baseline, ingredients_text, title):
+    """(text, href, img src, img alt, primary) for each link of the new toolbar."""
     scale_params = {
         'from': str(baseline or ''),
         'to': str(baseline or ''),
@@ -188,9 +151,21 @@ def build_toolbar(soup, baseline, ingredients_text, title):
                                     quote_via=urllib.parse.quote)
         return f'{base}?{qs}' if qs else base
 
-    nav = soup.new_tag('nav', **{'class': 'recipe-toolbar'})
+    return [
+        ('Scale this recipe',
+         href('../Text/Multiplier.xhtml', scale_params) if baseline else '../Text/Multiplier.xhtml',
+         '../Images/Multiplier.jpg', 'Scale', True),
+        ('Timer', '../Text/Timer.xhtml', '../Images/Timer.png', 'Timer', False),
+        ('Shopping List',
+         href('../Text/ShoppingList.xhtml', shop_params) if baseline else '../Text/ShoppingList.xhtml',
+         '../Images/shopping-list.png', 'Shopping List', False),
+        ('Convert', '../Text/Converter.xhtml', '../Images/Converter.jpg', 'Convert', False),
+    ]
+
 
-    def add_link(text, href_val, img_src, img_alt, primary=False):
+def build_toolbar(soup, baseline, ingredients_text, title):
+    nav = soup.new_tag('nav', **{'class': 'recipe-toolbar'})
+    for text, href_val, img_src, img_alt, primary in toolbar_links(baseline, ingredients_text, title):
         a = soup.new_tag('a', href=href_val, title=text)
         if primary:
             a['class'] = 'recipe-toolbar-primary'
@@ -199,19 +174,6 @@ def build_toolbar(soup, baseline, ingredients_text, title):
         a.append(' ' + text)
         nav.append('\n  ')
         nav.append(a)
-
-    add_link(
-        'Scale this recipe',
-        href('../Text/Multiplier.xhtml', scale_params) if baseline else '../Text/Multiplier.xhtml',
-        '../Images/Multiplier.jpg', 'Scale', primary=True,
-    )
-    add_link('Timer', '../Text/Timer.xhtml', '../Images/Timer.png', 'Timer')
-    add_link(
-        'Shopping List',
-        href('../Text/ShoppingList.xhtml', shop_params) if baseline else '../Text/ShoppingList.xhtml',
-        '../Images/shopping-list.png', 'Shopping List',
-    )
-    add_link('Convert', '../Text/Converter.xhtml', '../Images/Converter.jpg', 'Convert')
     nav.append('\n')
     return nav
 
@@ -229,9 +191,7 @@ def build_nutrition_card(soup, baseline, yield_raw, img_tag):
     card.append(head)
 
     note = soup.new_tag('p', **{'class': 'nutrition-card-note'})
-    note.string = ('The nutrition panel below reflects the printed per-serving values. '
-                   'When you scale this recipe, totals change proportionally — salt, '
-                   'spices, and leavening are scaled sub-linearly by the smart scaler.')
+    note.string = NUTRITION_NOTE
     card.append(note)
 
     actions = soup.new_tag('div', **{'class': 'nutrition-card-actions'})
@@ -256,12 +216,19 @@ def build_nutrition_card(soup, baseline, yield_raw, img_tag):
     return card
 
 
+def links_book_css(href):
+    """Whether a stylesheet href loads book-modern.css, alone or in a bundle."""
+    name = href.rsplit('/', 1)[-1]
+    m = CSS_BUNDLE_RE.match(name)
+    return 'book-modern' in (m.group(1).split('+') if m else [os.path.splitext(name)[0]])
+
+
 def ensure_css(soup):
     head = soup.find('head')
     if not head:
         return False
     for link in head.find_all('link', href=True):
-        if link['href'].endswith('book-modern.css'):
+        if links_book_css(link['href']):
             return False
     link = soup.new_tag('link', href='../Styles/book-modern.css', rel='stylesheet', type='text/css')
     head.append('\n  ')
@@ -282,104 +249,413 @@ def patch_body(soup, baseline):
     return True
 
 
-def process_file(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        raw = f.read()
+def modernize_soup(raw, recipe):
+    """Apply the edits with BeautifulSoup; returns the new document."""
+    with profiling.stage('parse'):
+        soup = BeautifulSoup(raw, 'html.parser', preserve_whitespace_tags=PRESERVE_WHITESPACE_TAGS)
+        images = soup.find_all('img')
+
+    title = recipe.title
+    baseline, yield_raw = recipe.yield_count, recipe.yield_text
+    ingredients_text = '\n'.join(recipe.ingredient_lines)
+
+    with profiling.stage('head/body'):
+        # 1. CSS
+        ensure_css(soup)
+
+        # 2. Body class + data-baseline-yield
+        patch_body(soup, baseline)
+
+    with profiling.stage('toolbar'):
+        # 3. Remove old toolbar parts
+        victims = find_old_toolbar_parts(soup)
+        anchor_point = None
+        for v in victims:
+            if anchor_point is None and v.parent:
+                anchor_point = v
+            v.decompose()
+
+        # Build + insert new toolbar. Place it as a sibling immediately after
+        # the h2 title. That way it lands in the same frame as the title even
+        # if the whole recipe is wrapped in one big Basic-Text-Frame.
+        new_toolbar = build_toolbar(soup, baseline, ingredients_text, title)
+        h2 = soup.find('h2', id='heading_id_2') or soup.find('h2')
+        if h2:
+            h2.insert_after('\n')
+            h2.insert_after(new_toolbar)
+        else:
+            body = soup.find('body')
+            if body:
+                body.insert(0, new_toolbar)
+
+    with profiling.stage('nutrition card'):
+        # 4. Replace nutrition PNG with card
+        img = nutrition_image(images, recipe, lambda img: img.decomposed)
+        if img:
+            # Walk up to the enclosing <p> or <div> that wraps only this image
+            container = img.parent
+            while container and container.name not in ('p', 'div') and container.name != 'body':
+                container = container.parent
+            card = build_nutrition_card(soup, baseline, yield_raw, img)
+            if container and container.name in ('p', 'div'):
+                container.replace_with(card)
+            else:
+                img.replace_with(card)
 
-    soup = BeautifulSoup(raw, 'html.parser')
+    with profiling.stage('serialize'):
+        # Serialize — preserve XHTML self-closing tags.
+        out = soup.encode(formatter='minimal').decode('utf-8')
 
-    # Skip non-recipe pages
-    body_text = soup.get_text(' ', strip=True)
-    if ('Kitchen Timer' not in body_text and 'Recipe Multiplier' not in body_text):
-        return False
+        # bs4 writes its own newline after the DOCTYPE; keep the prolog
+        # exactly as it was written, as the lxml backend does.
+        start, at = raw.find('<html'), out.find('<html')
+        if start >= 0 and at >= 0:
+            out = raw[:start] + out[at:]
 
-    title = find_title(soup)
-    baseline, yield_raw = extract_baseline_yield(soup)
-    ingredients = extract_ingredient_lines(soup, title)
-    ingredients_text = '\n'.join(ingredients)
+        # Add XML prolog + DOCTYPE back if they got stripped (they usually survive in html.parser)
+        if not out.lstrip().startswith('<?xml'):
+            prolog = '<?xml version="1.0" encoding="utf-8"?>\n'
+            doctype = ('<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN"\n'
+                       '  "http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">\n\n')
+            out = prolog + doctype + out
 
-    # 1. CSS
-    ensure_css(soup)
+        # Self-close void elements (XHTML)
+        return VOID_TAG_RE.sub(r'<\1\2/>', out)
 
-    # 2. Body class + data-baseline-yield
-    patch_body(soup, baseline)
 
-    # 3. Remove old toolbar parts
-    victims = find_old_toolbar_parts(soup)
-    anchor_point = None
-    for v in victims:
-        if anchor_point is None and v.parent:
-            anchor_point = v
-        v.decompose()
-
-    # Build + insert new toolbar. Place it as a sibling immediately after
-    # the h2 title. That way it lands in the same frame as the title even
-    # if the whole recipe is wrapped in one big Basic-Text-Frame.
-    new_toolbar = build_toolbar(soup, baseline, ingredients_text, title)
-    h2 = soup.find('h2', id='heading_id_2') or soup.find('h2')
-    if h2:
-        h2.insert_after('\n')
-        h2.insert_after(new_toolbar)
+# ============================================================
+# lxml backend
+# ============================================================
+
+def _x(tag):
+    return f'{{{XHTML_NS}}}{tag}'
+
+
+def local_name(el):
+    return etree.QName(el).localname
+
+
+def attribute_name(key):
+    """An attribute as written in the document: xml:lang rather than {…}lang."""
+    if key == XMLNS_XML_KEY:
+        return 'xmlns:xml'
+    return key.replace(f'{{{XML_NS}}}', 'xml:')
+
+
+def keep_xmlns_xml(raw, root):
+    """Carry the xmlns:xml declarations in `raw` onto their elements as XMLNS_XML_KEY."""
+    declared = {}
+    for m in XMLNS_XML_TAG_RE.finditer(raw):
+        # lxml's sourceline is the line a start tag ends on.
+        declared[raw.count('\n', 0, m.end()) + 1, m.group(1)] = m.group(2)
+    if not declared:
+        return
+    for el in root.iter(etree.Element):
+        uri = declared.get((el.sourceline, etree.QName(el).localname))
+        if uri is not None:
+            el.set(XMLNS_XML_KEY, uri)
+
+
+def is_attached(el, root):
+    """True while `el` is still under `root`.
+
+    A detached element stays in the same lxml document, so
+    getroottree().getroot() would still return root; walk the ancestors.
+    """
+    return any(a is root for a in el.iterancestors())
+
+
+def index_elements(root):
+    """Every element by local name, in document order, from one walk of the tree."""
+    found = defaultdict(list)
+    for el in root.iter(etree.Element):
+        found[local_name(el)].append(el)
+    return found
+
+
+def xml_text_of(el):
+    return WHITESPACE_RE.sub(' ', ' '.join(el.itertext())).strip()
+
+
+def new_element(tag, text=None, **attrib):
+    el = etree.Element(_x(tag), {k.rstrip('_'): v for k, v in attrib.items()})
+    el.text = text
+    return el
+
+
+def append_text(parent, text):
+    """Append text after the last child of `parent` (or as its text)."""
+    if len(parent):
+        parent[-1].tail = (parent[-1].tail or '') + text
     else:
-        body = soup.find('body')
-        if body:
-            body.insert(0, new_toolbar)
-
-    # 4. Replace nutrition PNG with card
-    img = None
-    for candidate in soup.find_all('img'):
-        src = candidate.get('src', '')
-        alt = candidate.get('alt', '')
-        if 'Nutrition' in alt:
-            img = candidate
-            break
-        if re.search(r'Images/\d{4,}\.png$', src):
-            img = candidate
-            # Don't break — prefer an explicit alt="Nutrition Information" if one exists later.
-    if img:
-        # Walk up to the enclosing <p> or <div> that wraps only this image
-        container = img.parent
-        while container and container.name not in ('p', 'div') and container.name != 'body':
-            container = container.parent
-        card = build_nutrition_card(soup, baseline, yield_raw, img)
-        if container and container.name in ('p', 'div'):
-            container.replace_with(card)
+        parent.text = (parent.text or '') + text
+
+
+def remove_element(el):
+    """Detach `el`, keeping the text that followed it in place."""
+    parent = el.getparent()
+    if parent is None:
+        return
+    if el.tail:
+        prev = el.getprevious()
+        if prev is not None:
+            prev.tail = (prev.tail or '') + el.tail
         else:
-            img.replace_with(card)
+            parent.text = (parent.text or '') + el.tail
+    parent.remove(el)
+
+
+def xml_find_old_toolbar_parts(elements):
+    """find_old_toolbar_parts() over the elements from index_elements()."""
+    victims = []
+    for p in elements['p']:
+        t = xml_text_of(p)
+        if t and TOOL_LABEL_RE.search(t) and len(t) < 80:
+            victims.append(p)
+            break
+    for p in elements['p']:
+        anchors = [a for a in p.iter(_x('a')) if a.get('href') is not None]
+        if len(anchors) >= 3:
+            hits = sum(1 for a in anchors if any(h in a.get('href') for h in TOOL_HREFS))
+            if hits >= 3:
+                victims.append(p)
+    for a in elements['a']:
+        href = a.get('href')
+        if href is not None and 'sgc-5' in (a.get('class') or '').split() \
+                and any(h in href for h in TOOL_HREFS):
+            victims.append(a)
+    return list({id(v): v for v in victims}.values())
+
+
+def xml_build_toolbar(baseline, ingredients_text, title):
+    nav = new_element('nav', '\n  ', class_='recipe-toolbar')
+    links = toolbar_links(baseline, ingredients_text, title)
+    for i, (text, href_val, img_src, img_alt, primary) in enumerate(links):
+        a = etree.SubElement(nav, _x('a'), href=href_val, title=text)
+        if primary:
+            a.set('class', 'recipe-toolbar-primary')
+        img = etree.SubElement(a, _x('img'), alt=img_alt, src=img_src)
+        img.tail = ' ' + text
+        a.tail = '\n' if i == len(links) - 1 else '\n  '
+    return nav
+
 
-    # Serialize — preserve XHTML self-closing tags.
-    out = soup.encode(formatter='minimal').decode('utf-8')
+def xml_build_nutrition_card(baseline, yield_raw, img):
+    card = new_element('div', class_='nutrition-card')
+    head = etree.SubElement(card, _x('div'), {'class': 'nutrition-card-head'})
+    head.append(new_element('span', 'Nutrition & Yield', class_='nutrition-card-title'))
+    yield_text = yield_raw or (f'{baseline} servings' if baseline else 'See recipe')
+    head.append(new_element('span', yield_text, class_='nutrition-card-yield'))
+    card.append(new_element('p', NUTRITION_NOTE, class_='nutrition-card-note'))
+
+    actions = etree.SubElement(card, _x('div'), {'class': 'nutrition-card-actions'})
+    actions.append(new_element('a', 'Open Scaler', href='../Text/Multiplier.xhtml'))
+    actions.append(new_element('a', 'Unit Converter', href='../Text/Converter.xhtml', class_='secondary'))
+
+    if img is not None:
+        details = etree.SubElement(card, _x('details'), {'class': 'nutrition-original'})
+        details.append(new_element('summary', 'Original nutrition panel'))
+        details.append(new_element('img', alt=img.get('alt', 'Nutrition Information'),
+                                   src=img.get('src', '')))
+    return card
 
-    # Add XML prolog + DOCTYPE back if they got stripped (they usually survive in html.parser)
-    if not out.lstrip().startswith('<?xml'):
-        prolog = '<?xml version="1.0" encoding="utf-8"?>\n'
-        doctype = ('<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN"\n'
-                   '  "http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">\n\n')
-        out = prolog + doctype + out
 
-    # Self-close void elements (XHTML)
-    out = re.sub(r'<(img|br|hr|meta|link|input)([^>]*?)(?<!/)>', r'<\1\2/>', out)
+def modernize_xml(raw, recipe):
+    """Apply the edits with lxml; returns the new document, or None if `raw` isn't well-formed XML."""
+    with profiling.stage('parse'):
+        parser = etree.XMLParser(strip_cdata=False, resolve_entities=False,
+                                 load_dtd=False, no_network=True)
+        try:
+            root = etree.fromstring(raw.encode('utf-8'), parser)
+        except etree.XMLSyntaxError:
+            return None
+        keep_xmlns_xml(raw, root)
+        elements = index_elements(root)
+
+    baseline, yield_raw = recipe.yield_count, recipe.yield_text
+
+    with profiling.stage('head/body'):
+        # 1. CSS
+        head = root.find(_x('head'))
+        if head is not None and not any(links_book_css(link.get('href') or '')
+                                        for link in head.iter(_x('link'))):
+            append_text(head, '\n  ')
+            link = etree.SubElement(head, _x('link'), href='../Styles/book-modern.css',
+                                    rel='stylesheet', type='text/css')
+            link.tail = '\n'
+
+        # 2. Body class + data-baseline-yield
+        body = root.find(_x('body'))
+        if body is not None:
+            classes = set((body.get('class') or '').split())
+            classes.add('recipe-page')
+            body.set('class', ' '.join(sorted(classes)))
+            if baseline:
+                body.set('data-baseline-yield', str(baseline))
+
+    with profiling.stage('toolbar'):
+        # 3. Replace the old toolbar, right after the title
+        removed = xml_find_old_toolbar_parts(elements)
+        for v in removed:
+            remove_element(v)
+
+        nav = xml_build_toolbar(baseline, '\n'.join(recipe.ingredient_lines), recipe.title)
+        h2s = elements['h2']
+        h2 = next((h for h in h2s if h.get('id') == 'heading_id_2'), h2s[0] if h2s else None)
+        if h2 is not None:
+            nav.tail = '\n' + (h2.tail or '')
+            h2.tail = None
+            h2.addnext(nav)
+        elif body is not None:
+            nav.tail = body.text
+            body.text = None
+            body.insert(0, nav)
+
+    with profiling.stage('nutrition card'):
+        # 4. Replace nutrition PNG with card
+        img = nutrition_image(elements['img'], recipe, lambda img: not is_attached(img, root))
+        if img is not None:
+            container = img.getparent()
+            while container is not None and local_name(container) not in ('p', 'div', 'body'):
+                container = container.getparent()
+            card = xml_build_nutrition_card(baseline, yield_raw, img)
+            target = container if container is not None and local_name(container) != 'body' else img
+            card.tail = target.tail
+            target.getparent().replace(target, card)
+
+    with profiling.stage('serialize'):
+        # Empty non-void elements keep their end tag (<p></p>, not <p/>), and
+        # attributes are sorted the way BeautifulSoup writes them.
+        for el in root.iter(etree.Element):
+            if el.text is None and not len(el) and local_name(el) not in VOID_TAGS:
+                el.text = ''
+            names = [attribute_name(k) for k in el.attrib.keys()]
+            if names != sorted(names):
+                items = sorted(el.attrib.items(), key=lambda kv: attribute_name(kv[0]))
+                el.attrib.clear()
+                el.attrib.update(items)
+
+        # The prolog, DOCTYPE and anything after </html> are kept as they were.
+        start = raw.index('<html')
+        end = raw.rindex('</html>') + len('</html>')
+        out = etree.tostring(root, encoding='unicode').replace(f' {XMLNS_XML_KEY}="', ' xmlns:xml="')
+        return raw[:start] + out + raw[end:]
+
+
+# ============================================================
+# Driver
+# ============================================================
+
+def modernize_page(raw, backend='auto'):
+    """The modernized document, or `raw` itself for a page without the old toolbar."""
+    # Title, yield, ingredients and the nutrition panel come from the shared
+    # Recipe model, which is cached per document; pages without the old
+    # toolbar are skipped before either backend ever parses them.
+    with profiling.stage('yield'):
+        recipe = cached_recipe(raw)
+    if not recipe.has_old_toolbar:
+        return raw
+
+    out = None
+    if backend != 'bs4' and etree is not None:
+        out = modernize_xml(raw, recipe)
+    if out is None:
+        if backend == 'lxml' or BeautifulSoup is None:
+            raise RuntimeError('not well-formed XML' if etree is not None else 'lxml is not installed')
+        out = modernize_soup(raw, recipe)
+    return out
+
+
+def process_file(path, backend='auto'):
+    with profiling.stage('read'), open(path, 'r', encoding='utf-8') as f:
+        raw = f.read()
 
+    out = modernize_page(raw, backend)
     if out != raw:
-        with open(path, 'w', encoding='utf-8') as f:
+        with profiling.stage('write'), open(path, 'w', encoding='utf-8') as f:
             f.write(out)
         return True
     return False
 
 
+def try_process_file(path, backend='auto'):
+    """process_file() for a worker pool: returns (modified, error message)."""
+    try:
+        return process_file(path, backend), None
+    except Exception as e:
+        return False, str(e)
+
+
+def check_backends(paths):
+    """Pages whose lxml and bs4 results differ, as (name, first differing line)."""
+    mismatches = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        try:
+            xml_out = modernize_page(raw, 'lxml')
+        except RuntimeError:
+            # Not well-formed XML: auto mode hands it to bs4 anyway.
+            continue
+        soup_out = modernize_page(raw, 'bs4')
+        if xml_out != soup_out:
+            xml_lines, soup_lines = xml_out.splitlines(), soup_out.splitlines()
+            line = next((i for i, (a, b) in enumerate(zip(xml_lines, soup_lines)) if a != b),
+                        min(len(xml_lines), len(soup_lines)))
+            mismatches.append((os.path.basename(path), line + 1))
+    return mismatches
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Modernize recipe pages (toolbar, nutrition card, CSS).')
+    add_jobs_argument(parser)
+    add_force_argument(parser)
+    profiling.add_profile_argument(parser)
+    parser.add_argument('--backend', choices=BACKENDS, default='auto',
+                        help='lxml (fast), bs4 (BeautifulSoup), or auto: lxml when installed, '
+                             'falling back to bs4 per page (default %(default)s)')
+    parser.add_argument('--check-backends', action='store_true',
+                        help='run both backends over the Text pages without writing and '
+                             'exit non-zero if their output differs')
+    args = parser.parse_args()
+    if etree is None and BeautifulSoup is None:
+        parser.error('needs lxml or beautifulsoup4 (pip install lxml)')
+    if args.backend == 'lxml' and etree is None:
+        parser.error('--backend lxml needs lxml (pip install lxml)')
+    if args.backend == 'bs4' and BeautifulSoup is None:
+        parser.error('--backend bs4 needs beautifulsoup4 (pip install beautifulsoup4)')
+    if args.check_backends:
+        if etree is None or BeautifulSoup is None:
+            parser.error('--check-backends needs both lxml and beautifulsoup4')
+        mismatches = check_backends(sorted(glob.glob(os.path.join(TEXT_DIR, '*.xhtml'))))
+        for name, line in mismatches:
+            print(f'DIFFERS {name}: line {line}')
+        print(f'Backends differ on {len(mismatches)} page(s)')
+        raise SystemExit(1 if mismatches else 0)
+    jobs = profiling.start(args)
+
     files = sorted(glob.glob(os.path.join(TEXT_DIR, 'Section*.xhtml')))
+    manifest = BuildManifest(os.path.dirname(TEXT_DIR), 'modernize_recipes',
+                             script_version(os.path.abspath(__file__)))
+    input_hashes = {p: file_hash(p) for p in files}
+    stale = [p for p in files
+             if args.force or not manifest.is_fresh(os.path.basename(p), input_hashes[p], p)]
+
     ok, skipped, errors = 0, 0, 0
-    for path in files:
-        try:
-            if process_file(path):
-                ok += 1
-            else:
-                skipped += 1
-        except Exception as e:
+    for path, (modified, error) in zip(stale, run_jobs(profiling.per_file(try_process_file), [(p, args.backend) for p in stale], jobs)):
+        if error is not None:
             errors += 1
-            print(f'ERROR {os.path.basename(path)}: {e}')
-    print(f'Modernized: {ok}, skipped: {skipped}, errors: {errors}')
+            print(f'ERROR {os.path.basename(path)}: {error}')
+            continue
+        manifest.record(os.path.basename(path), input_hashes[path], path)
+        if modified:
+            ok += 1
+        else:
+            skipped += 1
+    manifest.save()
+    print(f'Modernized: {ok}, skipped: {skipped}, errors: {errors}, '
+          f'up to date: {len(files) - len(stale)}')
+    profiling.finish(args, 'modernize_recipes')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Prune and bundle the stylesheets of the pages in epub_work/OEBPS/Text.
+
+A recipe page links the InDesign idGeneratedStyles.css and the
+book-modern.css that modernize_recipes.py adds, and has its own <style>
+block of Sigil's sgc-* classes. Most rules in all three are for classes
+the page never uses.
+
+Pages are grouped by the stylesheets they link, in order. For each group
+the sheets are concatenated into one bundle, with comments removed. The
+bundle drops every rule whose selector needs a class that no page in the
+group uses, empty rules, and every @font-face for a family that neither
+the remaining rules nor the pages name. It is written to Styles/ under
+a name that carries its content hash,
+"idGeneratedStyles+book-modern.<hash>.css", so it can be cached forever,
+and the pages link it instead of the sheets. Each inline <style> block is
+pruned the same way against its own page.
+
+The bundle link takes the place of the first sheet's link. Rules of the
+later sheets therefore now come before a <style> block that sat between
+the links. That only matters where such a rule ties an inline rule in
+specificity and sets the same property, and no book-modern.css rule does.
+
+Pages with scripts are left alone, since a script can add classes the
+markup does not show. The source sheets stay in Styles/, and a rerun
+reads a bundled page's sheets back from the bundle's name. Run this
+after modernize_recipes.py, whose classes it keeps.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+
+from patterns import (CLASS_ATTR_RE, CSS_BUNDLE_RE, CSS_CLASS_RE, CSS_COMMENT_RE, CSS_SELECTOR_SKIP_RE,
+                      FONT_FAMILY_RE, OPF_HREF_RE, OPF_ITEM_RE, STYLE_BLOCK_RE, STYLESHEET_LINK_RE)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OEBPS_DIR = os.path.join(ROOT, 'epub_work/OEBPS')
+STYLES_DIR = os.path.join(OEBPS_DIR, 'Styles')
+TEXT_DIR = os.path.join(OEBPS_DIR, 'Text')
+
+BUNDLE_HASH_LENGTH = 12
+
+# At-rules whose body is a list of rules to prune; other at-rules are kept whole.
+GROUPING_AT_RULES = ('@media', '@supports')
+
+
+# ============================================================
+# CSS
+# ============================================================
+
+def split_rules(css):
+    """Yield (start, end, prelude, body) for each top-level rule in `css`.
+
+    A rule runs from the end of the previous one, so its text includes
+    the whitespace and comments before it. `body` is None for statements
+    such as @import that end in ';'.
+    """
+    depth = 0
+    start = 0
+    brace = None
+    quote = None
+    i = 0
+    while i < len(css):
+        c = css[i]
+        if quote:
+            if c == '\\':
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = len(css) if end < 0 else end + 2
+            continue
+        elif c == '{':
+            if depth == 0:
+                brace = i
+            depth += 1
+        elif c == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield start, i + 1, css[start:brace], css[brace + 1:i]
+                start = i + 1
+        elif c == ';' and depth == 0:
+            yield start, i + 1, css[start:i], None
+            start = i + 1
+        i += 1
+
+
+def split_selectors(prelude):
+    """Split a selector list on the commas outside parentheses."""
+    selectors = []
+    depth = 0
+    current = ''
+    for c in prelude:
+        if c == ',' and depth == 0:
+            selectors.append(current.strip())
+            current = ''
+            continue
+        depth += (c == '(') - (c == ')')
+        current += c
+    selectors.append(current.strip())
+    return [s for s in selectors if s]
+
+
+def selector_classes(selector):
+    """The classes an element must have for `selector` to match anything."""
+    return set(CSS_CLASS_RE.findall(CSS_SELECTOR_SKIP_RE.sub('', selector)))
+
+
+def prune_css(css, used):
+    """`css` without the rules whose selectors need a class not in `used`,
+    and without empty rules.
+
+    Kept rules are copied verbatim; a selector list loses only its dead
+    selectors.
+    """
+    kept = []
+    last = 0
+    for start, end, prelude, body in split_rules(css):
+        last = end
+        head = CSS_COMMENT_RE.sub('', prelude).strip()
+        if body is None or (head.startswith('@') and not head.lower().startswith(GROUPING_AT_RULES)):
+            kept.append(css[start:end])
+        elif not body.strip():
+            continue
+        elif head.startswith('@'):
+            inner = prune_css(body, used)
+            if any(True for _ in split_rules(inner)):
+                kept.append(f'{prelude}{{{inner}}}')
+        else:
+            selectors = split_selectors(head)
+            live = [s for s in selectors if selector_classes(s) <= used]
+            if len(live) == len(selectors):
+                kept.append(css[start:end])
+            elif live:
+                indent = prelude[:len(prelude) - len(prelude.lstrip())]
+                kept.append(f'{indent}{", ".join(live)} {{{body}}}')
+    return ''.join(kept) + css[last:]
+
+
+def prune_font_faces(css, pages):
+    """`css` without the @font-face rules for families that neither its other
+    rules nor the `pages` (inline styles and style attributes) name."""
+    faces = []
+    other = list(pages)
+    for start, end, prelude, body in split_rules(css):
+        if prelude.strip().lower() == '@font-face':
+            faces.append((start, end, body))
+        else:
+            other.append(css[start:end])
+    named = ''.join(other).lower()
+    out = css
+    for start, end, body in reversed(faces):
+        family = FONT_FAMILY_RE.search(body or '')
+        if family and family.group(1).strip().strip('"\'').lower() not in named:
+            out = out[:start] + out[end:]
+    return out
+
+
+# ============================================================
+# Pages and bundles
+# ============================================================
+
+def page_classes(content):
+    return {c for value in CLASS_ATTR_RE.findall(content) for c in value.split()}
+
+
+def bundle_name(sources, css):
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:BUNDLE_HASH_LENGTH]
+    return '+'.join(os.path.splitext(s)[0] for s in sources) + f'.{digest}.css'
+
+
+def bundle_sources(name):
+    """The sheets a bundle was built from, or [name] for a plain stylesheet."""
+    m = CSS_BUNDLE_RE.match(name)
+    if not m:
+        return [name]
+    return [f'{stem}.css' for stem in m.group(1).split('+')]
+
+
+def linked_sheets(content):
+    """The Styles/ sheets a page links, in order, with bundles expanded."""
+    return [source for m in STYLESHEET_LINK_RE.finditer(content) for source in bundle_sources(m.group(1))]
+
+
+def build_bundle(sources, pages):
+    """The pruned concatenation of `sources` for the `pages` (their contents)."""
+    used = set().union(*map(page_classes, pages))
+    parts = []
+    for source in sources:
+        with open(os.path.join(STYLES_DIR, source), 'r', encoding='utf-8') as f:
+            css = CSS_COMMENT_RE.sub('', f.read())
+        parts.append(prune_css(css, used).strip() + '\n')
+    return prune_font_faces(''.join(parts), pages)
+
+
+def relink(content, href):
+    """Replace a page's stylesheet <link>s with one to `href`, where the first was."""
+    out = []
+    pos = 0
+    for i, m in enumerate(STYLESHEET_LINK_RE.finditer(content)):
+        if i == 0:
+            out.append(content[pos:m.start(1)] + href)
+            pos = m.end(1)
+            continue
+        start, end = m.start(), m.end()
+        # Take the whole line when the link stands on its own.
+        line_start = content.rfind('\n', 0, start) + 1
+        line_end = content.find('\n', end)
+        line_end = len(content) if line_end < 0 else line_end + 1
+        if not content[line_start:start].strip() and not content[end:line_end].strip():
+            start, end = line_start, line_end
+        out.append(content[pos:start])
+        pos = end
+    out.append(content[pos:])
+    return ''.join(out)
+
+
+def prune_inline_styles(content, used):
+    return STYLE_BLOCK_RE.sub(lambda m: m.group(1) + prune_css(m.group(2), used) + m.group(3), content)
+
+
+def update_opf(oebps_dir, added, removed):
+    """List the new bundles in content.opf, after its last stylesheet, and drop the stale ones."""
+    opf_path = os.path.join(oebps_dir, 'content.opf')
+    with open(opf_path, 'r', encoding='utf-8', newline='') as f:
+        lines = f.read().splitlines(keepends=True)
+
+    removed_hrefs = {f'href="Styles/{name}"' for name in removed}
+    out = []
+    last_style = None
+    for line in lines:
+        item = OPF_ITEM_RE.search(line)
+        href = item and OPF_HREF_RE.search(item.group(0))
+        if href and href.group(0) in removed_hrefs:
+            continue
+        if href and href.group(0).startswith('href="Styles/'):
+            last_style = len(out)
+        out.append(line)
+
+    template = out[last_style]
+    indent = template[:len(template) - len(template.lstrip())]
+    newline = template[len(template.rstrip('\r\n')):]
+    new_items = [f'{indent}<item id="{name.replace("+", "_")}" href="Styles/{name}" media-type="text/css"/>{newline}'
+                 for name in sorted(added)]
+    out[last_style + 1:last_style + 1] = new_items
+
+    with open(opf_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(''.join(out))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prune and bundle the stylesheets of the EPUB pages.')
+    parser.parse_args()
+
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(TEXT_DIR, '*.xhtml')) + glob.glob(os.path.join(TEXT_DIR, '*.html'))):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        if '<script' not in content:
+            pages[path] = content
+
+    groups = {}
+    for path, content in pages.items():
+        sources = tuple(linked_sheets(content))
+        if sources:
+            groups.setdefault(sources, []).append(path)
+
+    existing = {os.path.basename(p) for p in glob.glob(os.path.join(STYLES_DIR, '*.css'))
+                if CSS_BUNDLE_RE.match(os.path.basename(p))}
+    bundles = set()
+    inline_before = inline_after = 0
+    for sources, paths in sorted(groups.items()):
+        css = build_bundle(sources, [pages[p] for p in paths])
+        name = bundle_name(sources, css)
+        bundles.add(name)
+        path = os.path.join(STYLES_DIR, name)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(css)
+
+        sheets = sum(os.path.getsize(os.path.join(STYLES_DIR, s)) for s in sources)
+        print(f'  {len(paths)} pages: {" + ".join(sources)} ({sheets:,} bytes) → {name} ({len(css.encode("utf-8")):,} bytes)')
+
+        for page in paths:
+            content = pages[page]
+            new_content = prune_inline_styles(relink(content, name), page_classes(content))
+            inline_before += sum(len(m.group(2)) for m in STYLE_BLOCK_RE.finditer(content))
+            inline_after += sum(len(m.group(2)) for m in STYLE_BLOCK_RE.finditer(new_content))
+            if new_content != content:
+                with open(page, 'w', encoding='utf-8', newline='') as f:
+                    f.write(new_content)
+
+    stale = existing - bundles
+    for name in stale:
+        os.remove(os.path.join(STYLES_DIR, name))
+    if bundles - existing or stale:
+        update_opf(OEBPS_DIR, bundles - existing, stale)
+    print(f'\n{len(bundles)} bundles for {sum(map(len, groups.values()))} pages; '
+          f'inline styles {inline_before:,} → {inline_after:,} characters')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Deduplicate and subset the fonts in epub_work/OEBPS/Fonts.
+
+The book was merged from several InDesign exports, and each brought its
+own copy of every face: Gabriola.ttf and Gabriola0001–0007.ttf, and so
+on. No two copies are byte-identical. All but one per face carry the
+IDPF font obfuscation (the first 1040 bytes XORed with a 20-byte key),
+and the META-INF/encryption.xml that would let a reader undo it did not
+survive the merge, so those copies do not load at all. Fonts are
+therefore compared by content past the obfuscated header, and two
+files are the same font when the rest is identical and their headers
+differ by a repeating 20-byte key.
+
+Each set of copies is collapsed to one file. It keeps the name the
+stylesheets use, and its content comes from the copy whose sfnt table
+checksums verify, when there is one. The other files are deleted, the
+url()s in Styles/*.css are pointed at the kept file, and their
+content.opf items are removed.
+
+With fontTools installed, each readable face is then subset to the
+characters used in the Text pages, plus ASCII and the vulgar fractions
+the Multiplier writes at run time. It keeps the OpenType features a
+browser applies by default, such as kerning and standard ligatures, and
+drops the stylistic sets, which no stylesheet turns on. A face with no
+readable copy is left as it is. Subset fonts are cached in .cache/fonts/
+under the hash of their input.
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import io
+import os
+import struct
+
+from manifest import script_version
+from patterns import FONT_URL_RE, OPF_HREF_RE, OPF_ITEM_RE, TAG_RE
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    subset = TTFont = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OEBPS_DIR = os.path.join(ROOT, 'epub_work/OEBPS')
+FONTS_DIR = os.path.join(OEBPS_DIR, 'Fonts')
+CACHE_DIR = os.path.join(ROOT, '.cache', 'fonts')
+
+OPTIMIZER_VERSION = script_version(os.path.abspath(__file__), ())
+
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+# IDPF font obfuscation: the first 1040 bytes are XORed with a 20-byte key.
+OBFUSCATED_BYTES = 1040
+KEY_BYTES = 20
+
+SFNT_VERSIONS = (b'\x00\x01\x00\x00', b'OTTO', b'true')
+
+# Characters the scripts may put on a page after it is built: ASCII and
+# the vulgar fractions (patterns.FRAC_CHARS) scaled amounts are written in.
+RUNTIME_CHARS = ''.join(map(chr, [*range(0x20, 0x7f), *range(0xbc, 0xbf), *range(0x2150, 0x215f)]))
+
+
+# ============================================================
+# Font files
+# ============================================================
+
+def table_checksum(data):
+    data += b'\0' * (-len(data) % 4)
+    return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xffffffff
+
+
+def is_readable(data):
+    """Whether `data` is an sfnt font whose table directory and checksums verify."""
+    if len(data) < 12 or data[:4] not in SFNT_VERSIONS:
+        return False
+    num_tables = struct.unpack('>H', data[4:6])[0]
+    if not num_tables or 12 + 16 * num_tables > len(data):
+        return False
+    for i in range(num_tables):
+        tag, checksum, offset, length = struct.unpack('>4sIII', data[12 + 16 * i:28 + 16 * i])
+        if offset + length > len(data):
+            return False
+        # head's checksum is taken with its checkSumAdjustment zeroed.
+        if tag != b'head' and table_checksum(data[offset:offset + length]) != checksum:
+            return False
+    return True
+
+
+def content_key(data):
+    """Hash of a font's content past the obfuscated header."""
+    return len(data), hashlib.sha256(data[OBFUSCATED_BYTES:]).hexdigest()
+
+
+def same_font(a, b):
+    """Whether `a` and `b` are one font, each plain or obfuscated with any key."""
+    if content_key(a) != content_key(b):
+        return False
+    key = bytes(x ^ y for x, y in zip(a[:KEY_BYTES], b[:KEY_BYTES]))
+    head = min(OBFUSCATED_BYTES, len(a))
+    return all(a[i] ^ b[i] == key[i % KEY_BYTES] for i in range(head))
+
+
+def group_copies(fonts):
+    """Split {name: data} into lists of names that are copies of one font."""
+    by_key = {}
+    for name in sorted(fonts):
+        by_key.setdefault(content_key(fonts[name]), []).append(name)
+    groups = []
+    for names in by_key.values():
+        while names:
+            first = names[0]
+            copies = [n for n in names if same_font(fonts[first], fonts[n])]
+            groups.append(copies)
+            names = [n for n in names if n not in copies]
+    return groups
+
+
+# ============================================================
+# Subsetting
+# ============================================================
+
+def used_characters(text_dir):
+    """Every character on a Text page, plus RUNTIME_CHARS."""
+    chars = set(RUNTIME_CHARS)
+    for page in glob.glob(os.path.join(text_dir, '*.xhtml')):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        body = content[content.find('<body'):]
+        chars.update(html.unescape(TAG_RE.sub(' ', body)))
+    return ''.join(sorted(c for c in chars if c.isprintable() or c == ' '))
+
+
+def subset_font(data, chars):
+    """`data` subset to `chars`, or `data` itself if that is not smaller."""
+    options = subset.Options()
+    options.name_IDs = ['*']
+    options.name_languages = ['*']
+    options.notdef_outline = True
+    font = TTFont(io.BytesIO(data))
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=chars)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    font.save(buf)
+    result = buf.getvalue()
+    return result if len(result) < len(data) else data
+
+
+def cached_subset(data, chars):
+    """subset_font(), memoized on disk; a subset font is recorded as its own result."""
+    def cache_path(font):
+        key = hashlib.sha256(f'{OPTIMIZER_VERSION}:{chars}:'.encode('utf-8') + font).hexdigest()
+        return os.path.join(CACHE_DIR, key[:2], key)
+
+    path = cache_path(data)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    result = subset_font(data, chars)
+    for p in {path, cache_path(result)}:
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        tmp = f'{p}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(result)
+        os.replace(tmp, p)
+    return result
+
+
+# ============================================================
+# References
+# ============================================================
+
+def stylesheet_fonts(oebps_dir):
+    """Names of the Fonts/ files the stylesheets point at."""
+    names = set()
+    for css in glob.glob(os.path.join(oebps_dir, 'Styles', '*.css')):
+        with open(css, 'r', encoding='utf-8') as f:
+            names.update(FONT_URL_RE.findall(f.read()))
+    return names
+
+
+def rewrite_references(oebps_dir, renames, removed):
+    """Point the stylesheets' font url()s at the kept files and drop removed fonts from content.opf."""
+    for css in sorted(glob.glob(os.path.join(oebps_dir, 'Styles', '*.css'))):
+        # newline='' keeps the InDesign stylesheets' CRLF line endings.
+        with open(css, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        new_content = FONT_URL_RE.sub(lambda m: renames.get(m.group(0), m.group(0)), content)
+        if new_content != content:
+            with open(css, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_content)
+
+    removed_hrefs = {f'href="Fonts/{name}"' for name in removed}
+
+    def is_removed(line):
+        item = OPF_ITEM_RE.search(line)
+        href = item and OPF_HREF_RE.search(item.group(0))
+        return bool(href) and href.group(0) in removed_hrefs
+
+    opf_path = os.path.join(oebps_dir, 'content.opf')
+    with open(opf_path, 'r', encoding='utf-8', newline='') as f:
+        opf = f.read()
+    with open(opf_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(''.join(line for line in opf.splitlines(keepends=True) if not is_removed(line)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicate and subset the EPUB fonts.')
+    parser.add_argument('--no-subset', action='store_true', help='only collapse duplicate fonts')
+    args = parser.parse_args()
+
+    fonts = {}
+    for path in sorted(glob.glob(os.path.join(FONTS_DIR, '*'))):
+        if os.path.splitext(path)[1].lower() in FONT_EXTENSIONS:
+            with open(path, 'rb') as f:
+                fonts[os.path.basename(path)] = f.read()
+    before = sum(map(len, fonts.values()))
+
+    do_subset = not args.no_subset
+    if do_subset and subset is None:
+        print('fontTools not found; fonts are deduplicated but not subset (pip install fonttools)')
+        do_subset = False
+    chars = used_characters(os.path.join(OEBPS_DIR, 'Text')) if do_subset else ''
+
+    referenced = stylesheet_fonts(OEBPS_DIR)
+    renames, removed = {}, []
+    after = 0
+    for names in group_copies(fonts):
+        keep = next((n for n in names if n in referenced), names[0])
+        source = next((n for n in names if is_readable(fonts[n])), None)
+        data = fonts[source or keep]
+        if source is not None and do_subset:
+            data = cached_subset(data, chars)
+
+        with open(os.path.join(FONTS_DIR, keep), 'wb') as f:
+            f.write(data)
+        for name in names:
+            if name != keep:
+                renames[name] = keep
+                removed.append(name)
+                os.remove(os.path.join(FONTS_DIR, name))
+        after += len(data)
+        dropped = f', {len(names) - 1} copies removed' if len(names) > 1 else ''
+        if source is None:
+            print(f'  {keep}: no readable copy; left as is{dropped}')
+        else:
+            print(f'  {keep}: {len(fonts[keep]):,} → {len(data):,} bytes{dropped}')
+
+    if removed:
+        rewrite_references(OEBPS_DIR, renames, removed)
+    print(f'\n{len(fonts)} fonts → {len(fonts) - len(removed)}: {before:,} → {after:,} bytes '
+          f'({after / max(before, 1):.0%})')
+
+
+if __name__ == '__main__':
+    main()
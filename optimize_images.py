@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Losslessly recompress the images in epub_work/OEBPS/Images.
+
+PNGs are rewritten with the standard library alone: the IDAT stream is
+inflated and deflated again at level 9 (keeping whichever zlib strategy
+comes out smaller), and text/time chunks that never affect the pixels
+are dropped. The scanline filters are left alone, so the decoded image
+is bit-for-bit the same. JPEGs go through `jpegtran -optimize` when it
+is on PATH. A file is only replaced when the result is smaller.
+
+With --webp/--avif (needs Pillow) each image also gets a sibling in that
+format for the PWA. --rewrite webp points the Section pages and
+content.opf at the lossless WebP siblings and removes the originals they
+replace.
+
+Every result is cached in .cache/images/ under the hash of its input,
+and an optimized image is recorded as its own result, so a rerun over
+an already optimized tree only hashes the files.
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import os
+import re
+import shutil
+import struct
+import subprocess
+import urllib.parse
+import zlib
+
+from batch import add_jobs_argument, run_jobs
+from manifest import script_version
+from patterns import MEDIA_TYPE_RE, OPF_HREF_RE, OPF_ITEM_RE
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OEBPS_DIR = os.path.join(ROOT, 'epub_work/OEBPS')
+IMAGES_DIR = os.path.join(OEBPS_DIR, 'Images')
+CACHE_DIR = os.path.join(ROOT, '.cache', 'images')
+
+OPTIMIZER_VERSION = script_version(os.path.abspath(__file__), ())
+
+JPEGTRAN = shutil.which('jpegtran')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Ancillary PNG chunks that carry no rendering information.
+DROP_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'tIME'}
+
+# zlib strategies tried on every PNG's image data.
+PNG_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+
+# Pillow format name, save options and media type for each sibling format.
+SIBLING_FORMATS = {
+    'webp': ('WEBP', {'lossless': True, 'method': 6}, 'image/webp'),
+    'avif': ('AVIF', {'quality': 90}, 'image/avif'),
+}
+
+# Only lossless siblings may replace the originals.
+REWRITE_FORMATS = ('webp',)
+
+
+# ============================================================
+# Encoders
+# ============================================================
+
+def png_chunks(data):
+    """Yield (type, body) for every chunk of a PNG file."""
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        length, ctype = struct.unpack('>I4s', data[pos:pos + 8])
+        yield ctype, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def png_chunk(ctype, body):
+    return struct.pack('>I', len(body)) + ctype + body + struct.pack('>I', zlib.crc32(ctype + body))
+
+
+def optimize_png(data):
+    """Recompress a PNG's image data; returns the smaller of the result and the input."""
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    chunks = list(png_chunks(data))
+    raw = zlib.decompress(b''.join(body for ctype, body in chunks if ctype == b'IDAT'))
+
+    best = None
+    for strategy in PNG_STRATEGIES:
+        c = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+        candidate = c.compress(raw) + c.flush()
+        if best is None or len(candidate) < len(best):
+            best = candidate
+
+    out = [PNG_SIGNATURE]
+    for ctype, body in chunks:
+        if ctype == b'IDAT':
+            if best is not None:
+                out.append(png_chunk(b'IDAT', best))
+                best = None
+        elif ctype not in DROP_CHUNKS:
+            out.append(png_chunk(ctype, body))
+    result = b''.join(out)
+    return result if len(result) < len(data) else data
+
+
+def optimize_jpeg(data):
+    """Losslessly optimize a JPEG's Huffman tables with jpegtran, if installed."""
+    if JPEGTRAN is None:
+        return data
+    result = subprocess.run([JPEGTRAN, '-copy', 'all', '-optimize'], input=data,
+                            capture_output=True, check=True).stdout
+    return result if result and len(result) < len(data) else data
+
+
+def encode_sibling(data, fmt):
+    pil_format, options, _ = SIBLING_FORMATS[fmt]
+    with Image.open(io.BytesIO(data)) as im:
+        buf = io.BytesIO()
+        im.save(buf, pil_format, **options)
+    return buf.getvalue()
+
+
+OPTIMIZERS = {'.png': optimize_png, '.jpg': optimize_jpeg, '.jpeg': optimize_jpeg}
+
+
+# ============================================================
+# Content-addressed cache
+# ============================================================
+
+def _cache_path(kind, data):
+    key = hashlib.sha256(f'{OPTIMIZER_VERSION}:{kind}:'.encode('utf-8') + data).hexdigest()
+    return os.path.join(CACHE_DIR, key[:2], key)
+
+
+def _cache_store(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def cached(kind, data, encode):
+    """encode(data), memoized on disk by the hash of `data`.
+
+    For in-place optimizers the result is also recorded as its own
+    result, so optimizing an optimized file is a cache hit.
+    """
+    path = _cache_path(kind, data)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    result = encode(data)
+    _cache_store(path, result)
+    if kind in OPTIMIZERS and result != data:
+        _cache_store(_cache_path(kind, result), result)
+    return result
+
+
+def write_if_changed(path, data):
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+# ============================================================
+# Pipeline
+# ============================================================
+
+def optimize_file(path, formats):
+    """Optimize one image in place and write its siblings.
+
+    Returns (name, bytes before, bytes after, {format: sibling bytes}).
+    """
+    name = os.path.basename(path)
+    base, ext = os.path.splitext(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    out = data
+    optimizer = OPTIMIZERS.get(ext.lower())
+    if optimizer is not None:
+        out = cached(ext.lower(), data, optimizer)
+        if write_if_changed(path, out):
+            print(f'  {name}: {len(data):,} → {len(out):,} bytes')
+
+    siblings = {}
+    for fmt in formats:
+        sibling = cached(fmt, out, lambda d: encode_sibling(d, fmt))
+        write_if_changed(f'{base}.{fmt}', sibling)
+        siblings[fmt] = len(sibling)
+    return name, len(data), len(out), siblings
+
+
+def rewrite_references(oebps_dir, renames, media_type):
+    """Point Section pages and content.opf at renamed images.
+
+    `renames` maps old Images/ file names to new ones. References are
+    matched percent-encoded or not, and case-insensitively, as they
+    resolve on Windows and macOS.
+    """
+    by_lower = {}
+    for old, new in renames.items():
+        by_lower[old.lower()] = new
+        by_lower[urllib.parse.quote(old).lower()] = urllib.parse.quote(new)
+    ref_re = re.compile(r'(?<=Images/)(' + '|'.join(map(re.escape, by_lower)) + r')(?=["#])', re.I)
+
+    def rename(m):
+        return by_lower[m.group(1).lower()]
+
+    changed = 0
+    for page in sorted(glob.glob(os.path.join(oebps_dir, 'Text', '*.xhtml'))):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content = ref_re.sub(rename, content)
+        if new_content != content:
+            with open(page, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            changed += 1
+
+    def rewrite_item(m):
+        item = m.group(0)
+        href = OPF_HREF_RE.search(item)
+        if not href or not ref_re.search(href.group(0)):
+            return item
+        item = ref_re.sub(rename, item)
+        return MEDIA_TYPE_RE.sub(f'media-type="{media_type}"', item)
+
+    opf_path = os.path.join(oebps_dir, 'content.opf')
+    with open(opf_path, 'r', encoding='utf-8') as f:
+        opf = f.read()
+    with open(opf_path, 'w', encoding='utf-8') as f:
+        f.write(OPF_ITEM_RE.sub(rewrite_item, opf))
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Losslessly optimize the EPUB images.')
+    add_jobs_argument(parser)
+    parser.add_argument('--webp', action='store_true', help='also write a lossless .webp sibling per image')
+    parser.add_argument('--avif', action='store_true', help='also write an .avif sibling per image')
+    parser.add_argument('--rewrite', choices=REWRITE_FORMATS,
+                        help='point the pages and content.opf at this sibling format and drop the originals')
+    args = parser.parse_args()
+
+    formats = [fmt for fmt in SIBLING_FORMATS if getattr(args, fmt) or fmt == args.rewrite]
+    if formats and Image is None:
+        parser.error('--webp/--avif/--rewrite need Pillow (pip install pillow)')
+    if JPEGTRAN is None:
+        print('jpegtran not found; JPEGs are left as they are')
+
+    files = sorted(p for p in glob.glob(os.path.join(IMAGES_DIR, '*'))
+                   if os.path.splitext(p)[1].lower() in OPTIMIZERS)
+    results = list(run_jobs(optimize_file, [(p, formats) for p in files], args.jobs))
+
+    before = sum(r[1] for r in results)
+    after = sum(r[2] for r in results)
+    print(f'\n{len(results)} images: {before:,} → {after:,} bytes ({after / max(before, 1):.0%})')
+    for fmt in formats:
+        total = sum(r[3][fmt] for r in results)
+        print(f'  .{fmt} siblings: {total:,} bytes')
+
+    if args.rewrite:
+        renames = {}
+        for name, _, size, siblings in results:
+            sibling = f'{os.path.splitext(name)[0]}.{args.rewrite}'
+            if siblings[args.rewrite] < size:
+                renames[name] = sibling
+            elif not getattr(args, args.rewrite):
+                os.remove(os.path.join(IMAGES_DIR, sibling))
+        if renames:
+            pages = rewrite_references(OEBPS_DIR, renames, SIBLING_FORMATS[args.rewrite][2])
+            for name in renames:
+                os.remove(os.path.join(IMAGES_DIR, name))
+            print(f'Rewrote {len(renames)} image references to .{args.rewrite} in {pages} pages and content.opf')
+
+
+if __name__ == '__main__':
+    main()
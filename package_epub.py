@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Pack epub_work/ into TheBestofBrock.epub, reproducibly.
+
+The archive is laid out the way EPUB readers expect: `mimetype` first,
+stored uncompressed with no extra field, then META-INF/container.xml,
+then every other member in sorted order. Each member gets a fixed
+timestamp and permissions, so the same tree always packs to the same
+bytes.
+
+Members are stored or deflated by type: PNG/JPEG/MP3 and WOFF fonts are
+already compressed and are stored, streamed into the archive in
+CHUNK_SIZE pieces so they are never held in memory; markup, styles,
+scripts and raw TrueType/OpenType fonts are deflated at DEFLATE_LEVEL
+with ZipFile.writestr(), the public way to set the level.
+
+Before writing, every <item> in content.opf is checked against the tree;
+a missing file aborts the build unless --allow-missing is given. The
+archive is skipped when the build manifest shows the tree hasn't changed
+since it was last packed.
+"""
+
+import argparse
+import hashlib
+import os
+import posixpath
+import shutil
+import sys
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zipfile
+
+from epub_source import EpubSource
+from manifest import BuildManifest, add_force_argument, script_version
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+EPUB_WORK = os.path.join(ROOT, 'epub_work')
+OUTPUT = os.path.join(ROOT, 'TheBestofBrock.epub')
+
+CONTAINER = 'META-INF/container.xml'
+OPF_NS = '{http://www.idpf.org/2007/opf}'
+
+# Build bookkeeping that must never ship.
+EXCLUDE = {'OEBPS/build-manifest.json'}
+
+CHUNK_SIZE = 1 << 16
+
+# Every member gets this timestamp (the earliest a zip can record).
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Extensions whose data is already compressed; everything else is deflated.
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif',
+    '.mp3', '.m4a', '.woff', '.woff2',
+}
+DEFLATE_LEVEL = 9
+
+
+def member_order(names):
+    """mimetype, then the container document, then the rest sorted."""
+    first = ['mimetype', CONTAINER]
+    return [n for n in first if n in names] + sorted(n for n in names if n not in first)
+
+
+def zip_info(name):
+    """A ZipInfo with fixed metadata and the compression for the member's type."""
+    info = zipfile.ZipInfo(name, date_time=FIXED_DATE_TIME)
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    ext = os.path.splitext(name)[1].lower()
+    if name == 'mimetype' or ext in STORED_EXTENSIONS:
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def package_path(source):
+    """Archive name of the package document, from META-INF/container.xml."""
+    root = ET.fromstring(source.read(CONTAINER))
+    for el in root.iter('{urn:oasis:names:tc:opendocument:xmlns:container}rootfile'):
+        return el.get('full-path')
+    raise ValueError(f'{CONTAINER} names no rootfile')
+
+
+def missing_items(source, opf_name, names):
+    """hrefs in the OPF manifest that aren't in the tree."""
+    base = posixpath.dirname(opf_name)
+    root = ET.fromstring(source.read(opf_name))
+    missing = []
+    for item in root.iter(OPF_NS + 'item'):
+        href = urllib.parse.unquote(item.get('href', '').split('#')[0])
+        if posixpath.normpath(posixpath.join(base, href)) not in names:
+            missing.append(href)
+    return missing
+
+
+def tree_hash(source, names):
+    """sha256 over every member's name and bytes, in archive order."""
+    h = hashlib.sha256()
+    for name in names:
+        h.update(name.encode('utf-8') + b'\0')
+        with source.open(name) as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def write_epub(source, names, out_path):
+    tmp = f'{out_path}.{os.getpid()}.tmp'
+    with zipfile.ZipFile(tmp, 'w') as z:
+        for name in names:
+            info = zip_info(name)
+            with source.open(name) as src:
+                if info.compress_type == zipfile.ZIP_STORED:
+                    with z.open(info, 'w') as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                else:
+                    z.writestr(info, src.read(), compresslevel=DEFLATE_LEVEL)
+    os.replace(tmp, out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack epub_work/ into a reproducible EPUB.')
+    parser.add_argument('--source', default=EPUB_WORK, metavar='DIR',
+                        help='unpacked EPUB to pack (default %(default)s)')
+    parser.add_argument('-o', '--output', default=OUTPUT, help='EPUB to write (default %(default)s)')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='pack even if content.opf lists files that are not in the tree')
+    add_force_argument(parser)
+    args = parser.parse_args()
+
+    with EpubSource(args.source) as source:
+        names = member_order([n for n in source.names() if n not in EXCLUDE])
+        if not names or names[0] != 'mimetype':
+            sys.exit(f'ERROR: {args.source} has no mimetype file')
+
+        opf_name = package_path(source)
+        missing = missing_items(source, opf_name, set(names))
+        for href in missing:
+            print(f'  missing: {href}')
+        if missing and not args.allow_missing:
+            sys.exit(f'ERROR: {len(missing)} item(s) in {opf_name} are not in {args.source}')
+
+        manifest = BuildManifest(os.path.join(args.source, os.path.dirname(opf_name)),
+                                 'package_epub', script_version(os.path.abspath(__file__), ()))
+        out_name = os.path.basename(args.output)
+        input_hash = tree_hash(source, names)
+        if not args.force and manifest.is_fresh(out_name, input_hash, args.output):
+            print(f'{args.output} is up to date ({len(names)} members)')
+            return
+
+        write_epub(source, names, args.output)
+        manifest.record(out_name, input_hash, args.output)
+        manifest.save()
+
+    size = os.path.getsize(args.output)
+    print(f'Wrote {args.output}: {len(names)} members, {size / 1e6:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Streaming paragraph tokenizer for the recipe XHTML.
+
+iter_events() walks a document once, left to right, and yields an event
+for every paragraph boundary and every run of text:
+
+    (START, offset, '<p class="…">', ())           a <p> opens at `offset`
+    (TEXT,  offset, 'raw text', ('outer', 'inner'))  text between two tags
+    (END,   offset, '</p>', ())                      a </p> ends just before `offset`
+
+Text is yielded raw (entity references are left alone), together with
+the classes of the <span>s around it, outermost first ('' for a span
+without a class). Text runs outside paragraphs are yielded too, so a
+consumer can copy the document through by slicing it at the offsets,
+never splitting it into lines. Comments, CDATA sections (such as the
+/*<![CDATA[*/ wrappers in the <style> blocks), processing instructions
+and the DOCTYPE carry no text.
+"""
+
+from patterns import CLASS_ATTR_RE, MARKUP_TOKEN_RE, WHITESPACE_RE
+
+START, TEXT, END = 'start', 'text', 'end'
+
+
+def iter_events(content):
+    """Yield (kind, offset, value, span classes) events for `content`; see the module docstring."""
+    spans = ()
+    pos = 0
+    for m in MARKUP_TOKEN_RE.finditer(content):
+        start, end = m.span()
+        if start > pos:
+            yield TEXT, pos, content[pos:start], spans
+        pos = end
+
+        slash, name, attrs, empty = m.groups()
+        if name == 'p':
+            if not empty:
+                yield (END, end, m.group(0), ()) if slash else (START, start, m.group(0), ())
+        elif name == 'span' and not empty:
+            if slash:
+                spans = spans[:-1]
+            else:
+                cls = CLASS_ATTR_RE.search(attrs)
+                spans += (cls.group(1) if cls else '',)
+    if pos < len(content):
+        yield TEXT, pos, content[pos:], spans
+
+
+def primary_class(spans):
+    """The outermost span class in a TEXT event's classes, or None."""
+    return next((c for c in spans if c), None)
+
+
+def paragraph_text(runs):
+    """A paragraph's plain text from its TEXT runs, whitespace-normalized."""
+    return WHITESPACE_RE.sub(' ', ''.join(runs)).strip()
+
+
+def rebuild_p_tag(p_open, span_class, new_text):
+    """Rebuild a <p> with new text content, collapsing its spans into one with the primary class."""
+    return f'{p_open}<span class="{span_class or "CharOverride-3"}">{new_text}</span></p>'
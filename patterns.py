@@ -0,0 +1,215 @@
+"""
+Precompiled regular expressions shared by the recipe batch scripts.
+
+process_recipes.py, fix_scaling.py, fix_dual_recipes.py and
+modernize_recipes.py all import their patterns from here so that nothing
+in a per-span or per-line hot path compiles (or looks up in re's cache)
+a string literal.
+"""
+
+import re
+
+# ============================================================
+# Quantities
+# ============================================================
+
+# Unicode vulgar fractions as a character class body (¼-¾ and ⅐-⅞).
+FRAC_CHARS = '¼-¾⅐-⅞'
+
+# Quantity at the start of ingredient text: "1", "1/2", "1 1/2", "1 ½" + rest.
+QTY_RE = re.compile(
+    r'^([\d' + FRAC_CHARS + r']+(?:\s*/\s*\d+)?(?:\s+[\d' + FRAC_CHARS + r']+(?:\s*/\s*\d+)?)?)\s+(.+)',
+    re.UNICODE
+)
+
+# Text begins with a digit or unicode fraction.
+LEADING_QTY_RE = re.compile(r'^[\d' + FRAC_CHARS + r']', re.UNICODE)
+
+# Same test, restricted to the fractions the cookbook actually prints.
+LEADING_COMMON_QTY_RE = re.compile(r'[\d½¼¾⅓⅔⅛⅜⅝⅞]')
+
+# Leading quantity followed by whitespace, as fix_scaling reads it.
+SCALE_QTY_RE = re.compile(
+    r'^([\d]+[\s]*[½¼¾⅓⅔⅛⅜⅝⅞]?|[½¼¾⅓⅔⅛⅜⅝⅞]|[\d]+\s+[\d]/[\d]|[\d]+/[\d]|[\d]+\.[\d]+|[\d]+)\s+'
+)
+
+# ============================================================
+# Units
+# ============================================================
+
+# Small units that should never scale below a pinch.
+SMALL_UNIT_RE = re.compile(r'(tsp|teaspoon|tbsp|tablespoon|dash|pinch)')
+
+# Unit word at the start of the text after a quantity.
+UNIT_RE = re.compile(
+    r'^(cups?|lbs?|tbsps?|tsps?|ounces?|pounds?|tablespoons?|teaspoons?|heads?|bunches?|cans?|boxes?|packages?|sticks?|slices?|stalks?|envelopes?|bags?|bottles?|jars?|strips?|pieces?|sprigs?|ribs?|loaves?|pinches?|dashes?)\b',
+    re.I
+)
+
+# ============================================================
+# Dual food-service / home notation: "10 cups (2 cups) sugar"
+# ============================================================
+
+_DUAL_QTY = r'(?:\d+(?:\s*[' + FRAC_CHARS + r']|\s+\d+/\d+|/\d+|\.\d+)?|[' + FRAC_CHARS + r'])'
+_DUAL_UNITS = (r'cups?|lbs?|tbsps?|tsps?|oz|pounds?|ounces?|quarts?|pints?|gallons?|eggs?|cans?'
+               r'|packages?|containers?|bottles?|heads?|bunches?|stalks?|cloves?|sticks?|envelopes?'
+               r'|bags?|jars?|box(?:es)?')
+
+# An ingredient line in dual notation: FOOD unit [words] (HOME ...) rest.
+DUAL_PAIR_RE = re.compile(
+    r'^(?P<food>' + _DUAL_QTY + r')\s*(?P<unit>(?:' + _DUAL_UNITS + r')\b\.?)'
+    r'(?P<between>[^()\d]*?)\s*\(\s*(?P<home>' + _DUAL_QTY + r'[^)]*)\)\s*(?P<rest>.*)$',
+    re.I
+)
+
+# Parentheticals that are not a home amount: a package's size after a
+# container unit ("1 package (7 ¼ oz)", "2 sticks (½ lb)") or a note on
+# the item ("(26-30 count)", "(40%)").
+DUAL_CONTAINER_RE = re.compile(r'(?:cans?|packages?|containers?|bottles?|sticks?|envelopes?|bags?|jars?|box(?:es)?)\b', re.I)
+DUAL_WEIGHT_RE = re.compile(r'^' + _DUAL_QTY + r'\s*(?:oz|ounces?|lbs?|pounds?)\b', re.I)
+DUAL_NOTE_RE = re.compile(r'%|\bcount\b', re.I)
+
+# Instruction text quoting a food-service amount with a home one: "8 cups (".
+CUPS_PAREN_RE = re.compile(r'\d+\s+cups?\s*\(')
+
+# ============================================================
+# Yield lines
+# ============================================================
+
+# Yield text inside a single text node, with the surrounding > and <.
+YIELD_NODE_RE = re.compile(r'(>)(Yield:\s*[^<]+?)(<)', re.IGNORECASE)
+
+# Text starting with "Yield:".
+YIELD_PREFIX_RE = re.compile(r'Yield:', re.IGNORECASE)
+
+# Yield label and value in a text node ("Yield: 80 servings").
+YIELD_LINE_RE = re.compile(r'Yield[:\s]*\d+', re.I)
+YIELD_REWRITE_RE = re.compile(
+    r'(Yield[:\s]*)\d+[\-–\d,\s]*(servings|portions|people|persons|pieces|cookies|biscuits|bars|rolls|loaves|muffins|cups?|pints?|dozen|doz\.?|slices|sandwiches|oz\s+servings|oz\s+cakes|[^<]*)',
+    re.I
+)
+PAREN_SERVINGS_ANY_RE = re.compile(r'\([^)]*servings[^)]*\)')
+
+# Yield value in a paragraph's plain text.
+YIELD_TEXT_RE = re.compile(r'Yield\s*:\s*([^.\n]+)', re.IGNORECASE)
+MAKES_TEXT_RE = re.compile(r'^Makes\s+(.+)$', re.IGNORECASE)
+
+# The yield grammar (see yields.py). One left-to-right scan of the yield
+# text finds its parentheses, each "or", sizes such as 9" or 5" x 9" (so
+# they are never read as counts) and amounts: a number or range, an
+# optional size ("4, 12 oz portions", "10—4 oz servings", "4, one-half lb
+# servings") and a unit up to two words on ("3 entrée portions",
+# "128 one tbsp servings").
+_YIELD_NUM = r'(?:\d+(?:\s*[' + FRAC_CHARS + r']|\s+\d+/\d+)?|[' + FRAC_CHARS + r'])'
+_YIELD_SIZE = (r'(?:' + _YIELD_NUM + r'|one-half|one|half)\s*'
+               r'(?:(?:oz|ounces?|lbs?|pounds?|tbsp|tablespoons?|cups?|inch(?:es)?)\b|["”″])')
+_YIELD_UNITS = (r'servings?|portions?|people|persons?|cups?|pints?|quarts?|gallons?|lbs?|pounds?'
+               r'|dozen|doz|loaf|loaves|pies?|cakes?|cookies|biscuits|bars|rolls|muffins|slices'
+               r'|pieces|sandwiches|pancakes|pizzas|kabobs|balls')
+YIELD_GRAMMAR_RE = re.compile(
+    r'(?P<open>\()|(?P<close>\))|\b(?P<or>or)\b'
+    r'|(?P<size>' + _YIELD_NUM + r'\s*(?:["”″]|-?inch(?:es)?\b))'
+    r'|(?P<low>' + _YIELD_NUM + r')'
+    r'(?:\s*[,—]\s*' + _YIELD_SIZE + r'|\s*[–—-]\s*(?P<high>' + _YIELD_NUM + r'))?'
+    r'(?:\s*(?:[^\W\d_]+\s+){0,2}?(?P<unit>' + _YIELD_UNITS + r')\b)?',
+    re.IGNORECASE
+)
+
+# ============================================================
+# Markup
+# ============================================================
+
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Ingredient spans in the Berlin Sans FB ingredient font.
+CHAR_OVERRIDE_3_SPAN_RE = re.compile(r'(<span class="CharOverride-3">)(.*?)(</span>)', re.DOTALL | re.UNICODE)
+
+# Any sgc-/CharOverride- classed span whose text starts with a quantity.
+CLASSED_QTY_SPAN_RE = re.compile(
+    r'(<span class="(?:sgc-\d+|CharOverride-\d+)(?:\s+(?:sgc-\d+|CharOverride-\d+))*">)([\d' + FRAC_CHARS + r'][^<]{3,120})(</span>)',
+    re.DOTALL | re.UNICODE
+)
+
+# A relative URL in a src/href attribute or a CSS url().
+ASSET_REF_RE = re.compile(r'''(?:\bsrc|\bhref)\s*=\s*["']([^"'#?]*)|url\(\s*["']?([^"')#?]*)''')
+
+# Headings, and the Section page a TOC entry points at.
+HEADING_RE = re.compile(r'<h[1-6][^>]*>(.*?)</h[1-6]>', re.DOTALL)
+SECTION_HREF_RE = re.compile(r'Text/Section(\d+)\.xhtml')
+
+P_OPEN_RE = re.compile(r'(<p[^>]*>)\s*')
+SPAN_CLASS_RE = re.compile(r'<span\s+class="([^"]*)"')
+
+# One markup token for the paragraph tokenizer: a start/end/empty tag
+# (groups: slash, name, attributes, self-closing slash), or a comment,
+# CDATA section, processing instruction or DOCTYPE, which carry no text.
+MARKUP_TOKEN_RE = re.compile(
+    r'<(/?)([A-Za-z][\w:.-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*?)(/?)>'
+    r'|<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>|<![A-Za-z][^>]*>',
+    re.DOTALL
+)
+CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*["\']([^"\']*)')
+
+# ============================================================
+# Paragraph text
+# ============================================================
+
+# Old "Kitchen Timer | Recipe Multiplier | ... | Unit Converter" toolbar label.
+TOOL_LABEL_RE = re.compile(r'Kitchen\s+Timer.*Unit\s+Converter', re.DOTALL | re.IGNORECASE)
+
+INSTRUCTION_VERBS = re.compile(
+    r'^\s*(preheat|bake|cook|mix|combine|whisk|stir|serve|heat|boil|saut[eé]|'
+    r'chop|slice|fry|grill|fold|drain|chill|add|pour|beat|cream|blend|'
+    r'remove|spread|sprinkle|arrange|place|cover|uncover|set\s+aside|season|'
+    r'bring\s+to|transfer|roll|knead|let\s+rise|refrigerate|marinate|'
+    r'coat|dredge|dip|reduce|deglaze|simmer|braise|roast|garnish|cut)\b',
+    re.IGNORECASE,
+)
+
+BOILERPLATE_RE = re.compile(r'Kitchen\s+Timer|Recipe\s+Multiplier|Shopping\s+List|Unit\s+Converter|Yield\s*:|Makes\b', re.IGNORECASE)
+
+# Ingredient subheader: a single capitalised word such as "Sauce".
+SUBHEADER_RE = re.compile(r'^[A-Z][A-Za-z /&()\-]{1,40}$')
+
+# ============================================================
+# Images, fonts and serialization
+# ============================================================
+
+# InDesign nutrition panels are exported as Images/NNNN.png.
+NUTRITION_IMG_RE = re.compile(r'Images/\d{4,}\.(?:png|webp|avif)$')
+
+# <item .../> entries in content.opf and their href/media-type attributes.
+OPF_ITEM_RE = re.compile(r'<item\b[^>]*>')
+OPF_HREF_RE = re.compile(r'\bhref="[^"]*"')
+MEDIA_TYPE_RE = re.compile(r'\bmedia-type="[^"]*"')
+
+# The Fonts/ file name in a stylesheet's url("../Fonts/...").
+FONT_URL_RE = re.compile(r'''(?<=\.\./Fonts/)[^"')]+''')
+
+# Void elements html.parser serializes without the XHTML self-close.
+VOID_TAG_RE = re.compile(r'<(img|br|hr|meta|link|input)([^>]*?)(?<!/)>')
+
+# A start tag that declares xmlns:xml, which lxml drops (groups: tag, URI).
+XMLNS_XML_TAG_RE = re.compile(r'<([\w:.-]+)\s[^>]*?\bxmlns:xml="([^"]*)"[^>]*>')
+
+# ============================================================
+# Stylesheets
+# ============================================================
+
+# A page's <link> to a stylesheet in Styles/ (group: the file name).
+STYLESHEET_LINK_RE = re.compile(r'<link\b[^>]*\bhref="\.\./Styles/([^"]+\.css)"[^>]*>')
+
+# The body of an inline <style> block, without its /*<![CDATA[*/ wrapper.
+STYLE_BLOCK_RE = re.compile(r'(<style\b[^>]*>\s*(?:/\*<!\[CDATA\[\*/)?)(.*?)((?:/\*\]\]>\*/)?\s*</style>)', re.DOTALL)
+
+# A bundle built by optimize_css.py: "idGeneratedStyles+book-modern.<hash>.css"
+# (groups: the source sheets' names joined with '+', the content hash).
+CSS_BUNDLE_RE = re.compile(r'^([\w.+-]+?)\.([0-9a-f]{12})\.css$')
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+# A class in a selector, and the selector parts whose classes need not
+# be on the page for it to match: strings, [attr] tests and :not(...).
+CSS_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+CSS_SELECTOR_SKIP_RE = re.compile(r'"[^"]*"|\'[^\']*\'|\[[^\]]*\]|:[\w-]+\([^)]*\)')
+FONT_FAMILY_RE = re.compile(r'font-family\s*:\s*([^;}]+)', re.IGNORECASE)
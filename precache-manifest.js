@@ -0,0 +1,2 @@
+// Generated by build_precache.py; do not edit.
+self.PRECACHE_MANIFEST = {"install":{"./":"a3893b564df7","./assets/icons/apple-touch-icon.png":"68a319d8b780","./assets/icons/favicon-32.png":"aa14c7122b93","./assets/icons/icon-192-maskable.png":"9275bd5c529b","./assets/icons/icon-192.png":"46e622e9ce1b","./assets/icons/icon-512-maskable.png":"503ec0a71705","./assets/icons/icon-512.png":"a0ff2fdf1f23","./assets/recipes.json":"c1435ea797da","./assets/recipes/all.json":"037e8486cd9f","./assets/search.json":"24c311c15a2c","./epub_work/OEBPS/Audio/airhorn.mp3":"9dfa1a7d6ecd","./epub_work/OEBPS/Fonts/Arial-BoldItalicMT.ttf":"51966516e925","./epub_work/OEBPS/Fonts/Arial-ItalicMT.ttf":"d783af7872eb","./epub_work/OEBPS/Fonts/BerlinSansFB-Reg.TTF":"4d9472e9098c","./epub_work/OEBPS/Fonts/Gabriola.ttf":"f2c49a9a9c58","./epub_work/OEBPS/Fonts/SegoePrint-Bold.ttf":"340e275f4fb7","./epub_work/OEBPS/Fonts/TimesNewRomanPS-BoldMT.ttf":"817b2e408a0e","./epub_work/OEBPS/Fonts/TimesNewRomanPSMT.ttf":"fdb4bc6ad89a","./epub_work/OEBPS/Images/Converter.jpg":"76d7731c25c9","./epub_work/OEBPS/Images/Timer.png":"e6579ea33cb0","./epub_work/OEBPS/Images/shopping-list.png":"27ffbb421498","./epub_work/OEBPS/Misc/Multiplier61.js":"dbcebaa82e46","./epub_work/OEBPS/Misc/Scaler.js":"46b1736b1944","./epub_work/OEBPS/Misc/Shopping.js":"e19d064fcdcc","./epub_work/OEBPS/Misc/Timer.js":"5f6036b68b52","./epub_work/OEBPS/Styles/Multiplier.css":"9ee55a442b18","./epub_work/OEBPS/Styles/Timer.css":"015cf5bf1f25","./epub_work/OEBPS/Styles/book-modern.css":"796949218185","./epub_work/OEBPS/Styles/front_matter_export_from_indesign.76d385032566.css":"76d385032566","./epub_work/OEBPS/Styles/front_matter_export_from_indesign.css":"bc3412d5203f","./epub_work/OEBPS/Styles/idGeneratedStyles+book-modern.34b88d358f9c.css":"34b88d358f9c","./epub_work/OEBPS/Styles/idGeneratedStyles.css":"fe6a21becc7b","./epub_work/OEBPS/Styles/idGeneratedStyles.fba35c5908b7.css":"fba35c5908b7","./epub_work/OEBPS/Styles/sgc-index.css":"08f17e4e589b","./epub_work/OEBPS/Styles/tools-modern.css":"939192552cb1","./epub_work/OEBPS/Text/Beef-7.7.13.xhtml":"4caa860ef099","./epub_work/OEBPS/Text/BreakfastBreads-7.7.13.xhtml":"5abb3c4b610f","./epub_work/OEBPS/Text/Chicken-7.7.13.xhtml":"61ec426d7cce","./epub_work/OEBPS/Text/Converter.xhtml":"01b2bc97eef5","./epub_work/OEBPS/Text/Desserts-and-Sweets-7.7.13.xhtml":"fa7dbc2aeea2","./epub_work/OEBPS/Text/DipsSauces-7.7.13.xhtml":"0de43e168159","./epub_work/OEBPS/Text/Family-Heirlooms-7.7.13.xhtml":"7f2a7b78d3b5","./epub_work/OEBPS/Text/Front_Matter.xhtml":"db8da67a1ec5","./epub_work/OEBPS/Text/Healthy_Living.xhtml":"c9a5c21dcc5f","./epub_work/OEBPS/Text/Multiplier.xhtml":"6cd7b0958d43","./epub_work/OEBPS/Text/Pasta-7.7.13.xhtml":"3aaff90a277e","./epub_work/OEBPS/Text/Pork-7.7.13.xhtml":"596be909eff1","./epub_work/OEBPS/Text/Salads-7.7.13.xhtml":"c2db64a12f35","./epub_work/OEBPS/Text/Seafood-7.7.13.xhtml":"c72c88e80b0a","./epub_work/OEBPS/Text/Section0001.xhtml":"a4bf0a0d1371","./epub_work/OEBPS/Text/Section0002.xhtml":"eb966ecd0c3b","./epub_work/OEBPS/Text/Section0003.xhtml":"cd391d0cfbc0","./epub_work/OEBPS/Text/Section0004.xhtml":"802bd6da54e9","./epub_work/OEBPS/Text/Section0005.xhtml":"11b4d9dbc629","./epub_work/OEBPS/Text/Section0006.xhtml":"b9d380c12d24","./epub_work/OEBPS/Text/Section0007.xhtml":"e9edb1128301","./epub_work/OEBPS/Text/Section0008.xhtml":"3ef6ce74ff07","./epub_work/OEBPS/Text/Section0009.xhtml":"252b274d849f","./epub_work/OEBPS/Text/Section0010.xhtml":"69ad6167e1a2","./epub_work/OEBPS/Text/Section0011.xhtml":"74c0b810b50a","./epub_work/OEBPS/Text/Section0012.xhtml":"eaf8dd9a9d22","./epub_work/OEBPS/Text/Section0013.xhtml":"bb12516adaea","./epub_work/OEBPS/Text/Section0014.xhtml":"497d9606cdeb","./epub_work/OEBPS/Text/Section0015.xhtml":"91fa66be349a","./epub_work/OEBPS/Text/Section0016.xhtml":"e6f9d31ceac4","./epub_work/OEBPS/Text/Section0017.xhtml":"ae8d6f1875ea","./epub_work/OEBPS/Text/Section0018.xhtml":"0ed7f83c5916","./epub_work/OEBPS/Text/Section0019.xhtml":"fef4a0b64860","./epub_work/OEBPS/Text/Section0020.xhtml":"2c8218f290b0","./epub_work/OEBPS/Text/Section0021.xhtml":"300b33d25a3b","./epub_work/OEBPS/Text/Section0022.xhtml":"33f4e8dcbc95","./epub_work/OEBPS/Text/Section0023.xhtml":"1f16aba12bf3","./epub_work/OEBPS/Text/Section0024.xhtml":"e9c53ccc4ed8","./epub_work/OEBPS/Text/Section0025.xhtml":"4bb52ad2275a","./epub_work/OEBPS/Text/Section0026.xhtml":"4a095106f6d2","./epub_work/OEBPS/Text/Section0027.xhtml":"f58e2bb22bdc","./epub_work/OEBPS/Text/Section0028.xhtml":"14aeda96944b","./epub_work/OEBPS/Text/Section0029.xhtml":"194c03f5c6d8","./epub_work/OEBPS/Text/Section0030.xhtml":"0d59ba37ab33","./epub_work/OEBPS/Text/Section0031.xhtml":"098df8583506","./epub_work/OEBPS/Text/Section0032.xhtml":"c2cd00f52d0c","./epub_work/OEBPS/Text/Section0033.xhtml":"3e7b19328347","./epub_work/OEBPS/Text/Section0034.xhtml":"4873393e6aea","./epub_work/OEBPS/Text/Section0035.xhtml":"98f696b007fb","./epub_work/OEBPS/Text/Section0036.xhtml":"f8f0247eb19f","./epub_work/OEBPS/Text/Section0037.xhtml":"8f40b096e6e8","./epub_work/OEBPS/Text/Section0038.xhtml":"6b2413c3d31d","./epub_work/OEBPS/Text/Section0039.xhtml":"3361caaca8e0","./epub_work/OEBPS/Text/Section0040.xhtml":"33564992c742","./epub_work/OEBPS/Text/Section0041.xhtml":"91f1b32713d5","./epub_work/OEBPS/Text/Section0042.xhtml":"2c57e72e514e","./epub_work/OEBPS/Text/Section0043.xhtml":"ec5963ac8c48","./epub_work/OEBPS/Text/Section0044.xhtml":"44f7aa1b7d43","./epub_work/OEBPS/Text/Section0045.xhtml":"b7c27fa3a77c","./epub_work/OEBPS/Text/Section0046.xhtml":"7675a3e07cff","./epub_work/OEBPS/Text/Section0047.xhtml":"177c97ebda6e","./epub_work/OEBPS/Text/Section0048.xhtml":"b391a5a19bd0","./epub_work/OEBPS/Text/Section0049.xhtml":"fbcfa4446556","./epub_work/OEBPS/Text/Section0050.xhtml":"c09009672573","./epub_work/OEBPS/Text/Section0051.xhtml":"8a659a8f6333","./epub_work/OEBPS/Text/Section0052.xhtml":"049b6fa221ad","./epub_work/OEBPS/Text/Section0053.xhtml":"94cfb6e93830","./epub_work/OEBPS/Text/Section0054.xhtml":"fb5325c8747a","./epub_work/OEBPS/Text/Section0055.xhtml":"a8921e37659a","./epub_work/OEBPS/Text/Section0056.xhtml":"2ef58d259b53","./epub_work/OEBPS/Text/Section0057.xhtml":"9fa574591407","./epub_work/OEBPS/Text/Section0058.xhtml":"fac6f19b9c1f","./epub_work/OEBPS/Text/Section0059.xhtml":"0ac42b4ed3fc","./epub_work/OEBPS/Text/Section0060.xhtml":"0f8b2389c9c3","./epub_work/OEBPS/Text/Section0061.xhtml":"d59b0c78238f","./epub_work/OEBPS/Text/Section0062.xhtml":"c027e4bfa8c0","./epub_work/OEBPS/Text/Section0064.xhtml":"333ddd490152","./epub_work/OEBPS/Text/Section0065.xhtml":"fa3e30c10fa4","./epub_work/OEBPS/Text/Section0066.xhtml":"477592dbdfed","./epub_work/OEBPS/Text/Section0067.xhtml":"f06760b9f65b","./epub_work/OEBPS/Text/Section0068.xhtml":"7bedc5218c65","./epub_work/OEBPS/Text/Section0069.xhtml":"e7449fcb8984","./epub_work/OEBPS/Text/Section0070.xhtml":"04640d970ce8","./epub_work/OEBPS/Text/Section0071.xhtml":"83e9fc93b466","./epub_work/OEBPS/Text/Section0072.xhtml":"e844865d7aac","./epub_work/OEBPS/Text/Section0073.xhtml":"c38075d23276","./epub_work/OEBPS/Text/Section0074.xhtml":"8e5c7d44f6c4","./epub_work/OEBPS/Text/Section0075.xhtml":"1ee60dd73407","./epub_work/OEBPS/Text/Section0076.xhtml":"984461baec69","./epub_work/OEBPS/Text/Section0077.xhtml":"6d79f1c375ab","./epub_work/OEBPS/Text/Section0078.xhtml":"861e19bb7252","./epub_work/OEBPS/Text/Section0079.xhtml":"c3a02a31852f","./epub_work/OEBPS/Text/Section0080.xhtml":"b8f4c002ac56","./epub_work/OEBPS/Text/Section0081.xhtml":"39c577c4c147","./epub_work/OEBPS/Text/Section0082.xhtml":"0a66dbea99f8","./epub_work/OEBPS/Text/Section0083.xhtml":"f6198d811d5b","./epub_work/OEBPS/Text/Section0084.xhtml":"ed43c48606a1","./epub_work/OEBPS/Text/Section0085.xhtml":"ccfd980d59f4","./epub_work/OEBPS/Text/Section0086.xhtml":"9ecfc13dfb40","./epub_work/OEBPS/Text/Section0087.xhtml":"08c443e9deee","./epub_work/OEBPS/Text/Section0088.xhtml":"4ec0c0024d6a","./epub_work/OEBPS/Text/Section0089.xhtml":"dcede44df2be","./epub_work/OEBPS/Text/Section0090.xhtml":"2d6426964bee","./epub_work/OEBPS/Text/Section0091.xhtml":"7e1346df87f6","./epub_work/OEBPS/Text/Section0092.xhtml":"ff62c907642f","./epub_work/OEBPS/Text/Section0093.xhtml":"6a316e61117f","./epub_work/OEBPS/Text/Section0094.xhtml":"1a6b9d143549","./epub_work/OEBPS/Text/Section0095.xhtml":"0c9f297c9887","./epub_work/OEBPS/Text/Section0096.xhtml":"511c4c2361ff","./epub_work/OEBPS/Text/Section0097.xhtml":"045ecc407198","./epub_work/OEBPS/Text/Section0098.xhtml":"10f462ef32c2","./epub_work/OEBPS/Text/Section0099.xhtml":"15c61bdcefca","./epub_work/OEBPS/Text/Section0100.xhtml":"f77d6adcef7b","./epub_work/OEBPS/Text/Section0101.xhtml":"086328170171","./epub_work/OEBPS/Text/Section0102.xhtml":"60dbec9dd9fa","./epub_work/OEBPS/Text/Section0104.xhtml":"931cc81e7849","./epub_work/OEBPS/Text/Section0105.xhtml":"6f51c42c1d2a","./epub_work/OEBPS/Text/Section0106.xhtml":"cb2ee44fadbf","./epub_work/OEBPS/Text/Section0107.xhtml":"1992af8929a7","./epub_work/OEBPS/Text/Section0108.xhtml":"9390dc7ebe1e","./epub_work/OEBPS/Text/Section0109.xhtml":"86e714ffb8a4","./epub_work/OEBPS/Text/Section0110.xhtml":"7b2eb5ef06e8","./epub_work/OEBPS/Text/Section0111.xhtml":"993f9a869d20","./epub_work/OEBPS/Text/Section0112.xhtml":"b3110ec1fc8f","./epub_work/OEBPS/Text/Section0113.xhtml":"8079f7b15c66","./epub_work/OEBPS/Text/Section0114.xhtml":"d1d4f3e3804c","./epub_work/OEBPS/Text/Section0115.xhtml":"c3ceefc60177","./epub_work/OEBPS/Text/Section0116.xhtml":"220e23745f4c","./epub_work/OEBPS/Text/Section0117.xhtml":"6403246e9e9c","./epub_work/OEBPS/Text/Section0118.xhtml":"f276aac58658","./epub_work/OEBPS/Text/Section0119.xhtml":"993227bbc283","./epub_work/OEBPS/Text/Section0120.xhtml":"52b28f38fa3f","./epub_work/OEBPS/Text/Section0121.xhtml":"8be670a4d6c0","./epub_work/OEBPS/Text/Section0122.xhtml":"86f9c45a116c","./epub_work/OEBPS/Text/Section0124.xhtml":"9bd59e4b6181","./epub_work/OEBPS/Text/Section0125.xhtml":"b7a4424aa95a","./epub_work/OEBPS/Text/Section0126.xhtml":"bd709a76b84b","./epub_work/OEBPS/Text/Section0127.xhtml":"a74211c87ed0","./epub_work/OEBPS/Text/Section0128.xhtml":"b3835e16d8e4","./epub_work/OEBPS/Text/Section0129.xhtml":"6241d2f999ab","./epub_work/OEBPS/Text/Section0130.xhtml":"743d7f4a46de","./epub_work/OEBPS/Text/Section0131.xhtml":"a2b95f6ee689","./epub_work/OEBPS/Text/Section0132.xhtml":"10edd8018080","./epub_work/OEBPS/Text/Section0133.xhtml":"2df3fe3b355b","./epub_work/OEBPS/Text/Section0134.xhtml":"7c4cdaf0b477","./epub_work/OEBPS/Text/Section0135.xhtml":"0a9e4413e3c6","./epub_work/OEBPS/Text/Section0136.xhtml":"1888a30bd3cb","./epub_work/OEBPS/Text/Section0137.xhtml":"7c2daff5cdbc","./epub_work/OEBPS/Text/Section0138.xhtml":"900eb4f79a89","./epub_work/OEBPS/Text/Section0139.xhtml":"acd924c24f0c","./epub_work/OEBPS/Text/Section0140.xhtml":"942e25cfaced","./epub_work/OEBPS/Text/Section0141.xhtml":"db442af7dc30","./epub_work/OEBPS/Text/Section0142.xhtml":"7304d7eeea03","./epub_work/OEBPS/Text/Section0143.xhtml":"6df1af1cef75","./epub_work/OEBPS/Text/Section0144.xhtml":"2b4e5d10f14e","./epub_work/OEBPS/Text/Section0145.xhtml":"e0c63bcb4aa9","./epub_work/OEBPS/Text/Section0146.xhtml":"9773ff3d4599","./epub_work/OEBPS/Text/Section0147.xhtml":"fa52c4a2bf10","./epub_work/OEBPS/Text/Section0148.xhtml":"3b5a47eed45e","./epub_work/OEBPS/Text/Section0149.xhtml":"c740a9f74713","./epub_work/OEBPS/Text/Section0150.xhtml":"ec3357307c03","./epub_work/OEBPS/Text/Section0151.xhtml":"87cf75b37846","./epub_work/OEBPS/Text/Section0152.xhtml":"d1cf2b078fc5","./epub_work/OEBPS/Text/Section0153.xhtml":"113dc96d6d71","./epub_work/OEBPS/Text/Section0154.xhtml":"1e282b9b8008","./epub_work/OEBPS/Text/Section0155.xhtml":"a09764ad51a7","./epub_work/OEBPS/Text/Section0156.xhtml":"bfaaa242b525","./epub_work/OEBPS/Text/Section0157.xhtml":"dbbbb1c9265c","./epub_work/OEBPS/Text/Section0158.xhtml":"e757e820c850","./epub_work/OEBPS/Text/Section0159.xhtml":"34ff93a37600","./epub_work/OEBPS/Text/Section0160.xhtml":"b74d788a1e72","./epub_work/OEBPS/Text/Section0161.xhtml":"8bdf411824f4","./epub_work/OEBPS/Text/Section0162.xhtml":"f3c699cc6e5b","./epub_work/OEBPS/Text/Section0163.xhtml":"9d997d538ad7","./epub_work/OEBPS/Text/Section0164.xhtml":"ac0d5734066a","./epub_work/OEBPS/Text/Section0165.xhtml":"01461bf3951d","./epub_work/OEBPS/Text/Section0166.xhtml":"571b2b815141","./epub_work/OEBPS/Text/Section0167.xhtml":"20145c0e71ca","./epub_work/OEBPS/Text/Section0168.xhtml":"bb9dfa960a61","./epub_work/OEBPS/Text/Section0169.xhtml":"45d04f9d65c6","./epub_work/OEBPS/Text/Section0170.xhtml":"9577c7e34b25","./epub_work/OEBPS/Text/Section0171.xhtml":"fd46b4057809","./epub_work/OEBPS/Text/Section0172.xhtml":"3240b0c01fc7","./epub_work/OEBPS/Text/Section0173.xhtml":"2f722ab4403b","./epub_work/OEBPS/Text/Section0174.xhtml":"b7db38275bab","./epub_work/OEBPS/Text/Section0175.xhtml":"44dc8289c6b8","./epub_work/OEBPS/Text/Section0176.xhtml":"7fe6ff3eadce","./epub_work/OEBPS/Text/Section0177.xhtml":"f53710ce5b55","./epub_work/OEBPS/Text/Section0178.xhtml":"008edddc8610","./epub_work/OEBPS/Text/Section0179.xhtml":"ef1c78616093","./epub_work/OEBPS/Text/Section0180.xhtml":"9c39a2992ff4","./epub_work/OEBPS/Text/Section0181.xhtml":"697ec72872b3","./epub_work/OEBPS/Text/Section0182.xhtml":"1071d783e050","./epub_work/OEBPS/Text/Section0183.xhtml":"ffa4b0df82e8","./epub_work/OEBPS/Text/Section0184.xhtml":"12bb4756b771","./epub_work/OEBPS/Text/Section0185.xhtml":"b5a53e7cbeda","./epub_work/OEBPS/Text/Section0186.xhtml":"cfa72705e061","./epub_work/OEBPS/Text/Section0187.xhtml":"c3bde71f032e","./epub_work/OEBPS/Text/Section0188.xhtml":"5849e7bdb0a7","./epub_work/OEBPS/Text/Section0189.xhtml":"3e981475183b","./epub_work/OEBPS/Text/Section0190.xhtml":"a0c6838af43b","./epub_work/OEBPS/Text/Section0191.xhtml":"7d930a518c1a","./epub_work/OEBPS/Text/Section0192.xhtml":"83251cc5d885","./epub_work/OEBPS/Text/Section0193.xhtml":"962fcd4f11ae","./epub_work/OEBPS/Text/Section0194.xhtml":"69d36d16cbc1","./epub_work/OEBPS/Text/Section0195.xhtml":"ebe029b46d32","./epub_work/OEBPS/Text/Section0196.xhtml":"5512b876c498","./epub_work/OEBPS/Text/Section0197.xhtml":"32c4ab68f3f6","./epub_work/OEBPS/Text/Section0198.xhtml":"aa683dafc71a","./epub_work/OEBPS/Text/Section0199.xhtml":"3430b3b675b4","./epub_work/OEBPS/Text/Section0200.xhtml":"9e545d5621d4","./epub_work/OEBPS/Text/Section0201.xhtml":"06a00a912958","./epub_work/OEBPS/Text/Section0202.xhtml":"8695923e3761","./epub_work/OEBPS/Text/Section0203.xhtml":"00684ffd07f3","./epub_work/OEBPS/Text/Section0204.xhtml":"64d1a1800b11","./epub_work/OEBPS/Text/Section0205.xhtml":"6ddeb7601a59","./epub_work/OEBPS/Text/Section0206.xhtml":"7598ff6628bb","./epub_work/OEBPS/Text/Section0207.xhtml":"714b5b52ca1e","./epub_work/OEBPS/Text/Section0208.xhtml":"dbd188adea2f","./epub_work/OEBPS/Text/Section0209.xhtml":"f3f72bb41e0c","./epub_work/OEBPS/Text/Section0210.xhtml":"51abd59b30e2","./epub_work/OEBPS/Text/Section0211.xhtml":"c5cc038a83ff","./epub_work/OEBPS/Text/Section0212.xhtml":"28f83fba22de","./epub_work/OEBPS/Text/Section0213.xhtml":"b062d2adaaf6","./epub_work/OEBPS/Text/Section0214.xhtml":"b1bb307228ca","./epub_work/OEBPS/Text/Section0215.xhtml":"4a5be999b254","./epub_work/OEBPS/Text/Section0216.xhtml":"833ab3e12958","./epub_work/OEBPS/Text/Section0217.xhtml":"859a4f3e101b","./epub_work/OEBPS/Text/Section0218.xhtml":"aaeebed93a1d","./epub_work/OEBPS/Text/Section0219.xhtml":"95efc5c62005","./epub_work/OEBPS/Text/Section0220.xhtml":"87eb2149355b","./epub_work/OEBPS/Text/Section0221.xhtml":"36a8e245417a","./epub_work/OEBPS/Text/Section0222.xhtml":"a482ad4c82f6","./epub_work/OEBPS/Text/Section0223.xhtml":"04ecf7cda98e","./epub_work/OEBPS/Text/Section0224.xhtml":"1e5ba7ebcaf5","./epub_work/OEBPS/Text/Section0226.xhtml":"442abb55e4c8","./epub_work/OEBPS/Text/Section0227.xhtml":"9d87994e8e32","./epub_work/OEBPS/Text/Section0228.xhtml":"29b49c8e0e54","./epub_work/OEBPS/Text/Section0229.xhtml":"a59190d76760","./epub_work/OEBPS/Text/ShoppingList.xhtml":"d7812199ba47","./epub_work/OEBPS/Text/Soups-Stews-7.7.13.xhtml":"008b55e7ba6d","./epub_work/OEBPS/Text/Timer.xhtml":"9000b0d67090","./epub_work/OEBPS/Text/Veggies-Sides-7.7.13.xhtml":"0aea855616e4","./epub_work/OEBPS/Text/cover.xhtml":"13961e15ee19","./epub_work/OEBPS/Text/front_matter_export_from_indesign.html":"1a2e319ce097","./index.html":"a3893b564df7","./manifest.webmanifest":"c132419f1bc9"},"runtime":{"./epub_work/OEBPS/Images/3156.png":"873b766fa603","./epub_work/OEBPS/Images/3162.png":"65df4bf457da","./epub_work/OEBPS/Images/3167.png":"d6b9f4abcc18","./epub_work/OEBPS/Images/3178.png":"6c08c35b12e1","./epub_work/OEBPS/Images/3183.png":"10283529670f","./epub_work/OEBPS/Images/3188.png":"a79852ec1801","./epub_work/OEBPS/Images/3193.png":"dcda0aaf30f8","./epub_work/OEBPS/Images/3199.png":"84075a7b71f6","./epub_work/OEBPS/Images/3209.png":"15be7bbb0c91","./epub_work/OEBPS/Images/3215.png":"bb3189887b8b","./epub_work/OEBPS/Images/3220.png":"7f0aa9a494fa","./epub_work/OEBPS/Images/3241.png":"86bec90068bf","./epub_work/OEBPS/Images/3247.png":"4e4f14c6041e","./epub_work/OEBPS/Images/3252.png":"527914e5ee62","./epub_work/OEBPS/Images/3257.png":"e29e37577538","./epub_work/OEBPS/Images/3262.png":"019f220938d3","./epub_work/OEBPS/Images/3267.png":"a6342058983f","./epub_work/OEBPS/Images/3278.png":"8725af9a7dcd","./epub_work/OEBPS/Images/3295.png":"8fdf948bdf4e","./epub_work/OEBPS/Images/3363.png":"27726b1be95a","./epub_work/OEBPS/Images/3368.png":"990a3151177a","./epub_work/OEBPS/Images/3373.png":"f8698a82dc90","./epub_work/OEBPS/Images/3378.png":"279dc8f532b4","./epub_work/OEBPS/Images/3398.png":"2626fcd7c579","./epub_work/OEBPS/Images/3403.png":"7f247c6bc9b2","./epub_work/OEBPS/Images/3438.png":"ecf2ddd19d4e","./epub_work/OEBPS/Images/3443.png":"5e7bb2d925ca","./epub_work/OEBPS/Images/3459.png":"60a67b2c8faa","./epub_work/OEBPS/Images/3464.png":"76f07d464dc1","./epub_work/OEBPS/Images/3492.png":"e32601f0e7af","./epub_work/OEBPS/Images/3497.png":"d1c2ec87a30a","./epub_work/OEBPS/Images/3539.png":"fb6a59c522d6","./epub_work/OEBPS/Images/3559.png":"e4475d8c3432","./epub_work/OEBPS/Images/3565.png":"3cc34b803a35","./epub_work/OEBPS/Images/3570.png":"2107c074cd38","./epub_work/OEBPS/Images/3575.png":"d5dde949d642","./epub_work/OEBPS/Images/3580.png":"9901621b26d7","./epub_work/OEBPS/Images/3586.png":"4253af39f2e4","./epub_work/OEBPS/Images/3591.png":"fba2f269da70","./epub_work/OEBPS/Images/3597.png":"64f33b7cb3fe","./epub_work/OEBPS/Images/3690.png":"3cea70e2ef3d","./epub_work/OEBPS/Images/3695.png":"6b6333a8aa27","./epub_work/OEBPS/Images/3716.png":"1f7cabfb9679","./epub_work/OEBPS/Images/3722.png":"8e4a72b74476","./epub_work/OEBPS/Images/3859.png":"875d4e729794","./epub_work/OEBPS/Images/3864.png":"3e66bb61fd6b","./epub_work/OEBPS/Images/3885.png":"288bed768f48","./epub_work/OEBPS/Images/3891.png":"c235655d1652","./epub_work/OEBPS/Images/3895.png":"463b3dd3239d","./epub_work/OEBPS/Images/3896.png":"600eba898025","./epub_work/OEBPS/Images/3901.png":"cab286c04b61","./epub_work/OEBPS/Images/3903.png":"50ce464406d9","./epub_work/OEBPS/Images/3906.png":"6a16d3bc1659","./epub_work/OEBPS/Images/3907.png":"0d32c40469b4","./epub_work/OEBPS/Images/3908.png":"9508f1a41cb7","./epub_work/OEBPS/Images/3912.png":"3d50cb5967b8","./epub_work/OEBPS/Images/3916.png":"15694afccdac","./epub_work/OEBPS/Images/3918.png":"6552e2702deb","./epub_work/OEBPS/Images/3923.png":"7d7096daafff","./epub_work/OEBPS/Images/3928.png":"f62bd7ba042b","./epub_work/OEBPS/Images/3931.png":"036a3f747e1d","./epub_work/OEBPS/Images/3933.png":"6e470ce56425","./epub_work/OEBPS/Images/3946.png":"c26be9876cc0","./epub_work/OEBPS/Images/3948.png":"e7aa58bbfc46","./epub_work/OEBPS/Images/3951.png":"61123b4c1c9f","./epub_work/OEBPS/Images/3955.png":"e71b6a8ed762","./epub_work/OEBPS/Images/3956.png":"1b991c65d02d","./epub_work/OEBPS/Images/3961.png":"724708e2bcf5","./epub_work/OEBPS/Images/3962.png":"81afc1697306","./epub_work/OEBPS/Images/3967.png":"e780d9d55715","./epub_work/OEBPS/Images/3972.png":"198e6b82a0ce","./epub_work/OEBPS/Images/3978.png":"60c1418c622b","./epub_work/OEBPS/Images/3983.png":"5445611728c0","./epub_work/OEBPS/Images/3984.png":"42f16b663f82","./epub_work/OEBPS/Images/3989.png":"ba71f331918b","./epub_work/OEBPS/Images/4008.png":"b494e3b63e2c","./epub_work/OEBPS/Images/4012.png":"715430944ddf","./epub_work/OEBPS/Images/4017.png":"f2e96333ea2b","./epub_work/OEBPS/Images/4061.png":"a44c738be84f","./epub_work/OEBPS/Images/4066.png":"b8e96e4d5c5c","./epub_work/OEBPS/Images/4071.png":"c70701cfb014","./epub_work/OEBPS/Images/4076.png":"c6ae62ad5a17","./epub_work/OEBPS/Images/4092.png":"43aba9c45ff2","./epub_work/OEBPS/Images/4097.png":"0d74917c8ef2","./epub_work/OEBPS/Images/4102.png":"6b030910da55","./epub_work/OEBPS/Images/4107.png":"3c64a92cbb94","./epub_work/OEBPS/Images/4110.png":"8b59129562ff","./epub_work/OEBPS/Images/4129.png":"0ee028142495","./epub_work/OEBPS/Images/4295.png":"1cb161da61cb","./epub_work/OEBPS/Images/4300.png":"44c0a5827b3b","./epub_work/OEBPS/Images/4340.png":"e1930e68d3f0","./epub_work/OEBPS/Images/4345.png":"5a24dc8164a3","./epub_work/OEBPS/Images/4432.png":"1b61f22ab0b3","./epub_work/OEBPS/Images/4437.png":"9cb0db919a01","./epub_work/OEBPS/Images/4448.png":"96a5f5bda5bb","./epub_work/OEBPS/Images/4453.png":"7c09a815f1aa","./epub_work/OEBPS/Images/4458.png":"24eeb9d1e1ad","./epub_work/OEBPS/Images/4463.png":"0601b71bc8f4","./epub_work/OEBPS/Images/4468.png":"68b204cee878","./epub_work/OEBPS/Images/4473.png":"376ada103bea","./epub_work/OEBPS/Images/4478.png":"cd92d6f67ea3","./epub_work/OEBPS/Images/4483.png":"1f650ddb8a17","./epub_work/OEBPS/Images/4488.png":"41a7c3e2a1de","./epub_work/OEBPS/Images/4494.png":"bbbd26d01533","./epub_work/OEBPS/Images/4505.png":"8cf30cad9d29","./epub_work/OEBPS/Images/4510.png":"417a08a09852","./epub_work/OEBPS/Images/4573.png":"7593ef3bf95a","./epub_work/OEBPS/Images/5244.png":"87ae030d432d","./epub_work/OEBPS/Images/5249.png":"8e6dad4eea7e","./epub_work/OEBPS/Images/5254.png":"7d2bd1e93ca1","./epub_work/OEBPS/Images/5259.png":"10b46649f581","./epub_work/OEBPS/Images/5265.png":"abcff25f8fc7","./epub_work/OEBPS/Images/5275.png":"60ca7d056bc7","./epub_work/OEBPS/Images/5280.png":"94177f16bed9","./epub_work/OEBPS/Images/5284.png":"e6f163fa8a5f","./epub_work/OEBPS/Images/5286.png":"17d23fb9c471","./epub_work/OEBPS/Images/5291.png":"ddd3521d24e9","./epub_work/OEBPS/Images/5294.png":"13a5ad5c1b5b","./epub_work/OEBPS/Images/5296.png":"e4475d8c3432","./epub_work/OEBPS/Images/5299.png":"3c0b178cdd23","./epub_work/OEBPS/Images/5302.png":"62b659935f9d","./epub_work/OEBPS/Images/5305.png":"f091d1ee4064","./epub_work/OEBPS/Images/5307.png":"06cc286e17e4","./epub_work/OEBPS/Images/5310.png":"30f22f644401","./epub_work/OEBPS/Images/5312.png":"ce5ed8a6f2ff","./epub_work/OEBPS/Images/5315.png":"bb754e756554","./epub_work/OEBPS/Images/5317.png":"e30ed6dee057","./epub_work/OEBPS/Images/5320.png":"b0a9caeb70e9","./epub_work/OEBPS/Images/5322.png":"bfddbef2a2e3","./epub_work/OEBPS/Images/5325.png":"74870e0ff0f8","./epub_work/OEBPS/Images/5328.png":"28c147b41e61","./epub_work/OEBPS/Images/5331.png":"f55b4569a74b","./epub_work/OEBPS/Images/5333.png":"c567dce83dbf","./epub_work/OEBPS/Images/5336.png":"9e40505bbfa9","./epub_work/OEBPS/Images/5338.png":"dd071d3238e8","./epub_work/OEBPS/Images/5341.png":"f4c2c186e68f","./epub_work/OEBPS/Images/5343.png":"6800a72f2749","./epub_work/OEBPS/Images/5346.png":"13f4bd49e0b5","./epub_work/OEBPS/Images/5348.png":"bb0734e57d13","./epub_work/OEBPS/Images/5352.png":"617bb2bbcec0","./epub_work/OEBPS/Images/5354.png":"068944b8563a","./epub_work/OEBPS/Images/5357.png":"ec28c5de76f6","./epub_work/OEBPS/Images/5361.png":"3d83b9639cea","./epub_work/OEBPS/Images/5362.png":"a1c6b2cb93a5","./epub_work/OEBPS/Images/5367.png":"7dd370c16b9b","./epub_work/OEBPS/Images/5372.png":"90ef7fea2f8e","./epub_work/OEBPS/Images/5377.png":"51b7a4a1193b","./epub_work/OEBPS/Images/5383.png":"8dff01cd7289","./epub_work/OEBPS/Images/5393.png":"6e76848e854c","./epub_work/OEBPS/Images/6454.png":"51e601e534f6","./epub_work/OEBPS/Images/6459.png":"a3d999fde62c","./epub_work/OEBPS/Images/6472.png":"f6be604ad3d4","./epub_work/OEBPS/Images/6493.png":"0fe460d20b60","./epub_work/OEBPS/Images/6508.png":"c7e53c23f49b","./epub_work/OEBPS/Images/6544.png":"2a3cd901bac3","./epub_work/OEBPS/Images/6549.png":"e317cb68c1d4","./epub_work/OEBPS/Images/6554.png":"7387a269fd70","./epub_work/OEBPS/Images/6559.png":"47ae7be4a80a","./epub_work/OEBPS/Images/6566.png":"4c24f9d0b715","./epub_work/OEBPS/Images/6581.png":"31399e90a465","./epub_work/OEBPS/Images/6586.png":"d14374cce906","./epub_work/OEBPS/Images/6596.png":"799ad9408bd7","./epub_work/OEBPS/Images/6601.png":"192092306b60","./epub_work/OEBPS/Images/6607.png":"0314868c3d47","./epub_work/OEBPS/Images/6619.png":"f43a86367a78","./epub_work/OEBPS/Images/6624.png":"9f8e9cf71541","./epub_work/OEBPS/Images/6629.png":"4734cbda39c4","./epub_work/OEBPS/Images/6634.png":"19694b5fea8b","./epub_work/OEBPS/Images/6639.png":"7d5b2798a75e","./epub_work/OEBPS/Images/6644.png":"8a4bd287dfc9","./epub_work/OEBPS/Images/6649.png":"1908f6c9238d","./epub_work/OEBPS/Images/6654.png":"28859d4703ca","./epub_work/OEBPS/Images/6661.png":"cbd1fae78dcd","./epub_work/OEBPS/Images/6673.png":"8dcdd2734595","./epub_work/OEBPS/Images/6676.png":"6109fa846ee4","./epub_work/OEBPS/Images/6678.png":"4c6b85cacc72","./epub_work/OEBPS/Images/6681.png":"097b868e64ac","./epub_work/OEBPS/Images/6683.png":"dfd62a1991e7","./epub_work/OEBPS/Images/6687.png":"911c98ecdd4c","./epub_work/OEBPS/Images/6688.png":"dc87c9bcd528","./epub_work/OEBPS/Images/6693.png":"03fcd2ab6b0e","./epub_work/OEBPS/Images/6698.png":"be65ef87b8fe","./epub_work/OEBPS/Images/6703.png":"29365487c5fd","./epub_work/OEBPS/Images/6708.png":"1cf80c0b685c","./epub_work/OEBPS/Images/6713.png":"ebae2d8c175c","./epub_work/OEBPS/Images/6719.png":"1c4a21daf541","./epub_work/OEBPS/Images/6729.png":"4af77e37c1e0","./epub_work/OEBPS/Images/6745.png":"8a69a725dddb","./epub_work/OEBPS/Images/6755.png":"2c1c3277e8a6","./epub_work/OEBPS/Images/6761.png":"88a656b8b852","./epub_work/OEBPS/Images/6774.png":"cbee6d959e33","./epub_work/OEBPS/Images/6780.png":"2cdf6d120773","./epub_work/OEBPS/Images/6785.png":"eaf482a599ed","./epub_work/OEBPS/Images/6790.png":"7f2414ceea28","./epub_work/OEBPS/Images/6799.png":"1156a57eb795","./epub_work/OEBPS/Images/6805.png":"bd8c477c129b","./epub_work/OEBPS/Images/6840.png":"d803f77883a4","./epub_work/OEBPS/Images/6841.png":"cd1487e2488c","./epub_work/OEBPS/Images/6847.png":"feff657cc83e","./epub_work/OEBPS/Images/6857.png":"236b7b8e78d5","./epub_work/OEBPS/Images/6862.png":"d0d3f71cf09c","./epub_work/OEBPS/Images/6897.png":"e579895a0d2d","./epub_work/OEBPS/Images/7080.png":"01e8ccd85358","./epub_work/OEBPS/Images/7091.png":"a8c919218a3e","./epub_work/OEBPS/Images/7111.png":"49d4574565ee","./epub_work/OEBPS/Images/7171.png":"6331a6f62d8e","./epub_work/OEBPS/Images/7181.png":"19ee2469a44f","./epub_work/OEBPS/Images/7186.png":"47ea243926fd","./epub_work/OEBPS/Images/7191.png":"057b80cb4608","./epub_work/OEBPS/Images/ApricotPorkChops.png":"a0075838a8d2","./epub_work/OEBPS/Images/Dan'sCountryStyleColeslaw.png":"ccc732f2ae59","./epub_work/OEBPS/Images/Multiplier.JPG":"0d76bba95b33","./epub_work/OEBPS/Images/apple_strudel2.png":"333d7d8bb053","./epub_work/OEBPS/Images/cat_beef.svg":"0d0dab6c1334","./epub_work/OEBPS/Images/cat_breakfast.svg":"b62d282bd72e","./epub_work/OEBPS/Images/cat_chicken.svg":"9dd63fd56d56","./epub_work/OEBPS/Images/cat_desserts.svg":"7547f3b1f7e2","./epub_work/OEBPS/Images/cat_dips.svg":"95d95940281c","./epub_work/OEBPS/Images/cat_family.svg":"accab6141266","./epub_work/OEBPS/Images/cat_pasta.svg":"b62d46bf03e4","./epub_work/OEBPS/Images/cat_pork.svg":"104f053c0ee8","./epub_work/OEBPS/Images/cat_salads.svg":"743c3d417a59","./epub_work/OEBPS/Images/cat_seafood.svg":"6c00277979cd","./epub_work/OEBPS/Images/cat_soups.svg":"8d20912c3f9f","./epub_work/OEBPS/Images/grilled_chicken_kabob2.png":"2ab06ee994e7"}};
@@ -0,0 +1,125 @@
+"""
+Opt-in per-stage timing for the recipe batch scripts.
+
+A script adds the shared options with add_profile_argument() and wraps
+its work in named stages:
+
+    with profiling.stage('typos'):
+        content, fixed = fix_typos(content)
+
+Stages cost nothing until --profile is given. Then every stage records
+its wall time and call count against the file being processed (see
+per_file()), the files are processed in this process so no timings are
+lost to worker processes, and at the end finish() writes a
+tab-separated report, one row per file and stage, that sorts in a
+spreadsheet or with `sort -t$'\\t' -k4 -rn`. It also prints the stage
+totals and the slowest files. --pstats additionally dumps a cProfile
+of the whole run for pstats or snakeviz.
+"""
+
+import contextlib
+import cProfile
+import os
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(ROOT, '.cache', 'profile')
+
+# How many of the slowest files finish() names.
+SLOWEST_FILES = 5
+
+_enabled = False
+_current_file = '-'
+_records = defaultdict(lambda: [0, 0.0])   # (file, stage) -> [calls, seconds]
+_profiler = None
+
+
+def add_profile_argument(parser):
+    """Add --profile [REPORT] and --pstats PATH to an argparse parser."""
+    parser.add_argument('--profile', nargs='?', const='', metavar='REPORT',
+                        help='time every stage of every file and write a TSV report '
+                             f'(default {os.path.relpath(REPORT_DIR, ROOT)}/<script>.tsv)')
+    parser.add_argument('--pstats', metavar='PATH', help='with --profile, also dump a cProfile of the run')
+
+
+def start(args):
+    """Turn profiling on if --profile was given; returns the job count to use."""
+    global _enabled, _profiler
+    if args.profile is None:
+        return getattr(args, 'jobs', 1)
+    _enabled = True
+    if args.pstats:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    return 1
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time the enclosed block as stage `name` of the current file."""
+    if not _enabled:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = _records[(_current_file, name)]
+        record[0] += 1
+        record[1] += time.perf_counter() - start_time
+
+
+@contextlib.contextmanager
+def current_file(name):
+    """Attribute the stages run in the enclosed block to file `name`."""
+    global _current_file
+    previous, _current_file = _current_file, name
+    try:
+        yield
+    finally:
+        _current_file = previous
+
+
+def per_file(func):
+    """Wrap a per-file worker so its stages are attributed to basename(first argument)."""
+    if not _enabled:
+        return func
+
+    def wrapper(*args):
+        with current_file(os.path.basename(str(args[0]))):
+            return func(*args)
+    return wrapper
+
+
+def finish(args, script):
+    """Write the report and print the summary, if profiling is on."""
+    if not _enabled:
+        return
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(args.pstats)
+
+    report = args.profile or os.path.join(REPORT_DIR, f'{script}.tsv')
+    os.makedirs(os.path.dirname(os.path.abspath(report)), exist_ok=True)
+    rows = sorted(_records.items(), key=lambda item: -item[1][1])
+    with open(report, 'w', encoding='utf-8') as f:
+        f.write('file\tstage\tcalls\tseconds\n')
+        for (fname, name), (calls, seconds) in rows:
+            f.write(f'{fname}\t{name}\t{calls}\t{seconds:.6f}\n')
+
+    stages = defaultdict(lambda: [0, 0.0])
+    files = defaultdict(float)
+    for (fname, name), (calls, seconds) in _records.items():
+        stages[name][0] += calls
+        stages[name][1] += seconds
+        files[fname] += seconds
+    total = sum(files.values()) or 1.0
+
+    print(f'\nProfile ({len(files)} files, {total:.3f} s in stages):')
+    for name, (calls, seconds) in sorted(stages.items(), key=lambda item: -item[1][1]):
+        print(f'  {name:16} {seconds * 1000:9.1f} ms  {seconds / total:5.1%}  {calls:6} calls')
+    print('  slowest files: ' + ', '.join(
+        f'{fname} ({seconds * 1000:.1f} ms)'
+        for fname, seconds in sorted(files.items(), key=lambda item: -item[1])[:SLOWEST_FILES]))
+    print(f'  report: {report}' + (f', pstats: {args.pstats}' if _profiler is not None else ''))
@@ -0,0 +1,187 @@
+"""
+Exact rational ingredient quantities.
+
+Quantity is a small slotted value object holding an integer numerator and
+denominator plus an optional unit, so scaling "1 ½ cups" by 5/80 stays
+exact and repeatable instead of drifting through floats. Parsing handles
+whole numbers, decimals, "1/2", "1 1/2", "1½" and "1 ½" with one regex;
+formatting picks the nearest kitchen fraction from a table precomputed
+at import.
+"""
+
+import re
+from fractions import Fraction
+from math import gcd
+
+# Unicode vulgar fractions the cookbook uses, as (numerator, denominator).
+VULGAR_FRACTIONS = {
+    '¼': (1, 4), '½': (1, 2), '¾': (3, 4),
+    '⅓': (1, 3), '⅔': (2, 3),
+    '⅕': (1, 5), '⅖': (2, 5), '⅗': (3, 5), '⅘': (4, 5),
+    '⅙': (1, 6), '⅚': (5, 6),
+    '⅛': (1, 8), '⅜': (3, 8), '⅝': (5, 8), '⅞': (7, 8),
+}
+
+# Fractions we print, in ascending order.
+KITCHEN_FRACTIONS = [
+    ((1, 8), '⅛'), ((1, 4), '¼'), ((1, 3), '⅓'),
+    ((3, 8), '⅜'), ((1, 2), '½'), ((5, 8), '⅝'),
+    ((2, 3), '⅔'), ((3, 4), '¾'), ((7, 8), '⅞'),
+]
+
+_VULGAR_CLASS = ''.join(VULGAR_FRACTIONS)
+
+QUANTITY_RE = re.compile(
+    r'^(?:(?P<whole>\d+)(?:\.(?P<decimal>\d+))?(?:\s+(?=\d)|\s*(?=[' + _VULGAR_CLASS + r'])|$))?'
+    r'(?:(?P<vulgar>[' + _VULGAR_CLASS + r'])|(?P<num>\d+)\s*/\s*(?P<den>\d+))?$'
+)
+
+# A fractional part this close to a kitchen fraction prints as that fraction.
+FRACTION_TOLERANCE = 0.06
+
+# Resolution of the nearest-fraction table. Every decision boundary (the
+# midpoints between neighbouring kitchen fractions, multiples of 1/48, and
+# the tolerance edges, multiples of 1/600) falls on a multiple of 1/1200,
+# so each table cell lies wholly on one side of every boundary.
+_GRID = 1200
+
+
+def _nearest_fraction(frac):
+    best, best_dist = None, float('inf')
+    for (n, d), symbol in KITCHEN_FRACTIONS:
+        dist = abs(n / d - frac)
+        if dist < best_dist:
+            best, best_dist = symbol, dist
+    return best if best_dist < FRACTION_TOLERANCE else None
+
+
+# NEAREST_FRACTION[i] is the symbol printed for a fractional part in
+# [i/_GRID, (i+1)/_GRID), or None if no kitchen fraction is close enough.
+NEAREST_FRACTION = [_nearest_fraction((i + 0.5) / _GRID) for i in range(_GRID)]
+
+
+class Quantity:
+    """An exact non-negative amount: num/den of `unit`."""
+
+    __slots__ = ('num', 'den', 'unit')
+
+    def __init__(self, num, den=1, unit=''):
+        if den < 0:
+            num, den = -num, -den
+        g = gcd(num, den) or 1
+        self.num = num // g
+        self.den = den // g
+        self.unit = unit
+
+    @classmethod
+    def parse(cls, text, unit=''):
+        """Parse "2", "1.5", "1/2", "1 1/2", "1½" or "1 ½"; None if it isn't a quantity."""
+        m = QUANTITY_RE.match(text.strip())
+        if not m or not any(m.group('whole', 'vulgar', 'num')):
+            return None
+        num, den = 0, 1
+        if m.group('whole'):
+            decimal = m.group('decimal') or ''
+            num, den = int(m.group('whole') + decimal), 10 ** len(decimal)
+        if m.group('vulgar'):
+            n, d = VULGAR_FRACTIONS[m.group('vulgar')]
+        elif m.group('num'):
+            n, d = int(m.group('num')), int(m.group('den'))
+            if d == 0:
+                return None
+        else:
+            return cls(num, den, unit)
+        return cls(num * d + n * den, den * d, unit)
+
+    @classmethod
+    def coerce(cls, value):
+        """A Quantity from a Quantity, int, Fraction or float."""
+        if isinstance(value, Quantity):
+            return value
+        if isinstance(value, float):
+            value = Fraction(value).limit_denominator(1 << 20)
+        value = Fraction(value)
+        return cls(value.numerator, value.denominator)
+
+    def scaled(self, factor):
+        """This quantity times `factor` (a ratio, possibly from a float curve)."""
+        f = Quantity.coerce(factor)
+        return Quantity(self.num * f.num, self.den * f.den, self.unit)
+
+    __mul__ = scaled
+    __rmul__ = scaled
+
+    def _cmp(self, other):
+        o = Quantity.coerce(other)
+        return self.num * o.den - o.num * self.den
+
+    def __eq__(self, other):
+        try:
+            return self._cmp(other) == 0 and self.unit == getattr(other, 'unit', self.unit)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __hash__(self):
+        return hash((self.num, self.den, self.unit))
+
+    def __lt__(self, other):
+        return self._cmp(other) < 0
+
+    def __le__(self, other):
+        return self._cmp(other) <= 0
+
+    def __gt__(self, other):
+        return self._cmp(other) > 0
+
+    def __ge__(self, other):
+        return self._cmp(other) >= 0
+
+    def __bool__(self):
+        return self.num != 0
+
+    def __float__(self):
+        return self.num / self.den
+
+    def __repr__(self):
+        unit = f', {self.unit!r}' if self.unit else ''
+        return f'Quantity({self.num}, {self.den}{unit})'
+
+    def format(self):
+        """Best human-readable cooking amount, e.g. "1 ½" or "⅓"."""
+        if self.num <= 0:
+            return '0'
+        whole, rem = divmod(self.num, self.den)
+        # Within 1% of a whole number. A positive amount never prints as
+        # 0, only as the smallest kitchen fraction.
+        if 100 * rem < self.den:
+            return str(whole) if whole else KITCHEN_FRACTIONS[0][1]
+        if 100 * (self.den - rem) < self.den:
+            return str(whole + 1)
+
+        symbol = NEAREST_FRACTION[rem * _GRID // self.den]
+        if symbol is not None:
+            return f'{whole} {symbol}' if whole else symbol
+        # Round to the nearest quarter and try again
+        quarters = round(Fraction(4 * self.num, self.den))
+        if quarters == 0:
+            return KITCHEN_FRACTIONS[0][1]
+        return Quantity(quarters, 4).format()
+
+    def __str__(self):
+        return f'{self.format()} {self.unit}' if self.unit else self.format()
+
+    def to_list(self):
+        return [self.num, self.den, self.unit]
+
+
+def parse_quantity(text):
+    """Parse a positive quantity string into a Quantity, or None."""
+    q = Quantity.parse(text)
+    return q if q else None
+
+
+def format_quantity(value):
+    """Format a Quantity (or plain number) as a cooking amount string."""
+    if value is None:
+        return '0'
+    return Quantity.coerce(value).format()
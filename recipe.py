@@ -0,0 +1,263 @@
+"""
+Structured recipe model shared by the batch scripts.
+
+parse_recipe() reads a Section XHTML document once with the standard
+library's HTMLParser and returns a Recipe: title, yield, ingredient lines,
+the instruction steps, and which images may be the printed nutrition
+panel. The heuristics are the ones modernize_recipes.py has always used
+for the toolbar deep links and the nutrition card (ingredients start
+after the old toolbar label and stop at the first instruction verb), so
+every stage sees the same recipe.
+
+cached_recipe() memoizes the parse on disk in .cache/recipes/, keyed by
+the document hash and the parser version, as one compact JSON list per
+document. A stage that only needs the recipe's facts never has to parse
+the XHTML again; document_yield() is the yield (see yields.py) the same
+way.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+from manifest import script_version
+from patterns import (
+    BOILERPLATE_RE, INSTRUCTION_VERBS, MAKES_TEXT_RE, NUTRITION_IMG_RE,
+    SUBHEADER_RE, TOOL_LABEL_RE, WHITESPACE_RE, YIELD_TEXT_RE,
+)
+from yields import parse_yield
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ROOT, '.cache', 'recipes')
+
+# Bump by editing this module or the patterns it uses; stale entries are
+# simply never looked up again.
+PARSER_VERSION = script_version(os.path.abspath(__file__), ('patterns.py', 'quantity.py', 'yields.py'))
+
+
+@dataclass
+class Recipe:
+    title: str = ''
+    yield_count: int = None
+    yield_text: str = None
+    ingredient_lines: list = field(default_factory=list)
+    steps: list = field(default_factory=list)
+    # True while the page still has the InDesign "Kitchen Timer ..." toolbar.
+    has_old_toolbar: bool = False
+    # Positions among the page's <img>s that may be the printed nutrition
+    # panel, best first; the first one still on the page is the panel.
+    nutrition_images: list = field(default_factory=list)
+
+    @property
+    def yield_info(self):
+        return parse_yield(self.yield_text)
+
+    def to_list(self):
+        return [self.title, self.yield_count, self.yield_text, self.has_old_toolbar,
+                self.ingredient_lines, self.steps, self.nutrition_images]
+
+    @classmethod
+    def from_list(cls, data):
+        title, yield_count, yield_text, has_old_toolbar, ingredient_lines, steps, nutrition_images = data
+        return cls(title, yield_count, yield_text, ingredient_lines, steps, has_old_toolbar, nutrition_images)
+
+
+# ============================================================
+# Text-level heuristics (shared with modernize_recipes.py)
+# ============================================================
+
+def normalize_text(chunks):
+    """Join text chunks the way BeautifulSoup's get_text(' ') does, then squash whitespace."""
+    return WHITESPACE_RE.sub(' ', ' '.join(chunks)).strip()
+
+
+def baseline_yield(texts):
+    """Find the Yield:/Makes line and the servings a home cook starts from.
+
+    `texts` are the page's paragraph texts in document order. Returns
+    (Yield.baseline, raw yield text).
+    """
+    raw = None
+    for t in texts:
+        if not t:
+            continue
+        m = YIELD_TEXT_RE.search(t)
+        if m:
+            raw = m.group(1).strip()
+            break
+        m = MAKES_TEXT_RE.search(t)
+        if m:
+            raw = 'Makes ' + m.group(1).strip()
+            break
+    if not raw:
+        return None, None
+    return parse_yield(raw).baseline, raw
+
+
+def ingredient_block(texts, title):
+    """Return (ingredient lines, index of the paragraph that ended them).
+
+    Ingredients are the short paragraphs after the old toolbar label and
+    before the first clearly instructional paragraph.
+    """
+    start = 0
+    for i, t in enumerate(texts):
+        if TOOL_LABEL_RE.search(t) and len(t) < 80:
+            start = i + 1
+            break
+
+    lines = []
+    end = len(texts)
+    for i in range(start, len(texts)):
+        t = texts[i]
+        if not t:
+            continue
+        # Stop once we hit an instruction verb.
+        if INSTRUCTION_VERBS.match(t) or len(t) > 110:
+            end = i
+            break
+        # Skip obvious boilerplate and yield/author lines
+        if BOILERPLATE_RE.search(t):
+            continue
+        if title and title.lower() in t.lower() and len(t) < len(title) + 20:
+            continue
+        # Skip ingredient subheaders that are uppercase words only
+        if SUBHEADER_RE.match(t) and t.isupper() is False and ' ' not in t:
+            continue
+        lines.append(t)
+
+    # Deduplicate while preserving order
+    cleaned = []
+    seen = set()
+    for l in lines:
+        if l in seen:
+            continue
+        seen.add(l)
+        cleaned.append(l)
+    return cleaned, end
+
+
+# ============================================================
+# XHTML parsing
+# ============================================================
+
+class _PageReader(HTMLParser):
+    """Collects paragraph texts, the title heading, the page text and the
+    nutrition panel candidates in one pass."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self.page_text = []
+        self.title = None
+        self._open_ps = []
+        self._h2 = None
+        self._h2_is_title = False
+        self._first_h2 = None
+        self._skip = 0
+        self.images = 0
+        self._nutrition_by_alt = []
+        self._nutrition_by_src = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'p':
+            self.paragraphs.append([])
+            self._open_ps.append(self.paragraphs[-1])
+        elif tag == 'h2' and self._h2 is None:
+            self._h2 = []
+            self._h2_is_title = dict(attrs).get('id') == 'heading_id_2'
+        elif tag == 'img':
+            self._image(dict(attrs))
+        elif tag in ('style', 'script'):
+            self._skip += 1
+
+    def _image(self, attrs):
+        if 'Nutrition' in (attrs.get('alt') or ''):
+            self._nutrition_by_alt.append(self.images)
+        elif NUTRITION_IMG_RE.search(attrs.get('src') or ''):
+            self._nutrition_by_src.append(self.images)
+        self.images += 1
+
+    def nutrition_images(self):
+        # The first image with alt="Nutrition ..." wins; otherwise the last
+        # one named like an exported panel (Images/1234.png).
+        return self._nutrition_by_alt + self._nutrition_by_src[::-1]
+
+    def handle_endtag(self, tag):
+        if tag == 'p' and self._open_ps:
+            self._open_ps.pop()
+        elif tag == 'h2' and self._h2 is not None:
+            text = normalize_text(self._h2)
+            if self._h2_is_title and self.title is None:
+                self.title = text
+            if self._first_h2 is None:
+                self._first_h2 = text
+            self._h2 = None
+        elif tag in ('style', 'script') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        for chunks in self._open_ps:
+            chunks.append(data)
+        if self._h2 is not None:
+            self._h2.append(data)
+        stripped = data.strip()
+        if stripped:
+            self.page_text.append(stripped)
+
+    def title_text(self):
+        if self.title is not None:
+            return self.title
+        return self._first_h2 or ''
+
+
+def parse_recipe(content):
+    """Parse a Section XHTML document into a Recipe."""
+    reader = _PageReader()
+    reader.feed(content)
+    reader.close()
+
+    texts = [normalize_text(chunks) for chunks in reader.paragraphs]
+    title = reader.title_text()
+    page_text = ' '.join(reader.page_text)
+    count, raw = baseline_yield(texts)
+    lines, end = ingredient_block(texts, title)
+    steps = [t for t in texts[end:] if t and not BOILERPLATE_RE.search(t)]
+
+    return Recipe(
+        title=title,
+        yield_count=count,
+        yield_text=raw,
+        ingredient_lines=lines,
+        steps=steps,
+        has_old_toolbar='Kitchen Timer' in page_text or 'Recipe Multiplier' in page_text,
+        nutrition_images=reader.nutrition_images(),
+    )
+
+
+def cached_recipe(content, cache_dir=CACHE_DIR):
+    """parse_recipe() memoized on disk by document hash and parser version."""
+    key = hashlib.sha256((PARSER_VERSION + content).encode('utf-8')).hexdigest()
+    path = os.path.join(cache_dir, key[:2], key + '.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return Recipe.from_list(json.load(f))
+    except (FileNotFoundError, ValueError):
+        pass
+
+    recipe = parse_recipe(content)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(recipe.to_list(), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+    return recipe
+
+
+def document_yield(content):
+    """The parsed Yield of a Section XHTML document (None without a yield line)."""
+    return cached_recipe(content).yield_info
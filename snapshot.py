@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Golden-output snapshot of the recipes: yield and ingredient lines.
+
+snapshots/recipes.json holds, for every recipe page, the yield text and
+the ingredient lines as the shared recipe parser (recipe.py) reads them,
+one recipe per line so the file itself also diffs well in git:
+
+    {
+    "Section0002": ["4–6 servings",["4 lbs boneless beef short ribs",…]],
+    …
+    }
+
+After changing a scaling rule, re-run the pipeline and check the tree
+against the snapshot. The new snapshot is built in memory and only the
+recipes that differ are diffed, so the report lists just the yield and
+ingredient lines that changed:
+
+    python3 snapshot.py                 # compare epub_work/ with the snapshot
+    python3 snapshot.py --dir editions/serves-4
+    python3 snapshot.py --update        # accept the current output
+
+The check exits with status 1 when anything changed.
+"""
+
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import unicodedata
+
+from recipe import cached_recipe
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEXT_DIR = os.path.join(ROOT, 'epub_work/OEBPS/Text')
+SNAPSHOT = os.path.join(ROOT, 'snapshots', 'recipes.json')
+
+
+def normalize(text):
+    return unicodedata.normalize('NFC', text or '')
+
+
+def take_snapshot(text_dir):
+    """{section: [yield text, [ingredient lines]]} for every recipe page in `text_dir`."""
+    snapshot = {}
+    for path in sorted(glob.glob(os.path.join(text_dir, 'Section*.xhtml'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            recipe = cached_recipe(f.read())
+        if recipe.yield_text is None and not recipe.ingredient_lines:
+            continue
+        section = os.path.splitext(os.path.basename(path))[0]
+        snapshot[section] = [normalize(recipe.yield_text),
+                             [normalize(line) for line in recipe.ingredient_lines]]
+    return snapshot
+
+
+def dumps(snapshot):
+    """Compact JSON with one recipe per line."""
+    lines = [f'{json.dumps(k)}: {json.dumps(v, ensure_ascii=False, separators=(",", ":"))}'
+             for k, v in sorted(snapshot.items())]
+    return '{\n' + ',\n'.join(lines) + '\n}\n'
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_snapshots(old, new):
+    """Yield (section, report lines) for every recipe that differs."""
+    for section in sorted(old.keys() | new.keys()):
+        before, after = old.get(section), new.get(section)
+        if before == after:
+            continue
+        if before is None:
+            yield section, ['  added']
+            continue
+        if after is None:
+            yield section, ['  removed']
+            continue
+        report = []
+        if before[0] != after[0]:
+            report.append(f'  yield: {before[0]!r} → {after[0]!r}')
+        matcher = difflib.SequenceMatcher(None, before[1], after[1], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            if i2 - i1 == j2 - j1:
+                # Same number of lines: show each one next to its replacement.
+                for old_line, new_line in zip(before[1][i1:i2], after[1][j1:j2]):
+                    report.extend([f'  - {old_line}', f'  + {new_line}'])
+            else:
+                report.extend(f'  - {line}' for line in before[1][i1:i2])
+                report.extend(f'  + {line}' for line in after[1][j1:j2])
+        yield section, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare recipe output with the golden snapshot.')
+    parser.add_argument('--dir', default=TEXT_DIR, help='Text directory to snapshot (default %(default)s)')
+    parser.add_argument('--snapshot', default=SNAPSHOT, help='snapshot file (default %(default)s)')
+    parser.add_argument('--update', action='store_true', help='write the current output as the snapshot')
+    args = parser.parse_args()
+
+    current = take_snapshot(args.dir)
+    if args.update:
+        os.makedirs(os.path.dirname(args.snapshot), exist_ok=True)
+        with open(args.snapshot, 'w', encoding='utf-8') as f:
+            f.write(dumps(current))
+        print(f'Wrote {len(current)} recipes to {args.snapshot}')
+        return
+    if not os.path.exists(args.snapshot):
+        sys.exit(f'No snapshot at {args.snapshot}; create one with --update')
+
+    changed = 0
+    for section, report in diff_snapshots(load(args.snapshot), current):
+        changed += 1
+        print(section)
+        print('\n'.join(report))
+    print(f'{changed} of {len(current)} recipes changed')
+    if changed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,70 @@
 /* Service worker for The Best of Brock cookbook PWA.
  * Strategy:
+ *   - precache-manifest.js (written by build_precache.py) lists every URL
+ *     with a content revision. Listed files are cached under
+ *     "<url>?__rev=<revision>", so an update only downloads the files
+ *     whose revision changed; everything else stays cached.
+ *   - "install"-tier URLs are fetched when the worker installs,
+ *     "runtime"-tier URLs the first time a page needs them.
  *   - Cache-first for static assets (CSS, fonts, images, recipe HTML).
- *   - Network-first for the index and recipe JSON so updates show up.
+ *   - Network-first for the index and the recipe index shards so updates
+ *     show up (a shard must match the integrity hash in recipes.json).
  *   - Falls back to cache when offline.
  */
-const CACHE = 'brock-v2';
-const CORE = [
-  './',
-  './index.html',
-  './manifest.webmanifest',
-  './assets/recipes.json',
-  './assets/icons/icon-192.png',
-  './assets/icons/icon-512.png',
-  './epub_work/OEBPS/Styles/tools-modern.css',
-  './epub_work/OEBPS/Styles/book-modern.css',
-  './epub_work/OEBPS/Misc/Scaler.js',
-  './epub_work/OEBPS/Misc/Timer.js',
-  './epub_work/OEBPS/Misc/Shopping.js',
-  './epub_work/OEBPS/Misc/Multiplier61.js',
-  './epub_work/OEBPS/Text/Multiplier.xhtml',
-  './epub_work/OEBPS/Text/Timer.xhtml',
-  './epub_work/OEBPS/Text/ShoppingList.xhtml',
-  './epub_work/OEBPS/Text/Converter.xhtml'
-];
+importScripts('./precache-manifest.js');
+
+const CACHE = 'brock-precache';
+const MANIFEST = self.PRECACHE_MANIFEST;
+const REVISIONS = Object.assign({}, MANIFEST.runtime, MANIFEST.install);
+
+// Manifest key ("./epub_work/...") for a same-origin URL, ignoring query and hash.
+function manifestKey(url) {
+  const scope = new URL(self.registration.scope);
+  if (!url.pathname.startsWith(scope.pathname)) return null;
+  return './' + decodeURI(url.pathname.slice(scope.pathname.length));
+}
+
+function revisionedUrl(key) {
+  const url = new URL(key, self.registration.scope);
+  url.search = '__rev=' + REVISIONS[key];
+  return url.href;
+}
+
+function precached(key) {
+  if (!key || !(key in REVISIONS)) return Promise.resolve(undefined);
+  return caches.open(CACHE).then((c) => c.match(revisionedUrl(key)));
+}
 
 self.addEventListener('install', (event) => {
   event.waitUntil(
-    caches.open(CACHE).then((c) => c.addAll(CORE)).then(() => self.skipWaiting())
+    caches.open(CACHE).then((cache) => Promise.all(
+      Object.keys(MANIFEST.install).map((key) => {
+        const cacheUrl = revisionedUrl(key);
+        return cache.match(cacheUrl).then((hit) => {
+          if (hit) return null;
+          return fetch(key, { cache: 'no-cache' }).then((res) => {
+            if (!res.ok) throw new Error(`precache ${key}: ${res.status}`);
+            return cache.put(cacheUrl, res);
+          });
+        });
+      })
+    )).then(() => self.skipWaiting())
   );
 });
 
 self.addEventListener('activate', (event) => {
+  // Drop old caches, and copies of files that changed or went away.
   event.waitUntil(
     caches.keys()
       .then((keys) => Promise.all(keys.filter((k) => k !== CACHE).map((k) => caches.delete(k))))
+      .then(() => caches.open(CACHE))
+      .then((cache) => cache.keys().then((reqs) => Promise.all(reqs.map((req) => {
+        const url = new URL(req.url);
+        const rev = url.searchParams.get('__rev');
+        if (rev === null) return null;
+        const key = manifestKey(url);
+        return REVISIONS[key] === rev ? null : cache.delete(req);
+      }))))
       .then(() => self.clients.claim())
   );
 });
@@ -46,9 +77,11 @@ self.addEventListener('fetch', (event) => {
   // Only handle same-origin
   if (url.origin !== self.location.origin) return;
 
+  const key = manifestKey(url);
   const isIndexOrJson = url.pathname.endsWith('/index.html') ||
-                        url.pathname === '/' ||
-                        url.pathname.endsWith('/recipes.json');
+                        url.pathname === new URL(self.registration.scope).pathname ||
+                        url.pathname.endsWith('/recipes.json') ||
+                        url.pathname.includes('/assets/recipes/');
 
   if (isIndexOrJson) {
     // Network-first
@@ -59,22 +92,25 @@ self.addEventListener('fetch', (event) => {
           caches.open(CACHE).then((c) => c.put(req, clone));
           return res;
         })
-        .catch(() => caches.match(req).then((hit) => hit || caches.match('./index.html')))
+        .catch(() => caches.match(req)
+          .then((hit) => hit || precached(key))
+          .then((hit) => hit || precached('./index.html')))
     );
     return;
   }
 
   // Cache-first
   event.respondWith(
-    caches.match(req).then((hit) => {
+    precached(key).then((hit) => hit || caches.match(req)).then((hit) => {
       if (hit) return hit;
       return fetch(req).then((res) => {
         if (res.ok && res.type === 'basic') {
           const clone = res.clone();
-          caches.open(CACHE).then((c) => c.put(req, clone));
+          const cacheKey = key in REVISIONS ? revisionedUrl(key) : req;
+          caches.open(CACHE).then((c) => c.put(cacheKey, clone));
         }
         return res;
-      }).catch(() => caches.match('./index.html'));
+      }).catch(() => precached('./index.html'));
     })
   );
 });
@@ -0,0 +1,112 @@
+"""
+Single-pass typo correction for the recipe XHTML.
+
+Each typo table is compiled once at import into one alternation regex
+(longest spelling first, so "seperately" wins over "seperate"), and
+fix_typos() rewrites a whole document in one linear scan instead of one
+str.replace() per table entry.
+"""
+
+import re
+
+
+def compile_typos(fixes):
+    """Build one alternation regex matching every misspelling in `fixes`."""
+    wrongs = sorted(fixes, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(w) for w in wrongs))
+
+
+# Used by process_recipes.py. The first three entries are reported with
+# their own wording there; the rest are reported as 'Fixed "x" -> "y"'.
+RECIPE_TYPOS = {
+    'Recepie': 'Recipe',
+    'recepie': 'recipe',
+    'Make You shopping': 'Make Your Shopping',
+    'worchestershire': 'Worcestershire',
+    'worchester': 'Worcestershire',
+    'Worchestershire': 'Worcestershire',
+    'parsely': 'parsley',
+    'Parsely': 'Parsley',
+    'cummin': 'cumin',
+    'Cummin': 'Cumin',
+    'mozarella': 'mozzarella',
+    'Mozarella': 'Mozzarella',
+    'mozzerella': 'mozzarella',
+    'Mozzerella': 'Mozzarella',
+    'margerine': 'margarine',
+    'Margerine': 'Margarine',
+    'cillantro': 'cilantro',
+    'Cillantro': 'Cilantro',
+    'cilanro': 'cilantro',
+    'Cilanro': 'Cilantro',
+    'brocoli': 'broccoli',
+    'Brocoli': 'Broccoli',
+    'brocolli': 'broccoli',
+    'Brocolli': 'Broccoli',
+    'tumeric': 'turmeric',
+    'Tumeric': 'Turmeric',
+    'calender': 'colander',
+    'Calender': 'Colander',
+    'seperately': 'separately',
+    'Seperately': 'Separately',
+    'seperate': 'separate',
+    'Seperate': 'Separate',
+    'occassionally': 'occasionally',
+    'untill': 'until',
+    'Untill': 'Until',
+    'stirr ': 'stir ',
+    'Stirr ': 'Stir ',
+    'potatoe ': 'potato ',
+    'potatoe,': 'potato,',
+    'potatoe.': 'potato.',
+    'tomatoe ': 'tomato ',
+    'tomatoe,': 'tomato,',
+    'tomatoe.': 'tomato.',
+    'cranberrie s': 'cranberries',
+    ' 0f ': ' of ',
+}
+RECIPE_TYPOS_RE = compile_typos(RECIPE_TYPOS)
+
+# Used by fix_scaling.py when restoring wrongly-scaled originals.
+RESTORE_TYPOS = {
+    'Recepie': 'Recipe',
+    'recepie': 'recipe',
+    'worchestershire': 'Worcestershire',
+    'Worchestershire': 'Worcestershire',
+    'worstershire': 'Worcestershire',
+    'brocolli': 'broccoli',
+    'Brocolli': 'Broccoli',
+    'cilanrto': 'cilantro',
+    'tumeric': 'turmeric',
+    'parsely': 'parsley',
+    'margerine': 'margarine',
+    'Margerine': 'Margarine',
+    'seperately': 'separately',
+    'seperate': 'separate',
+    'temperture': 'temperature',
+    'untill': 'until',
+    'occassionally': 'occasionally',
+    'throughly': 'thoroughly',
+    'thorougly': 'thoroughly',
+    'aproximately': 'approximately',
+    'aproximate': 'approximate',
+}
+RESTORE_TYPOS_RE = compile_typos(RESTORE_TYPOS)
+
+
+def fix_typos(content, fixes=RECIPE_TYPOS, pattern=RECIPE_TYPOS_RE):
+    """Correct every typo in `content` in one pass.
+
+    Returns (new_content, fixed) where `fixed` lists the misspellings that
+    were found, in table order, so callers can build the same change log
+    the old replace-per-entry loop produced.
+    """
+    hits = set()
+
+    def repl(m):
+        wrong = m.group(0)
+        hits.add(wrong)
+        return fixes[wrong]
+
+    content = pattern.sub(repl, content)
+    return content, [w for w in fixes if w in hits]
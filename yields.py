@@ -0,0 +1,116 @@
+"""
+One yield grammar for every script.
+
+parse_yield() reads a recipe's yield text ("80 servings (8 servings)",
+"4–6 servings", "6 gallons or 96 servings", "2 ½ dozen cookies") in a
+single scan with patterns.YIELD_GRAMMAR_RE and returns a Yield:
+
+  - The yield is the first amount outside parentheses.
+  - When that amount is a measure ("6 gallons", "1 cup"), a following
+    "or N servings" restates it in servings and is used instead.
+  - In a food-service yield, a smaller servings count in parentheses is
+    the home version ("80 servings (8 servings)"). Other parentheses,
+    such as "(or about 50 servings of 1 ⅓ oz size)", are notes.
+  - Sizes ("One 9" pie", "4, 12 oz portions") are never counts.
+
+Yield.count is what the written amounts serve, the middle of a range;
+the scaling scripts divide by it. Yield.baseline is the whole number of
+servings a home cook starts from: the home version if there is one,
+else the low end, and never less than one batch ("½ gallon" is 1). It
+becomes the page's data-baseline-yield and the Multiplier's "from"
+value.
+
+parse_yield() is memoized per text. recipe.document_yield() memoizes it
+per document, with the recipe, in the .cache/recipes disk cache.
+"""
+
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+
+from patterns import YIELD_GRAMMAR_RE
+from quantity import parse_quantity
+
+# Units that count servings rather than measure the batch.
+SERVING_UNITS = ('serving', 'portion', 'people', 'person')
+
+# Recipes serving at least this many are food-service recipes and are
+# scaled down to a home yield.
+FOOD_SERVICE_MIN = 8
+
+
+@dataclass(frozen=True)
+class Yield:
+    text: str
+    low: Fraction = None
+    high: Fraction = None
+    unit: str = ''
+    # Home-version servings from "80 servings (8 servings)".
+    home: Fraction = None
+
+    @property
+    def count(self):
+        """What the written amounts serve (the middle of a range), or None."""
+        if self.low is None:
+            return None
+        return (self.low + self.high) / 2
+
+    @property
+    def baseline(self):
+        """Whole servings a home cook starts from (at least one batch), or None."""
+        n = self.home if self.home is not None else self.low
+        return max(int(n), 1) if n is not None else None
+
+    @property
+    def food_service(self):
+        return self.count is not None and self.count >= FOOD_SERVICE_MIN
+
+
+def is_serving_unit(unit):
+    return unit.lower().startswith(SERVING_UNITS)
+
+
+def _amount(text):
+    q = parse_quantity(text)
+    return Fraction(q.num, q.den) if q is not None else None
+
+
+@lru_cache(maxsize=None)
+def parse_yield(text):
+    """Parse yield text into a Yield; None for no text. See the module docstring."""
+    if text is None:
+        return None
+
+    first = restated = home = None
+    depth = 0
+    after_or = False
+    for m in YIELD_GRAMMAR_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == 'open':
+            depth += 1
+        elif kind == 'close':
+            depth = max(depth - 1, 0)
+        elif kind == 'or':
+            after_or = True
+        elif m.group('low') is not None:
+            low = _amount(m.group('low'))
+            high = _amount(m.group('high')) if m.group('high') else low
+            amount = (low, high, m.group('unit') or '')
+            if low is None or high is None:
+                pass
+            elif depth == 0 and first is None:
+                first = amount
+            elif depth == 0 and after_or and restated is None and is_serving_unit(amount[2]):
+                restated = amount
+            elif depth and not after_or and home is None and is_serving_unit(amount[2]):
+                home = amount
+            after_or = False
+
+    if first is None:
+        return Yield(text)
+    if restated is not None and not is_serving_unit(first[2]):
+        first = restated
+    result = Yield(text, *first)
+    if home is not None and result.food_service and home[0] < result.count:
+        result = Yield(text, *first, home=home[0])
+    return result